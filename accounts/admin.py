@@ -1,11 +1,13 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+from django.utils import timezone
 
-from .models import PasswordResetCode, User
+from .admin_scaling import LargeTableAdminMixin
+from .models import OutboxMessage, PasswordResetCode, User
 
 
 @admin.register(User)
-class UserAdmin(DjangoUserAdmin):
+class UserAdmin(LargeTableAdminMixin, DjangoUserAdmin):
     fieldsets = DjangoUserAdmin.fieldsets + (
         ("Profile", {"fields": ("bio", "website", "avatar")} ),
         ("Roles & Status", {"fields": ("role", "is_banned")}),
@@ -18,12 +20,36 @@ class UserAdmin(DjangoUserAdmin):
         "is_banned",
     )
     list_filter = DjangoUserAdmin.list_filter + ("role", "is_banned")
-    search_fields = DjangoUserAdmin.search_fields + ("role",)
+    search_fields = ("=id", "^username")
+    search_help_text = "User id or the start of a username."
     ordering = ("username",)
 
 
 @admin.register(PasswordResetCode)
-class PasswordResetCodeAdmin(admin.ModelAdmin):
+class PasswordResetCodeAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("user", "code", "is_used", "expires_at", "created_at")
     list_filter = ("is_used", "expires_at")
-    search_fields = ("user__username", "user__email", "code")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    search_fields = ("=code", "=user", "^user__username")
+    search_help_text = "Reset code, user id or the start of a username."
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to_email", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("to_email", "subject")
+    readonly_fields = ("claim_token", "claimed_at", "last_error", "sent_at")
+    actions = ("requeue",)
+
+    @admin.action(description="Requeue selected messages")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status=OutboxMessage.STATUS_SENT).update(
+            status=OutboxMessage.STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            claim_token="",
+            claimed_at=None,
+        )
+        self.message_user(request, f"Requeued {updated} message(s).")
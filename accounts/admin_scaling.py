@@ -0,0 +1,217 @@
+from datetime import timedelta
+
+from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+ADMIN_COUNT_CAP = 10000
+KEYSET_VAR = "before"
+# Sorts after every other character under binary (code point) collation, so
+# there [term, term + PREFIX_END) is an index range covering every value that
+# starts with term.
+PREFIX_END = "\U0010ffff"
+# Backends whose text columns compare by code point unless told otherwise.
+# Locale collations (PostgreSQL's default) order text differently, so the
+# range could drop matches there; they get LIKE 'term%' instead, which
+# PostgreSQL serves from the varchar_pattern_ops index Django adds to
+# indexed char columns.
+BINARY_COLLATION_VENDORS = {"sqlite"}
+CREATED_SINCE_CHOICES = (
+    ("1", "Past 24 hours", timedelta(days=1)),
+    ("7", "Past 7 days", timedelta(days=7)),
+    ("30", "Past 30 days", timedelta(days=30)),
+    ("365", "Past year", timedelta(days=365)),
+)
+
+
+def estimated_row_count(model, using="default"):
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table]
+            )
+        elif connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [model._meta.db_table],
+            )
+        elif connection.vendor == "sqlite":
+            # Rowids are handed out in order, so the largest one is the row
+            # count plus however many rows have been deleted.
+            cursor.execute(f"SELECT MAX(rowid) FROM {table}")
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    # Unfiltered changelists show the table estimate; filtered ones count at
+    # most ADMIN_COUNT_CAP + 1 rows instead of the whole match.
+    count_kind = "exact"
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None:
+                self.count_kind = "estimate"
+                return estimate
+        count = queryset.order_by()[: ADMIN_COUNT_CAP + 1].count()
+        self.count_kind = "capped" if count > ADMIN_COUNT_CAP else "exact"
+        return count
+
+
+def first_pk_since(model, field, moment):
+    # Only valid when the field is stamped on insert and never rewritten: it
+    # then grows with the primary key, and a binary search over primary key
+    # seeks finds where it passes the moment.
+    queryset = model._default_manager.order_by()
+    bounds = queryset.aggregate(low=Min("pk"), high=Max("pk"))
+    low, high = bounds["low"], bounds["high"]
+    if high is None:
+        return None
+    high += 1
+    while low < high:
+        middle = (low + high) // 2
+        row = queryset.filter(pk__gte=middle).order_by("pk").values_list("pk", field).first()
+        if row is None or row[1] >= moment:
+            high = middle
+        else:
+            low = row[0] + 1
+    return low
+
+
+class CreatedSinceFilter(admin.SimpleListFilter):
+    # Filters on the field itself, which needs an index starting with it.
+    title = "created"
+    parameter_name = "created"
+    field_name = "created_at"
+    pk_ordered = False
+
+    def lookups(self, request, model_admin):
+        return [(value, label) for value, label, _ in CREATED_SINCE_CHOICES]
+
+    def queryset(self, request, queryset):
+        window = {value: window for value, _, window in CREATED_SINCE_CHOICES}.get(self.value())
+        if window is None:
+            return queryset
+        moment = timezone.now() - window
+        if not self.pk_ordered:
+            return queryset.filter(**{f"{self.field_name}__gte": moment})
+        boundary = first_pk_since(queryset.model, self.field_name, moment)
+        if boundary is None:
+            return queryset.none()
+        return queryset.filter(pk__gte=boundary)
+
+
+class InsertOrderCreatedSinceFilter(CreatedSinceFilter):
+    # For tables whose field is auto_now_add and never rewritten, so the
+    # window becomes a primary key bound that keyset pages walk directly.
+    pk_ordered = True
+
+
+def indexed_lookup(model, path, term):
+    # "^user__username" -> user_id IN (SELECT id FROM user WHERE username in
+    # [term, term + PREFIX_END)), so every step is an index seek. The range
+    # depends on binary collation; see BINARY_COLLATION_VENDORS.
+    prefix, path = (path[0], path[1:]) if path[0] in "=^" else ("=", path)
+    name, _, rest = path.partition("__")
+    field = model._meta.get_field(name)
+    if rest:
+        related = field.related_model
+        inner = indexed_lookup(related, prefix + rest, term)
+        if inner is None:
+            return None
+        return Q(**{f"{name}__in": related._default_manager.filter(inner).values("pk")})
+    try:
+        value = field.to_python(term)
+    except ValidationError:
+        return None
+    if prefix == "^":
+        if connections[router.db_for_read(model)].vendor not in BINARY_COLLATION_VENDORS:
+            return Q(**{f"{name}__startswith": value})
+        return Q(**{f"{name}__gte": value, f"{name}__lt": value + PREFIX_END})
+    return Q(**{name: value})
+
+
+class KeysetChangeList(ChangeList):
+    def __init__(self, request, *args, **kwargs):
+        try:
+            self.keyset_before = int(request.GET.get(KEYSET_VAR, ""))
+        except ValueError:
+            self.keyset_before = None
+        self.keyset_pagination = ORDER_VAR not in request.GET
+        self.newest_url = self.older_url = None
+        super().__init__(request, *args, **kwargs)
+
+    def get_queryset(self, request, exclude_parameters=None):
+        # The cursor is not a filter; dropping it here also makes every
+        # filter, sort and search link start again from the newest rows.
+        self.params.pop(KEYSET_VAR, None)
+        self.filter_params.pop(KEYSET_VAR, None)
+        return super().get_queryset(request, exclude_parameters)
+
+    def get_results(self, request):
+        if not self.keyset_pagination:
+            return super().get_results(request)
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        queryset = self.queryset.order_by("-pk")
+        if self.keyset_before is not None:
+            queryset = queryset.filter(pk__lt=self.keyset_before)
+            self.newest_url = self.get_query_string()
+        rows = list(queryset[: self.list_per_page + 1])
+        if len(rows) > self.list_per_page:
+            rows = rows[: self.list_per_page]
+            self.older_url = self.get_query_string({KEYSET_VAR: rows[-1].pk})
+        self.result_count = paginator.count
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = bool(self.newest_url or self.older_url)
+        self.paginator = paginator
+
+
+class LargeTableAdminMixin:
+    # Search terms only ever become index seeks: "=field" matches exactly and
+    # "^field" by prefix, following relations through id subqueries.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    keyset_pagination = False
+    change_list_template = "admin/large_table_change_list.html"
+
+    def get_changelist(self, request, **kwargs):
+        if self.keyset_pagination:
+            return KeysetChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def get_ordering(self, request):
+        if self.keyset_pagination:
+            return ("-pk",)
+        return super().get_ordering(request)
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        condition = Q()
+        for path in self.get_search_fields(request):
+            lookup = indexed_lookup(self.model, path, term)
+            if lookup is not None:
+                condition |= lookup
+        if not condition:
+            return queryset.none(), False
+        return queryset.filter(condition), False
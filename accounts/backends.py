@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+from .caching import cache_user, get_cached_user
+from .models import User
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not settings.CACHE_AUTHENTICATED_USERS:
+            return super().get_user(user_id)
+        user, version = get_cached_user(user_id)
+        if user is None:
+            try:
+                user = User._default_manager.get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            cache_user(user, version)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,31 @@
+from django.core.cache import cache
+
+USER_CACHE_SECONDS = 5 * 60
+
+
+def _user_keys(user_id):
+    return f"accounts:user:{user_id}", f"accounts:user-version:{user_id}"
+
+
+def get_cached_user(user_id):
+    user_key, version_key = _user_keys(user_id)
+    cached = cache.get_many([user_key, version_key])
+    entry = cached.get(user_key)
+    if entry is None or entry[0] != cached.get(version_key, 0):
+        return None, cached.get(version_key, 0)
+    return entry[1], entry[0]
+
+
+def cache_user(user, version) -> None:
+    user_key, _ = _user_keys(user.pk)
+    cache.set(user_key, (version, user), USER_CACHE_SECONDS)
+
+
+def bump_user_version(user_id) -> None:
+    user_key, version_key = _user_keys(user_id)
+    cache.add(version_key, 0, timeout=None)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, 1, timeout=None)
+    cache.delete(user_key)
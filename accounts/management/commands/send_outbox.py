@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, deliver_batch
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails in batches, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument("--max-attempts", type=int, default=OUTBOX_MAX_ATTEMPTS)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new messages instead of exiting when the outbox is drained.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep between polls when the outbox is empty (with --loop).",
+        )
+
+    def handle(self, *args, **options):
+        totals = {"sent": 0, "retried": 0, "dead": 0}
+        try:
+            while True:
+                counts = deliver_batch(options["batch_size"], options["max_attempts"])
+                for key, value in counts.items():
+                    totals[key] += value
+                if any(counts.values()):
+                    self.stdout.write(
+                        f"Sent {counts['sent']}, retrying {counts['retried']}, "
+                        f"dead-lettered {counts['dead']}."
+                    )
+                    continue
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Outbox run finished: {totals['sent']} sent, {totals['retried']} retrying, "
+                f"{totals['dead']} dead-lettered."
+            )
+        )
@@ -4,6 +4,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
 
+from .caching import bump_user_version
+
 
 class User(AbstractUser):
 
@@ -16,6 +18,8 @@ class User(AbstractUser):
         (ROLE_ADMIN, "Admin"),
         (ROLE_USER, "User"),
     ]
+    # Kept with F() updates elsewhere; full saves leave them alone.
+    COUNTER_FIELDS = ("unread_notification_count",)
 
     role = models.CharField(
         max_length=20,
@@ -26,11 +30,20 @@ class User(AbstractUser):
     bio = models.TextField(blank=True)
     website = models.URLField(blank=True)
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+    unread_notification_count = models.PositiveIntegerField(default=0, editable=False)
 
     def save(self, *args, **kwargs):
         update_fields = kwargs.get("update_fields")
         if update_fields is not None:
             update_fields = set(update_fields)
+        elif not self._state.adding and not kwargs.get("force_insert"):
+            # A stale instance (profile form, password reset) must not write
+            # its copy of the counters back.
+            update_fields = {
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            }
         if self.is_banned:
             self.is_active = False
         if self.is_superuser:
@@ -51,6 +64,13 @@ class User(AbstractUser):
                 update_fields.add("is_active")
             kwargs["update_fields"] = list(update_fields)
         super().save(*args, **kwargs)
+        bump_user_version(self.pk)
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        bump_user_version(user_id)
+        return result
 
     @property
     def is_super_admin(self) -> bool:
@@ -108,3 +128,42 @@ class PasswordResetCode(models.Model):
             not self.is_used
             and self.expires_at >= timezone.now()
         )
+
+
+class OutboxMessage(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_DEAD, "Dead letter"),
+    ]
+
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+            models.Index(fields=["claim_token"]),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.subject} -> {self.to_email} ({self.status})"
@@ -0,0 +1,123 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 60 * 60
+OUTBOX_LEASE_SECONDS = 5 * 60
+
+
+def queue_mail(subject, message, recipient_list, from_email=None):
+    return OutboxMessage.objects.bulk_create(
+        OutboxMessage(
+            to_email=recipient,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            subject=subject,
+            body=message,
+        )
+        for recipient in recipient_list
+    )
+
+
+def claim_batch(batch_size=OUTBOX_BATCH_SIZE):
+    now = timezone.now()
+    due = Q(status=OutboxMessage.STATUS_PENDING, next_attempt_at__lte=now) | Q(
+        status=OutboxMessage.STATUS_SENDING,
+        claimed_at__lt=now - timedelta(seconds=OUTBOX_LEASE_SECONDS),
+    )
+    candidate_ids = list(
+        OutboxMessage.objects.filter(due)
+        .order_by("next_attempt_at", "pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not candidate_ids:
+        return []
+    token = uuid.uuid4().hex
+    # Re-checking the due condition makes the UPDATE the claim: rows another
+    # worker grabbed in the meantime no longer match.
+    OutboxMessage.objects.filter(due, pk__in=candidate_ids).update(
+        status=OutboxMessage.STATUS_SENDING, claim_token=token, claimed_at=now
+    )
+    return list(OutboxMessage.objects.filter(claim_token=token).order_by("pk"))
+
+
+def _backoff(attempts):
+    return timedelta(
+        seconds=min(OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), OUTBOX_MAX_BACKOFF_SECONDS)
+    )
+
+
+OUTBOX_RESULT_FIELDS = (
+    "status",
+    "attempts",
+    "next_attempt_at",
+    "claim_token",
+    "claimed_at",
+    "last_error",
+    "sent_at",
+)
+
+
+def _record_result(message, token) -> bool:
+    # A worker whose lease ran out must not overwrite the row another worker
+    # has since claimed, so each result only lands while our token holds.
+    return bool(
+        OutboxMessage.objects.filter(pk=message.pk, claim_token=token).update(
+            **{field: getattr(message, field) for field in OUTBOX_RESULT_FIELDS}
+        )
+    )
+
+
+def deliver_batch(batch_size=OUTBOX_BATCH_SIZE, max_attempts=OUTBOX_MAX_ATTEMPTS):
+    messages = claim_batch(batch_size)
+    if not messages:
+        return {"sent": 0, "retried": 0, "dead": 0}
+    counts = {"sent": 0, "retried": 0, "dead": 0}
+    connection = get_connection(fail_silently=False)
+    open_error = None
+    try:
+        connection.open()
+    except Exception as exc:
+        open_error = exc
+    for message in messages:
+        token = message.claim_token
+        message.attempts += 1
+        message.claim_token = ""
+        message.claimed_at = None
+        try:
+            if open_error is not None:
+                raise open_error
+            EmailMessage(
+                subject=message.subject,
+                body=message.body,
+                from_email=message.from_email,
+                to=[message.to_email],
+                connection=connection,
+            ).send()
+        except Exception as exc:
+            message.last_error = f"{type(exc).__name__}: {exc}"
+            if message.attempts >= max_attempts:
+                message.status = OutboxMessage.STATUS_DEAD
+                outcome = "dead"
+            else:
+                message.status = OutboxMessage.STATUS_PENDING
+                message.next_attempt_at = timezone.now() + _backoff(message.attempts)
+                outcome = "retried"
+        else:
+            message.status = OutboxMessage.STATUS_SENT
+            message.sent_at = timezone.now()
+            message.last_error = ""
+            outcome = "sent"
+        if _record_result(message, token):
+            counts[outcome] += 1
+    if open_error is None:
+        connection.close()
+    return counts
@@ -0,0 +1,40 @@
+import secrets
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.registry import job
+
+from .models import PasswordResetCode, User
+from .outbox import deliver_batch, queue_mail
+
+PASSWORD_RESET_CODE_MINUTES = 15
+
+
+@job("accounts.send_outbox", every=timedelta(minutes=1), priority=10)
+def send_outbox():
+    while any(deliver_batch().values()):
+        pass
+
+
+@job("accounts.send_password_reset", priority=10)
+def send_password_reset(email):
+    user = User.objects.filter(email__iexact=email, is_banned=False).first()
+    if user is None:
+        return
+    code = f"{secrets.randbelow(10**6):06d}"
+    expires_at = timezone.now() + timedelta(minutes=PASSWORD_RESET_CODE_MINUTES)
+    with transaction.atomic():
+        PasswordResetCode.objects.filter(user=user, is_used=False).update(is_used=True)
+        PasswordResetCode.objects.create(user=user, code=code, expires_at=expires_at)
+        queue_mail(
+            subject="Your Cetix password reset code",
+            message=(
+                "We received a request to reset your Cetix password.\n\n"
+                f"Your verification code is: {code}\n"
+                f"This code will expire in {PASSWORD_RESET_CODE_MINUTES} minutes.\n\n"
+                "If you did not request this, you can ignore this email."
+            ),
+            recipient_list=[user.email],
+        )
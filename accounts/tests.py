@@ -1 +1,482 @@
-from django.test import TestCase
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection
+from django.db.models import Q
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from articles.models import Article, ArticleReaction, Bookmark
+from articles.tests import QueryBudgetMixin, QueryPlanMixin, cold_caches, seed_site
+from jobs.models import Job
+from jobs.queue import claim_next, run_job
+
+from .admin_scaling import KEYSET_VAR, indexed_lookup
+from .backends import CachedModelBackend
+from .models import OutboxMessage, PasswordResetCode, User
+from .outbox import (
+    OUTBOX_LEASE_SECONDS,
+    _record_result,
+    claim_batch,
+    deliver_batch,
+    queue_mail,
+)
+from .tasks import send_password_reset
+from .throttling import check_throttle, throttle_rejections
+from .views import ProfileView
+
+ACCOUNT_QUERY_BUDGETS = {
+    "login": (2, 4, 4),
+    "register": (2, 4, 4),
+    "forgot": (2, 4, 4),
+    "forgot done": (2, 4, 4),
+    "verify": (2, 4, 4),
+    "profile": (None, 4, 4),
+    "users": (None, None, 6),
+}
+# Most queries each admin changelist may run, counting the session and
+# signed-in user loads. The article created filter is one range over
+# article_created_idx; the insert-ordered ones add one primary key seek per
+# halving of the table.
+ADMIN_CHANGELIST_BUDGETS = {
+    "articles": 5,
+    "articles by slug": 5,
+    "published this month": 5,
+    "reactions": 4,
+    "reactions by user": 4,
+    "reactions by id": 4,
+    "reactions this week": 17,
+    "reactions older page": 4,
+    "bookmarks": 4,
+    "comments": 4,
+    "comments sorted": 4,
+    "users": 5,
+    "users by prefix": 5,
+    "reset codes": 4,
+}
+UNBOUNDED_COUNT_RE = re.compile(r"^SELECT COUNT\(\*\)(?!.*\bLIMIT\b)", re.S)
+
+
+def admin_changelists():
+    reactions = reverse("admin:articles_articlereaction_changelist")
+    return {
+        "articles": reverse("admin:articles_article_changelist"),
+        "articles by slug": reverse("admin:articles_article_changelist") + "?q=seeded-article-1",
+        "published this month": reverse("admin:articles_article_changelist")
+        + "?created=30&status__exact=published",
+        "reactions": reactions,
+        "reactions by user": reactions + "?q=reader1",
+        "reactions by id": reactions + "?q=5&value__exact=1",
+        "reactions this week": reactions + "?created=7",
+        "reactions older page": reactions + f"?{KEYSET_VAR}=100",
+        "bookmarks": reverse("admin:articles_bookmark_changelist"),
+        "comments": reverse("admin:articles_articlecomment_changelist"),
+        "comments sorted": reverse("admin:articles_articlecomment_changelist") + "?o=2",
+        "users": reverse("admin:accounts_user_changelist"),
+        "users by prefix": reverse("admin:accounts_user_changelist") + "?q=reader",
+        "reset codes": reverse("admin:accounts_passwordresetcode_changelist") + "?q=123456",
+    }
+
+
+def account_pages():
+    return {
+        "login": reverse("login"),
+        "register": reverse("accounts:register"),
+        "forgot": reverse("accounts:password_reset_request"),
+        "forgot done": reverse("accounts:password_reset_done"),
+        "verify": reverse("accounts:password_reset_verify"),
+        "profile": reverse("accounts:profile"),
+        "users": reverse("accounts:user_list"),
+    }
+
+
+class AccountPageBudgetTests(QueryBudgetMixin, QueryPlanMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_site()
+
+    def test_every_page_has_a_budget(self):
+        self.assertEqual(set(account_pages()), set(ACCOUNT_QUERY_BUDGETS))
+
+    def test_anonymous_budgets(self):
+        self.assertPageBudgets(account_pages(), ACCOUNT_QUERY_BUDGETS, "anonymous")
+
+    def test_member_budgets(self):
+        self.assertPageBudgets(
+            account_pages(), ACCOUNT_QUERY_BUDGETS, "member", self.data["reader"]
+        )
+
+    def test_admin_budgets(self):
+        self.assertPageBudgets(account_pages(), ACCOUNT_QUERY_BUDGETS, "admin", self.data["admin"])
+
+    def test_user_list_uses_indexes(self):
+        cold_caches()
+        self.client.force_login(self.data["admin"])
+        self.assertIndexedPlans(
+            {"users": account_pages()["users"]}, aggregates={"users": ("SELECT COUNT(*)",)}
+        )
+
+
+class AdminScalingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_site()
+        cls.superuser = User.objects.create_superuser("seed-root", "root@example.com", "pw")
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+
+    def changelist(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.context["cl"]
+
+    def test_every_changelist_has_a_budget(self):
+        self.assertEqual(set(admin_changelists()), set(ADMIN_CHANGELIST_BUDGETS))
+
+    def test_changelists_skip_like_scans_and_full_counts(self):
+        for name, url in admin_changelists().items():
+            with self.subTest(page=name), CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+            sql = [query["sql"] for query in queries.captured_queries]
+            self.assertLessEqual(len(sql), ADMIN_CHANGELIST_BUDGETS[name], "\n".join(sql))
+            self.assertFalse([query for query in sql if " LIKE " in query], name)
+            self.assertFalse([query for query in sql if UNBOUNDED_COUNT_RE.match(query)], name)
+
+    def test_keyset_pages_walk_every_row_once(self):
+        url = reverse("admin:articles_articlereaction_changelist")
+        seen = []
+        while url:
+            cl = self.changelist(url)
+            seen += [reaction.pk for reaction in cl.result_list]
+            url = cl.older_url and reverse("admin:articles_articlereaction_changelist") + cl.older_url
+        expected = list(ArticleReaction.objects.order_by("-pk").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_search_matches_ids_and_prefixes(self):
+        url = reverse("admin:articles_articlereaction_changelist")
+        reader = self.data["reader"]
+        by_prefix = {reaction.pk for reaction in self.changelist(url + "?q=reader1").queryset}
+        expected = set(
+            ArticleReaction.objects.filter(user__username__startswith="reader1").values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual(by_prefix, expected)
+        by_id = set(self.changelist(url + f"?q={reader.pk}").queryset.values_list("pk", flat=True))
+        self.assertTrue(
+            set(ArticleReaction.objects.filter(user=reader).values_list("pk", flat=True)) <= by_id
+        )
+        self.assertFalse(self.changelist(url + "?q=nobody-here").queryset.exists())
+
+    def test_prefix_search_only_uses_ranges_under_binary_collation(self):
+        lookup = indexed_lookup(User, "^username", "reader1")
+        self.assertEqual(sorted(dict(lookup.children)), ["username__gte", "username__lt"])
+        expected = set(
+            User.objects.filter(username__startswith="reader1").values_list("pk", flat=True)
+        )
+        self.assertEqual(set(User.objects.filter(lookup).values_list("pk", flat=True)), expected)
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            lookup = indexed_lookup(User, "^username", "reader1")
+        self.assertEqual(lookup, Q(username__startswith="reader1"))
+
+    def test_created_filter_matches_created_at(self):
+        bookmarks = list(Bookmark.objects.order_by("pk"))
+        now = timezone.now()
+        for index, bookmark in enumerate(bookmarks):
+            bookmark.created_at = now - timedelta(hours=3 * (len(bookmarks) - index) - 1)
+        Bookmark.objects.bulk_update(bookmarks, ["created_at"])
+        url = reverse("admin:articles_bookmark_changelist")
+        for days in (1, 7, 30, 365):
+            with self.subTest(days=days):
+                found = set(
+                    self.changelist(f"{url}?created={days}").queryset.values_list("pk", flat=True)
+                )
+                expected = set(
+                    Bookmark.objects.filter(
+                        created_at__gte=timezone.now() - timedelta(days=days)
+                    ).values_list("pk", flat=True)
+                )
+                self.assertEqual(found, expected)
+                self.assertTrue(expected)
+
+
+    def test_created_filter_handles_backdated_articles(self):
+        articles = list(Article.objects.order_by("pk"))
+        now = timezone.now()
+        # Dates jump back and forth as the primary key grows, as after a seed.
+        for index, article in enumerate(articles):
+            article.created_at = now - timedelta(days=index * 37 % 400, hours=1)
+        Article.objects.bulk_update(articles, ["created_at"])
+        url = reverse("admin:articles_article_changelist")
+        for days in (1, 7, 30, 365):
+            with self.subTest(days=days):
+                found = set(
+                    self.changelist(f"{url}?created={days}").queryset.values_list("pk", flat=True)
+                )
+                expected = set(
+                    Article.objects.filter(
+                        created_at__gte=timezone.now() - timedelta(days=days)
+                    ).values_list("pk", flat=True)
+                )
+                self.assertEqual(found, expected)
+                self.assertTrue(expected)
+
+
+@override_settings(CACHE_AUTHENTICATED_USERS=True)
+class CachedUserBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("cached-user", "cached@example.com", "pw")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_users_are_cached_until_they_change(self):
+        backend = CachedModelBackend()
+        self.assertEqual(backend.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.user.pk).role, User.ROLE_USER)
+        self.user.role = User.ROLE_ADMIN
+        self.user.save()
+        self.assertTrue(backend.get_user(self.user.pk).is_admin)
+        self.user.ban()
+        self.assertIsNone(backend.get_user(self.user.pk))
+
+    def test_banned_users_are_signed_out_on_their_next_request(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("accounts:profile")).status_code, 200)
+        User.objects.get(pk=self.user.pk).ban()
+        response = self.client.get(reverse("accounts:profile"))
+        self.assertRedirects(response, reverse("login") + "?next=" + reverse("accounts:profile"))
+
+    def test_only_enabled_with_a_shared_cache(self):
+        from config import settings as project_settings
+
+        shared = project_settings.CACHES["default"]["BACKEND"].endswith("RedisCache")
+        self.assertEqual(project_settings.CACHE_AUTHENTICATED_USERS, shared)
+        self.assertEqual(
+            getattr(project_settings, "SESSION_ENGINE", "") == (
+                "django.contrib.sessions.backends.cached_db"
+            ),
+            shared,
+        )
+        self.assertEqual(
+            project_settings.AUTHENTICATION_BACKENDS, ["accounts.backends.CachedModelBackend"]
+        )
+
+    @override_settings(CACHE_AUTHENTICATED_USERS=False)
+    def test_per_process_caches_load_the_user_every_time(self):
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(backend.get_user(self.user.pk), self.user)
+
+
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def reset_request(self, email, ip):
+        return self.client.post(
+            reverse("accounts:password_reset_request"), {"email": email}, REMOTE_ADDR=ip
+        )
+
+    def test_password_resets_are_limited_per_ip_and_per_email(self):
+        for index in range(5):
+            response = self.reset_request(f"r{index}@example.com", "10.0.0.1")
+            self.assertEqual(response.status_code, 302)
+        with self.assertLogs("accounts.throttling", "WARNING"):
+            blocked = self.reset_request("r9@example.com", "10.0.0.1")
+        self.assertEqual(blocked.status_code, 429)
+        self.assertGreater(int(blocked["Retry-After"]), 0)
+
+        for index in range(3):
+            self.assertEqual(
+                self.reset_request("Target@example.com", f"10.0.1.{index}").status_code, 302
+            )
+        with self.assertLogs("accounts.throttling", "WARNING"):
+            response = self.reset_request(" target@example.com", "10.0.1.9")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(throttle_rejections()["password_reset"], 2)
+
+    @override_settings(THROTTLE_RATES={"comments": {"ip": "10/day"}})
+    def test_concurrent_hits_never_exceed_the_limit(self):
+        request = RequestFactory().post("/", REMOTE_ADDR="10.0.2.1")
+        with self.assertLogs("accounts.throttling", "WARNING"), ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: check_throttle(request, "comments"), range(40)))
+        self.assertEqual(results.count(None), 10)
+
+    @override_settings(THROTTLE_RATES={"comments": {"ip": "1/s"}})
+    def test_windows_reset(self):
+        request = RequestFactory().post("/", REMOTE_ADDR="10.0.2.2")
+        self.assertIsNone(check_throttle(request, "comments"))
+        with self.assertLogs("accounts.throttling", "WARNING"):
+            retry_after = check_throttle(request, "comments")
+        self.assertIsNotNone(retry_after)
+        time.sleep(retry_after)
+        self.assertIsNone(check_throttle(request, "comments"))
+
+    @override_settings(THROTTLE_RATES={"comments": {"ip": "10/min"}})
+    def test_limit_holds_across_a_window_boundary(self):
+        request = RequestFactory().post("/", REMOTE_ADDR="10.0.2.3")
+        window_end = (time.time() // 60 + 1) * 60
+        with mock.patch("accounts.throttling.time.time", return_value=window_end - 1):
+            for _ in range(10):
+                self.assertIsNone(check_throttle(request, "comments"))
+        allowed = 0
+        with (
+            mock.patch("accounts.throttling.time.time", return_value=window_end + 1),
+            self.assertLogs("accounts.throttling", "WARNING"),
+        ):
+            for _ in range(10):
+                allowed += check_throttle(request, "comments") is None
+        self.assertLessEqual(allowed, 1)
+
+    @override_settings(
+        CLIENT_IP_HEADER="HTTP_X_FORWARDED_FOR",
+        THROTTLE_RATES={"comments": {"ip": "1/min"}},
+    )
+    def test_clients_behind_the_proxy_get_their_own_bucket(self):
+        factory = RequestFactory()
+        for client in ("203.0.113.1", "203.0.113.2"):
+            request = factory.post(
+                "/", REMOTE_ADDR="10.0.0.254", HTTP_X_FORWARDED_FOR=f"1.2.3.4, {client}"
+            )
+            self.assertIsNone(check_throttle(request, "comments"))
+        spoofed = factory.post(
+            "/", REMOTE_ADDR="10.0.0.254", HTTP_X_FORWARDED_FOR="9.9.9.9, 203.0.113.1"
+        )
+        with self.assertLogs("accounts.throttling", "WARNING"):
+            self.assertIsNotNone(check_throttle(spoofed, "comments"))
+
+    @override_settings(THROTTLE_RATES={"comments": {"user": "2/min", "ip": "1/min"}})
+    def test_signed_in_users_are_not_limited_per_address(self):
+        for username in ("throttle-a", "throttle-b"):
+            request = RequestFactory().post("/", REMOTE_ADDR="10.0.2.4")
+            request.user = User.objects.create(username=username)
+            self.assertIsNone(check_throttle(request, "comments"))
+            self.assertIsNone(check_throttle(request, "comments"))
+            with self.assertLogs("accounts.throttling", "WARNING"):
+                self.assertIsNotNone(check_throttle(request, "comments"))
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError("SMTP is down.")
+
+
+class OutboxTests(TestCase):
+    def queue(self, count):
+        return queue_mail("Hello", "Body", [f"to{index}@example.com" for index in range(count)])
+
+    def test_claims_never_overlap(self):
+        self.queue(5)
+        first, second = claim_batch(3), claim_batch(3)
+        self.assertEqual((len(first), len(second)), (3, 2))
+        self.assertFalse({message.pk for message in first} & {message.pk for message in second})
+        self.assertEqual(claim_batch(), [])
+
+    def test_delivery_sends_once(self):
+        self.queue(3)
+        self.assertEqual(deliver_batch(), {"sent": 3, "retried": 0, "dead": 0})
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(deliver_batch(), {"sent": 0, "retried": 0, "dead": 0})
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.STATUS_SENT).exists())
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.FailingEmailBackend")
+    def test_failures_back_off_then_dead_letter(self):
+        (message,) = self.queue(1)
+        self.assertEqual(deliver_batch(max_attempts=2), {"sent": 0, "retried": 1, "dead": 0})
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.STATUS_PENDING, 1))
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertIn("SMTP is down.", message.last_error)
+        OutboxMessage.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_batch(max_attempts=2), {"sent": 0, "retried": 0, "dead": 1})
+
+    def test_expired_leases_are_reclaimed_without_being_overwritten(self):
+        self.queue(1)
+        (stale,) = claim_batch()
+        stale_token = stale.claim_token
+        OutboxMessage.objects.update(
+            claimed_at=timezone.now() - timedelta(seconds=OUTBOX_LEASE_SECONDS + 1)
+        )
+        self.assertEqual(deliver_batch()["sent"], 1)
+        stale.status = OutboxMessage.STATUS_PENDING
+        self.assertFalse(_record_result(stale, stale_token))
+        self.assertEqual(OutboxMessage.objects.get().status, OutboxMessage.STATUS_SENT)
+
+
+class PasswordResetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("resetter", "resetter@example.com", "old-password")
+        cls.banned = User.objects.create_user("banned", "banned@example.com", "pw", is_banned=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def request_reset(self, email):
+        response = self.client.post(reverse("accounts:password_reset_request"), {"email": email})
+        self.assertRedirects(response, reverse("accounts:password_reset_done"))
+
+    def test_requests_do_the_same_work_for_every_email(self):
+        for email in ("Resetter@example.com", "nobody@example.com", "banned@example.com"):
+            with self.subTest(email=email), CaptureQueriesContext(connection) as queries:
+                self.request_reset(email)
+            self.assertFalse([query for query in queries if "accounts_user" in query["sql"]])
+        self.assertFalse(PasswordResetCode.objects.exists())
+        self.assertEqual(Job.objects.filter(name="accounts.send_password_reset").count(), 3)
+
+        while job := claim_next():
+            self.assertTrue(run_job(job))
+        (code,) = PasswordResetCode.objects.all()
+        self.assertEqual(code.user, self.user)
+        (message,) = OutboxMessage.objects.all()
+        self.assertEqual(message.to_email, "resetter@example.com")
+        self.assertIn(code.code, message.body)
+
+    def test_code_resets_the_password(self):
+        send_password_reset("resetter@example.com")
+        code = PasswordResetCode.objects.get().code
+        response = self.client.post(
+            reverse("accounts:password_reset_verify"),
+            {
+                "email": "resetter@example.com",
+                "code": code,
+                "new_password1": "a-new-Passw0rd",
+                "new_password2": "a-new-Passw0rd",
+            },
+        )
+        self.assertRedirects(response, reverse("login"))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("a-new-Passw0rd"))
+        self.assertTrue(PasswordResetCode.objects.get().is_used)
+
+
+
+class ProfileTests(TestCase):
+    def test_saving_the_profile_keeps_the_unread_count(self):
+        user = User.objects.create_user("profiled", "profiled@example.com", "pw")
+        # A notification lands after the request loaded its user.
+        User.objects.filter(pk=user.pk).update(unread_notification_count=4)
+        request = RequestFactory().post(
+            reverse("accounts:profile"), {"email": "new@example.com", "bio": "Hi"}
+        )
+        request.user = user
+        request._messages = CookieStorage(request)
+        response = ProfileView.as_view()(request)
+        self.assertEqual(response.status_code, 302)
+        user.refresh_from_db()
+        self.assertEqual((user.email, user.bio), ("new@example.com", "Hi"))
+        self.assertEqual(user.unread_notification_count, 4)
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_PERIODS = {
+    "s": 1,
+    "sec": 1,
+    "m": 60,
+    "min": 60,
+    "h": 60 * 60,
+    "hour": 60 * 60,
+    "d": 60 * 60 * 24,
+    "day": 60 * 60 * 24,
+}
+
+
+def parse_rate(rate):
+    count, period = rate.split("/")
+    return int(count), THROTTLE_PERIODS[period]
+
+
+def client_ip(request):
+    # Behind the reverse proxy REMOTE_ADDR is the proxy itself; the proxy
+    # appends the address it saw to the configured header, so the last entry
+    # is the one it vouches for.
+    header = settings.CLIENT_IP_HEADER
+    if header:
+        forwarded = request.META.get(header, "").split(",")[-1].strip()
+        if forwarded:
+            return forwarded
+    return request.META.get("REMOTE_ADDR")
+
+
+def _bucket_identity(request, kind):
+    if kind == "user":
+        user = request.user
+        return user.pk if user.is_authenticated else None
+    if kind == "ip":
+        return client_ip(request)
+    if kind == "email":
+        # Reset requests can rotate addresses, so they are also counted per
+        # submitted email; hashed to keep the cache key short and opaque.
+        email = request.POST.get("email", "").strip().lower()
+        return hashlib.sha256(email.encode()).hexdigest() if email else None
+    return None
+
+
+def _count_hit(key, period):
+    # incr() is atomic in the cache, so concurrent requests all land in the
+    # counter; the key is only created on a window's first hit.
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=2 * period + 1):
+            return 1
+        return cache.incr(key)
+
+
+def _retry_after(limit, period, elapsed, previous, current):
+    # Seconds until one more hit fits under the estimate, if no more arrive.
+    if current < limit and previous:
+        return period * (1 - (limit - current - 1) / previous) - elapsed
+    return period - elapsed + period * (1 - (limit - 1) / max(current, 1))
+
+
+def check_throttle(request, scope):
+    # A sliding window: the previous window's hits are weighted by how much
+    # of it still overlaps the last period, so a client cannot fit twice the
+    # limit around a window boundary. All previous counts come from one
+    # get_many, then each bucket costs a single incr.
+    rates = settings.THROTTLE_RATES.get(scope, {})
+    signed_in = "user" in rates and request.user.is_authenticated
+    now = time.time()
+    buckets = []
+    for kind, rate in rates.items():
+        identity = _bucket_identity(request, kind)
+        if identity is None or (kind == "ip" and signed_in):
+            # Signed-in clients are counted per user, so people sharing an
+            # address (an office, a carrier NAT) do not share a budget.
+            continue
+        limit, period = parse_rate(rate)
+        window = int(now // period)
+        buckets.append((f"throttle:{scope}:{kind}:{identity}", limit, period, window))
+    previous_counts = cache.get_many(
+        [f"{bucket}:{window - 1}" for bucket, _, _, window in buckets]
+    )
+    retry_after = 0.0
+    throttled = []
+    for bucket, limit, period, window in buckets:
+        previous = previous_counts.get(f"{bucket}:{window - 1}", 0)
+        current = _count_hit(f"{bucket}:{window}", period)
+        elapsed = now - window * period
+        if previous * (1 - elapsed / period) + current > limit:
+            retry_after = max(
+                retry_after, _retry_after(limit, period, elapsed, previous, current)
+            )
+            throttled.append(bucket)
+
+    if not throttled:
+        return None
+    record_rejection(scope)
+    logger.warning(
+        "Throttled %s for %s (retry in %.1fs)",
+        scope,
+        ", ".join(throttled),
+        retry_after,
+    )
+    return retry_after
+
+
+def record_rejection(scope) -> None:
+    key = f"throttle:rejected:{scope}"
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def throttle_rejections():
+    scopes = settings.THROTTLE_RATES
+    counts = cache.get_many([f"throttle:rejected:{scope}" for scope in scopes])
+    return {scope: counts.get(f"throttle:rejected:{scope}", 0) for scope in scopes}
+
+
+def throttled_response(request, retry_after):
+    seconds = max(1, math.ceil(retry_after))
+    if request.headers.get("X-Requested-With") == "XMLHttpRequest" or "application/json" in request.headers.get(
+        "Accept", ""
+    ):
+        response = JsonResponse(
+            {"error": "Too many requests.", "retry_after": seconds}, status=429
+        )
+    else:
+        response = render(
+            request, "429.html", {"retry_after": seconds}, status=429
+        )
+    response["Retry-After"] = str(seconds)
+    return response
+
+
+class ThrottleMixin:
+    throttle_scope: str | None = None
+    throttle_methods: tuple[str, ...] = ("POST",)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.throttle_scope and request.method in self.throttle_methods:
+            retry_after = check_throttle(request, self.throttle_scope)
+            if retry_after is not None:
+                return throttled_response(request, retry_after)
+        return super().dispatch(request, *args, **kwargs)
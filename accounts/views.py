@@ -1,18 +1,14 @@
-import secrets
-from datetime import timedelta
-
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import send_mail
 from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
 from django.views import View
 from django.views.generic import CreateView, FormView, ListView, TemplateView
 
+from jobs.queue import enqueue
+
 from .forms import (
     PasswordResetConfirmForm,
     PasswordResetRequestForm,
@@ -21,6 +17,7 @@ from .forms import (
 )
 from .mixins import RoleRequiredMixin
 from .models import PasswordResetCode, User
+from .throttling import ThrottleMixin
 
 
 class SignUpView(CreateView):
@@ -40,6 +37,7 @@ class UserListView(RoleRequiredMixin, ListView):
     template_name = "accounts/user_list.html"
     context_object_name = "users"
     allowed_roles = ("is_admin",)
+    paginate_by = 50
 
     def get_queryset(self):
         return (
@@ -93,40 +91,16 @@ class UserRoleUpdateView(RoleRequiredMixin, View):
         return HttpResponseRedirect(reverse("accounts:user_list"))
 
 
-class PasswordResetRequestView(FormView):
+class PasswordResetRequestView(ThrottleMixin, FormView):
+    throttle_scope = "password_reset"
     template_name = "accounts/password_reset_request.html"
     form_class = PasswordResetRequestForm
     success_url = reverse_lazy("accounts:password_reset_done")
 
     def form_valid(self, form):
-        email = form.cleaned_data["email"]
-        try:
-            user = User.objects.get(email__iexact=email)
-        except User.DoesNotExist:
-            pass
-        else:
-            if not user.is_banned:
-                PasswordResetCode.objects.filter(
-                    user=user, is_used=False
-                ).update(is_used=True)
-                code = f"{secrets.randbelow(10**6):06d}"
-                expires_at = timezone.now() + timedelta(minutes=15)
-                PasswordResetCode.objects.create(
-                    user=user,
-                    code=code,
-                    expires_at=expires_at,
-                )
-                send_mail(
-                    subject="Your Cetix password reset code",
-                    message=(
-                        "We received a request to reset your Cetix password.\n\n"
-                        f"Your verification code is: {code}\n"
-                        "This code will expire in 15 minutes.\n\n"
-                        "If you did not request this, you can ignore this email."
-                    ),
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[user.email],
-                )
+        # Looking the account up in the background makes known and unknown
+        # emails take the same time, so response timing reveals nothing.
+        enqueue("accounts.send_password_reset", {"email": form.cleaned_data["email"]})
         messages.success(
             self.request,
             "If an account with that email exists, we've sent a verification code.",
@@ -1,6 +1,12 @@
 from django.contrib import admin
 
-from .models import Article, ArticleComment, ArticleReaction, Bookmark, Category
+from accounts.admin_scaling import (
+    CreatedSinceFilter,
+    InsertOrderCreatedSinceFilter,
+    LargeTableAdminMixin,
+)
+
+from .models import Article, ArticleComment, ArticleReaction, Bookmark, Category, Tag
 
 
 @admin.register(Category)
@@ -10,8 +16,15 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ("name",)
 
 
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "published_count", "created_at")
+    search_fields = ("name", "slug")
+    readonly_fields = ("published_count",)
+
+
 @admin.register(Article)
-class ArticleAdmin(admin.ModelAdmin):
+class ArticleAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "title",
         "author",
@@ -20,8 +33,11 @@ class ArticleAdmin(admin.ModelAdmin):
         "created_at",
         "published_at",
     )
-    list_filter = ("status", "category", "created_at")
-    search_fields = ("title", "author__username", "author__email")
+    list_filter = ("status", "category", CreatedSinceFilter)
+    list_select_related = ("author", "category")
+    search_fields = ("=id", "^slug", "^author__username")
+    search_help_text = "Article id, or the start of a slug or author username."
+    keyset_pagination = True
     prepopulated_fields = {"slug": ("title",)}
     autocomplete_fields = ("author", "category", "last_moderated_by")
     fieldsets = (
@@ -30,24 +46,36 @@ class ArticleAdmin(admin.ModelAdmin):
         ("Content", {"fields": ("content",)}),
         ("Moderation", {"fields": ("last_moderated_by", "last_moderated_at")}),
     )
-    ordering = ("-created_at",)
 
 
 @admin.register(ArticleReaction)
-class ArticleReactionAdmin(admin.ModelAdmin):
+class ArticleReactionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("article", "user", "value", "created_at")
-    list_filter = ("value", "created_at")
-    search_fields = ("article__title", "user__username")
+    list_filter = ("value", InsertOrderCreatedSinceFilter)
+    list_select_related = ("article", "user")
+    search_fields = ("=article", "=user", "^article__slug", "^user__username")
+    search_help_text = "Article or user id, or the start of an article slug or username."
+    raw_id_fields = ("article", "user")
+    keyset_pagination = True
 
 
 @admin.register(Bookmark)
-class BookmarkAdmin(admin.ModelAdmin):
+class BookmarkAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("article", "user", "created_at")
-    search_fields = ("article__title", "user__username")
+    list_filter = (InsertOrderCreatedSinceFilter,)
+    list_select_related = ("article", "user")
+    search_fields = ("=article", "=user", "^article__slug", "^user__username")
+    search_help_text = "Article or user id, or the start of an article slug or username."
+    raw_id_fields = ("article", "user")
+    keyset_pagination = True
 
 
 @admin.register(ArticleComment)
-class ArticleCommentAdmin(admin.ModelAdmin):
+class ArticleCommentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("article", "user", "parent", "created_at")
-    search_fields = ("article__title", "user__username", "body")
+    list_filter = (InsertOrderCreatedSinceFilter,)
+    list_select_related = ("article", "user", "parent__article", "parent__user")
+    search_fields = ("=id", "=article", "=user", "^article__slug", "^user__username")
+    search_help_text = "Comment, article or user id, or the start of an article slug or username."
     autocomplete_fields = ("article", "user", "parent")
+    keyset_pagination = True
@@ -0,0 +1,391 @@
+import base64
+import binascii
+import hashlib
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Exists, OuterRef, Q, Subquery
+from django.db.models.functions import Substr
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
+
+from .models import Article, ArticleReaction, AuthorStats, Bookmark, Category
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+API_MAX_AGE = 60
+API_EXCERPT_LENGTH = 280
+API_CONTENT_TYPE = "application/json"
+ENGAGEMENT_BATCH_SIZE = 100
+ENGAGEMENT_MAX_AGE = 15
+
+_encoder = DjangoJSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_response(request, payload, status=200, max_age=API_MAX_AGE, private=False):
+    body = _encoder.encode(payload).encode()
+    if status != 200:
+        return HttpResponse(body, status=status, content_type=API_CONTENT_TYPE)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type=API_CONTENT_TYPE)
+    response["ETag"] = etag
+    if private:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+def encode_cursor(values) -> str:
+    # Full isoformat: the JSON encoder rounds datetimes to milliseconds, which
+    # would skip rows published within the same millisecond.
+    data = json.dumps(
+        [value.isoformat() if hasattr(value, "isoformat") else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ApiError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise ApiError("Invalid cursor.")
+    return values
+
+
+def clean_cursor(queryset, keys, values):
+    # A cursor that decodes but holds the wrong types, or integers outside
+    # the column's range, would only fail once the query runs.
+    cleaned = []
+    for key, value in zip(keys, values):
+        name = key.lstrip("-")
+        field = queryset.model._meta.pk if name == "pk" else queryset.model._meta.get_field(name)
+        field = getattr(field, "target_field", None) or field
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ApiError("Invalid cursor.")
+        try:
+            value = field.to_python(value)
+        except ValidationError:
+            raise ApiError("Invalid cursor.")
+        if value is None:
+            raise ApiError("Invalid cursor.")
+        if isinstance(value, int):
+            low, high = connections[queryset.db].ops.integer_field_range(
+                field.get_internal_type()
+            )
+            if (low is not None and value < low) or (high is not None and value > high):
+                raise ApiError("Invalid cursor.")
+        cleaned.append(value)
+    return cleaned
+
+
+def after_cursor(keys, values):
+    # Rows strictly after (values) in the order given by keys, e.g.
+    # ("-published_at", "-pk") -> published_at < a OR (published_at = a AND pk < b).
+    condition = Q()
+    for index, key in enumerate(keys):
+        field = key.lstrip("-")
+        lookup = "lt" if key.startswith("-") else "gt"
+        step = Q(**{f"{field}__{lookup}": values[index]})
+        for previous, value in zip(keys[:index], values):
+            step &= Q(**{previous.lstrip("-"): value})
+        condition |= step
+    return condition
+
+
+class ApiView(View):
+    fields = {}
+    default_fields = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return _json_response(request, {"error": str(error)}, status=error.status)
+
+    def get_fields(self):
+        requested = self.request.GET.get("fields")
+        if not requested:
+            return list(self.default_fields)
+        fields = list(
+            dict.fromkeys(name.strip() for name in requested.split(",") if name.strip())
+        )
+        unknown = [name for name in fields if name not in self.fields]
+        if unknown or not fields:
+            raise ApiError(
+                f"Unknown fields: {', '.join(unknown) or '(none)'}. "
+                f"Available: {', '.join(self.fields)}."
+            )
+        return fields
+
+    def get_queryset(self, fields):
+        raise NotImplementedError
+
+    def rows(self, queryset, fields, extra=()):
+        sources = [self.fields[name] for name in fields] + list(extra)
+        for values in queryset.values_list(*sources):
+            yield dict(zip(fields, values)), values[len(fields):]
+
+
+class ApiCollectionView(ApiView):
+    ordering = ("pk",)
+
+    def filter_queryset(self, queryset):
+        return queryset
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get("limit", API_PAGE_SIZE))
+        except ValueError:
+            raise ApiError("limit must be a number.")
+        if not 1 <= limit <= API_MAX_PAGE_SIZE:
+            raise ApiError(f"limit must be between 1 and {API_MAX_PAGE_SIZE}.")
+        return limit
+
+    def get(self, request, **kwargs):
+        fields = self.get_fields()
+        limit = self.get_limit()
+        queryset = self.filter_queryset(self.get_queryset(fields)).order_by(*self.ordering)
+        cursor = request.GET.get("cursor")
+        if cursor:
+            values = clean_cursor(
+                queryset, self.ordering, decode_cursor(cursor, len(self.ordering))
+            )
+            queryset = queryset.filter(after_cursor(self.ordering, values))
+        keys = [key.lstrip("-") for key in self.ordering]
+        page = list(self.rows(queryset[: limit + 1], fields, keys))
+        next_url = None
+        if len(page) > limit:
+            page = page[:limit]
+            query = request.GET.copy()
+            query["cursor"] = encode_cursor(list(page[-1][1]))
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        return _json_response(request, {"data": [row for row, _ in page], "next": next_url})
+
+
+class ApiDetailView(ApiView):
+    lookup_field = "slug"
+    lookup_kwarg = "slug"
+
+    def get(self, request, **kwargs):
+        fields = self.get_fields()
+        queryset = (
+            self.get_queryset(fields)
+            .filter(**{self.lookup_field: kwargs[self.lookup_kwarg]})
+            .order_by()
+        )
+        row = next((row for row, _ in self.rows(queryset[:1], fields)), None)
+        if row is None:
+            raise ApiError("Not found.", status=404)
+        return _json_response(request, {"data": row})
+
+
+ARTICLE_FIELDS = {
+    "id": "pk",
+    "slug": "slug",
+    "title": "title",
+    "author": "author__username",
+    "category": "category__slug",
+    "published_at": "published_at",
+    "updated_at": "updated_at",
+    "views": "view_count",
+    "likes": "total_likes",
+    "dislikes": "total_dislikes",
+    "score": "net_score",
+    "comments": "comment_count",
+    "excerpt": "excerpt",
+    "content": "content",
+}
+ARTICLE_ENGAGEMENT_FIELDS = {"likes", "dislikes", "score", "comments"}
+ARTICLE_LIST_FIELDS = (
+    "id",
+    "slug",
+    "title",
+    "author",
+    "category",
+    "published_at",
+    "score",
+    "comments",
+)
+
+
+class ArticleApiMixin:
+    fields = ARTICLE_FIELDS
+
+    def get_queryset(self, fields):
+        queryset = Article.published.all()
+        if ARTICLE_ENGAGEMENT_FIELDS.intersection(fields):
+            queryset = queryset.with_engagement()
+        if "excerpt" in fields:
+            queryset = queryset.annotate(excerpt=Substr("content", 1, API_EXCERPT_LENGTH))
+        return queryset
+
+
+class ArticleApiListView(ArticleApiMixin, ApiCollectionView):
+    default_fields = ARTICLE_LIST_FIELDS
+    ordering = ("-published_at", "-pk")
+
+    def filter_queryset(self, queryset):
+        for param, lookup in (("category", "category__slug"), ("author", "author__username")):
+            value = self.request.GET.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+
+class ArticleApiDetailView(ArticleApiMixin, ApiDetailView):
+    default_fields = (
+        *ARTICLE_LIST_FIELDS,
+        "updated_at",
+        "views",
+        "likes",
+        "dislikes",
+        "content",
+    )
+
+
+CATEGORY_FIELDS = {
+    "id": "pk",
+    "slug": "slug",
+    "name": "name",
+    "description": "description",
+    "articles": "published_count",
+}
+
+
+class CategoryApiMixin:
+    fields = CATEGORY_FIELDS
+    default_fields = tuple(CATEGORY_FIELDS)
+
+    def get_queryset(self, fields):
+        queryset = Category.objects.all()
+        if "articles" in fields:
+            queryset = queryset.with_published_count()
+        return queryset
+
+
+class CategoryApiListView(CategoryApiMixin, ApiCollectionView):
+    ordering = ("name",)
+
+
+class CategoryApiDetailView(CategoryApiMixin, ApiDetailView):
+    pass
+
+
+AUTHOR_FIELDS = {
+    "id": "author_id",
+    "username": "author__username",
+    "first_name": "author__first_name",
+    "last_name": "author__last_name",
+    "bio": "author__bio",
+    "website": "author__website",
+    "articles": "published_count",
+    "score": "total_score",
+    "avg_score": "avg_score",
+    "comments": "comment_count",
+    "followers": "follower_count",
+    "last_published_at": "last_published_at",
+}
+AUTHOR_LIST_FIELDS = ("id", "username", "articles", "score", "followers", "last_published_at")
+
+
+class AuthorApiMixin:
+    fields = AUTHOR_FIELDS
+
+    def get_queryset(self, fields):
+        return AuthorStats.objects.filter(published_count__gt=0)
+
+
+class AuthorApiListView(AuthorApiMixin, ApiCollectionView):
+    default_fields = AUTHOR_LIST_FIELDS
+    ordering = ("author_id",)
+
+
+class AuthorApiDetailView(AuthorApiMixin, ApiDetailView):
+    default_fields = tuple(AUTHOR_FIELDS)
+    lookup_field = "author__username"
+    lookup_kwarg = "username"
+
+
+def _split_param(request, name):
+    return [value for value in request.GET.get(name, "").split(",") if value]
+
+
+class EngagementApiView(ApiView):
+    def get(self, request):
+        slugs = _split_param(request, "slugs")
+        try:
+            ids = [int(value) for value in _split_param(request, "ids")]
+        except ValueError:
+            raise ApiError("ids must be numbers.")
+        if not slugs and not ids:
+            raise ApiError("Pass ?slugs= or ?ids=.")
+        if len(slugs) + len(ids) > ENGAGEMENT_BATCH_SIZE:
+            raise ApiError(f"At most {ENGAGEMENT_BATCH_SIZE} articles per request.")
+        queryset = (
+            Article.published.filter(Q(slug__in=slugs) | Q(pk__in=ids))
+            .with_engagement()
+            .order_by()
+        )
+        sources = ["slug", "pk", "total_likes", "total_dislikes", "net_score", "comment_count"]
+        viewer = request.user
+        if viewer.is_authenticated:
+            queryset = queryset.annotate(
+                viewer_reaction=Subquery(
+                    ArticleReaction.objects.filter(article=OuterRef("pk"), user=viewer).values(
+                        "value"
+                    )[:1]
+                ),
+                viewer_bookmarked=Exists(
+                    Bookmark.objects.filter(article=OuterRef("pk"), user=viewer)
+                ),
+            )
+            sources += ["viewer_reaction", "viewer_bookmarked"]
+        data = {}
+        for slug, pk, likes, dislikes, score, comments, *viewer_state in queryset.values_list(
+            *sources
+        ):
+            data[slug] = {
+                "id": pk,
+                "likes": likes,
+                "dislikes": dislikes,
+                "score": score,
+                "comments": comments,
+            }
+            if viewer_state:
+                data[slug]["reaction"], data[slug]["bookmarked"] = viewer_state
+        return _json_response(
+            request,
+            {"data": data},
+            max_age=ENGAGEMENT_MAX_AGE,
+            private=viewer.is_authenticated,
+        )
+
+
+class ApiIndexView(View):
+    def get(self, request):
+        return _json_response(
+            request,
+            {
+                "version": "v1",
+                "resources": {
+                    name: request.build_absolute_uri(reverse(f"articles:api_{name}"))
+                    for name in ("articles", "categories", "authors")
+                },
+            },
+        )
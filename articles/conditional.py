@@ -0,0 +1,202 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.db.models import Count, Exists, OuterRef, Subquery, Sum
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from .models import Article, ArticleDailyViews, AuthorStats, Category, FeedStamp, Follow, Tag
+from .pageviews import MOST_READ_WINDOW_DAYS
+
+User = get_user_model()
+
+
+def _viewer_key(request) -> str:
+    user = request.user
+    if not user.is_authenticated:
+        return "anonymous"
+    return "|".join(
+        str(part)
+        for part in (
+            user.pk,
+            user.username,
+            user.email,
+            user.first_name,
+            user.role,
+            user.is_staff,
+            user.is_banned,
+            user.avatar.name if user.avatar else "",
+            user.unread_notification_count,
+            request.META.get("CSRF_COOKIE", ""),
+        )
+    )
+
+
+def _build_validators(request, *parts):
+    stamps = [part for part in parts if hasattr(part, "tzinfo")]
+    etag = hashlib.md5(
+        "|".join(str(part) for part in (*parts, _viewer_key(request))).encode()
+    ).hexdigest()
+    last_modified = None
+    if stamps and not request.user.is_authenticated:
+        last_modified = max(stamps)
+    return etag, last_modified
+
+
+def article_validators(request, slug, **kwargs):
+    row = (
+        Article.published.filter(slug=slug)
+        .values("pk", "updated_at", "engagement_updated_at", "related_built_at")
+        .first()
+    )
+    if row is None:
+        return None, None
+    request.viewed_article_id = row["pk"]
+    return _build_validators(
+        request,
+        "article",
+        row["pk"],
+        row["updated_at"],
+        row["engagement_updated_at"],
+        row["related_built_at"],
+    )
+
+
+def _feed_parts(changed_at, engaged_at):
+    return changed_at, engaged_at, timezone.localdate()
+
+
+def feed_validators(request, **kwargs):
+    stamp = FeedStamp.site()
+    return _build_validators(
+        request, "feed", *_feed_parts(stamp["changed_at"], stamp["engaged_at"])
+    )
+
+
+def most_read_validators(request, **kwargs):
+    stamp = FeedStamp.site()
+    reads = ArticleDailyViews.objects.filter(
+        date__gt=timezone.localdate() - timedelta(days=MOST_READ_WINDOW_DAYS)
+    ).aggregate(total=Sum("views"), articles=Count("pk"))
+    return _build_validators(
+        request,
+        "most-read",
+        reads["total"],
+        reads["articles"],
+        *_feed_parts(stamp["changed_at"], stamp["engaged_at"]),
+    )
+
+
+def category_feed_validators(request, slug, **kwargs):
+    row = (
+        Category.objects.filter(slug=slug)
+        .annotate(**FeedStamp.annotations(FeedStamp.KIND_CATEGORY))
+        .values("pk", "name", "description", "feed_changed_at", "feed_engaged_at")
+        .first()
+    )
+    if row is None:
+        return None, None
+    return _build_validators(
+        request,
+        "category",
+        row["pk"],
+        row["name"],
+        row["description"],
+        *_feed_parts(row["feed_changed_at"], row["feed_engaged_at"]),
+    )
+
+
+def tag_feed_validators(request, slug, **kwargs):
+    row = (
+        Tag.objects.filter(slug=slug)
+        .annotate(**FeedStamp.annotations(FeedStamp.KIND_TAG))
+        .values("pk", "name", "feed_changed_at", "feed_engaged_at")
+        .first()
+    )
+    if row is None:
+        return None, None
+    return _build_validators(
+        request,
+        "tag",
+        row["pk"],
+        row["name"],
+        *_feed_parts(row["feed_changed_at"], row["feed_engaged_at"]),
+    )
+
+
+def author_feed_validators(request, username, **kwargs):
+    row = (
+        User.objects.filter(username=username)
+        .annotate(
+            **FeedStamp.annotations(FeedStamp.KIND_AUTHOR),
+            follower_total=Subquery(
+                AuthorStats.objects.filter(author=OuterRef("pk")).values(
+                    "follower_count"
+                )[:1]
+            ),
+            viewer_follows=Exists(
+                Follow.objects.filter(author=OuterRef("pk"), follower_id=request.user.pk)
+            ),
+        )
+        .values(
+            "pk",
+            "first_name",
+            "last_name",
+            "bio",
+            "follower_total",
+            "viewer_follows",
+            "feed_changed_at",
+            "feed_engaged_at",
+        )
+        .first()
+    )
+    if row is None:
+        return None, None
+    return _build_validators(
+        request,
+        "author",
+        row["pk"],
+        row["first_name"],
+        row["last_name"],
+        row["bio"],
+        row["follower_total"],
+        row["viewer_follows"],
+        *_feed_parts(row["feed_changed_at"], row["feed_engaged_at"]),
+    )
+
+
+def conditional_page(validators):
+    def decorator(view_func):
+        def resolve(request, *args, **kwargs):
+            if not hasattr(request, "_page_validators"):
+                if request.method not in ("GET", "HEAD") or len(get_messages(request)):
+                    request._page_validators = (None, None)
+                else:
+                    request._page_validators = validators(request, *args, **kwargs)
+            return request._page_validators
+
+        def etag_func(request, *args, **kwargs):
+            return resolve(request, *args, **kwargs)[0]
+
+        def last_modified_func(request, *args, **kwargs):
+            return resolve(request, *args, **kwargs)[1]
+
+        conditional_view = condition(
+            etag_func=etag_func, last_modified_func=last_modified_func
+        )(view_func)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            patch_vary_headers(response, ("Cookie",))
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True)
+            return response
+
+        return wrapper
+
+    return decorator
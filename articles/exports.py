@@ -0,0 +1,160 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, time as dt_time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Article, ArticleComment, ArticleReaction, Bookmark
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BUFFER_BYTES = 64 * 1024
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _count_of(model, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(article=OuterRef("pk"), **filters)
+            .order_by()
+            .values("article")
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def _articles(since):
+    queryset = Article.objects.annotate(
+        like_count=_count_of(ArticleReaction, value=ArticleReaction.VALUE_LIKE),
+        dislike_count=_count_of(ArticleReaction, value=ArticleReaction.VALUE_DISLIKE),
+        comment_count=_count_of(ArticleComment),
+        bookmark_count=_count_of(Bookmark),
+    )
+    if since:
+        queryset = queryset.filter(
+            Q(updated_at__gte=since) | Q(engagement_updated_at__gte=since)
+        )
+    return queryset
+
+
+def _created_since(model):
+    def build(since):
+        queryset = model.objects.all()
+        if since:
+            queryset = queryset.filter(created_at__gte=since)
+        return queryset
+
+    return build
+
+
+EXPORT_DATASETS = {
+    "articles": (
+        _articles,
+        (
+            "id",
+            "slug",
+            "title",
+            "status",
+            "author__username",
+            "category__slug",
+            "created_at",
+            "updated_at",
+            "published_at",
+            "like_count",
+            "dislike_count",
+            "comment_count",
+            "bookmark_count",
+        ),
+    ),
+    "reactions": (
+        _created_since(ArticleReaction),
+        ("id", "article_id", "user__username", "value", "created_at"),
+    ),
+    "comments": (
+        _created_since(ArticleComment),
+        ("id", "article_id", "user__username", "parent_id", "body", "created_at"),
+    ),
+    "bookmarks": (
+        _created_since(Bookmark),
+        ("id", "article_id", "user__username", "created_at"),
+    ),
+}
+
+
+def parse_since(value):
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid --since value: {value!r}")
+        moment = datetime.combine(day, dt_time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_lines(dataset, fmt="ndjson", since=None):
+    build, fields = EXPORT_DATASETS[dataset]
+    rows = (
+        build(since)
+        .order_by("pk")
+        .values_list(*fields)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    columns = [field.replace("__", "_") for field in fields]
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def render(values):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in values
+            )
+            return buffer.getvalue()
+
+        yield render(columns)
+        for row in rows:
+            yield render(row)
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+def export_chunks(lines, compress=False):
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= EXPORT_BUFFER_BYTES:
+            chunk = b"".join(buffer)
+            buffer, size = [], 0
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    chunk = b"".join(buffer)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,167 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.defaultfilters import linebreaks_filter, truncatewords
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+
+from .models import Article, Category, FeedStamp
+
+User = get_user_model()
+
+FEED_SIZE = 30
+FEED_EXCERPT_WORDS = 80
+FEED_CACHE_SECONDS = 60 * 60 * 24
+
+
+class CachedFeed(Feed):
+    def get_version(self, request, *args, **kwargs):
+        return {"changed_at": FeedStamp.site()["changed_at"]}
+
+    def __call__(self, request, *args, **kwargs):
+        version = self.get_version(request, *args, **kwargs)
+        if version is None:
+            return super().__call__(request, *args, **kwargs)
+        fingerprint = "|".join(
+            str(part)
+            for part in (
+                type(self).__name__,
+                request.build_absolute_uri("/"),
+                *args,
+                *sorted(kwargs.items()),
+                *sorted(version.items()),
+            )
+        )
+        digest = hashlib.md5(fingerprint.encode()).hexdigest()
+        etag = f'"{digest}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        cache_key = f"feeds:{digest}"
+        cached = cache.get(cache_key)
+        if cached is None:
+            rendered = super().__call__(request, *args, **kwargs)
+            cached = (
+                rendered.content,
+                rendered["Content-Type"],
+                rendered.headers.get("Last-Modified"),
+            )
+            cache.set(cache_key, cached, FEED_CACHE_SECONDS)
+        content, content_type, last_modified = cached
+        response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = last_modified
+        return response
+
+
+class LatestArticlesFeed(CachedFeed):
+    title = "Cetix - latest articles"
+    link = reverse_lazy("articles:article_list")
+    description = "Fresh long-reads from engineers and builders on Cetix."
+
+    def get_items_queryset(self, obj):
+        return Article.published.all()
+
+    def items(self, obj=None):
+        return (
+            self.get_items_queryset(obj)
+            .select_related("author", "category")
+            .order_by("-published_at", "-pk")[:FEED_SIZE]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return linebreaks_filter(truncatewords(item.content, FEED_EXCERPT_WORDS))
+
+    def item_pubdate(self, item):
+        return item.published_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse("articles:author_detail", args=[item.author.username])
+
+    def item_categories(self, item):
+        return (item.category.name,)
+
+
+class LatestArticlesAtomFeed(LatestArticlesFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestArticlesFeed.description
+
+
+class CategoryArticlesFeed(LatestArticlesFeed):
+    def get_version(self, request, slug):
+        return (
+            Category.objects.filter(slug=slug)
+            .annotate(**FeedStamp.annotations(FeedStamp.KIND_CATEGORY))
+            .values("name", "description", "feed_changed_at")
+            .first()
+        )
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Category, slug=slug)
+
+    def title(self, obj):
+        return f"Cetix - {obj.name}"
+
+    def link(self, obj):
+        return reverse("articles:category_detail", args=[obj.slug])
+
+    def description(self, obj):
+        return obj.description or f"Latest {obj.name} articles on Cetix."
+
+    def get_items_queryset(self, obj):
+        return Article.published.filter(category=obj)
+
+
+class CategoryArticlesAtomFeed(CategoryArticlesFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorArticlesFeed(LatestArticlesFeed):
+    def get_version(self, request, username):
+        return (
+            User.objects.filter(username=username)
+            .annotate(**FeedStamp.annotations(FeedStamp.KIND_AUTHOR))
+            .values("first_name", "last_name", "feed_changed_at")
+            .first()
+        )
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f"Cetix - articles by {obj.get_full_name() or obj.username}"
+
+    def link(self, obj):
+        return reverse("articles:author_detail", args=[obj.username])
+
+    def description(self, obj):
+        return f"Latest articles published by u/{obj.username} on Cetix."
+
+    def get_items_queryset(self, obj):
+        return Article.published.filter(author=obj)
+
+
+class AuthorArticlesAtomFeed(AuthorArticlesFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
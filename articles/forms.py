@@ -1,9 +1,19 @@
 from django import forms
+from django.utils.text import slugify
 
-from .models import Article
+from .models import TAG_NAME_MAX_LENGTH, Article
+
+MAX_TAGS_PER_ARTICLE = 8
 
 
 class ArticleForm(forms.ModelForm):
+    tags = forms.CharField(
+        required=False,
+        help_text=f"Comma-separated, up to {MAX_TAGS_PER_ARTICLE} tags.",
+        widget=forms.TextInput(attrs={"placeholder": "django, performance, sqlite"}),
+    )
+    field_order = ("title", "category", "tags")
+
     class Meta:
         model = Article
         fields = ("title", "category", "cover_image", "external_cover_url", "content")
@@ -11,6 +21,10 @@ class ArticleForm(forms.ModelForm):
     def __init__(self, *args, user=None, **kwargs):
         self.user = user
         super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault(
+                "tags", ", ".join(tag.name for tag in self.instance.tags.all())
+            )
         self.fields["cover_image"].required = False
         self.fields["cover_image"].widget.attrs.setdefault("accept", "image/*")
         self.fields["external_cover_url"].required = False
@@ -27,6 +41,23 @@ class ArticleForm(forms.ModelForm):
             status_field = self.fields.pop("status")
             self.fields["status"] = status_field
 
+    def clean_tags(self):
+        names = {}
+        for raw in self.cleaned_data["tags"].split(","):
+            name = " ".join(raw.split())
+            if not name:
+                continue
+            if len(name) > TAG_NAME_MAX_LENGTH:
+                raise forms.ValidationError(
+                    f"Tags can be at most {TAG_NAME_MAX_LENGTH} characters."
+                )
+            if not slugify(name):
+                raise forms.ValidationError(f"\"{name}\" is not a valid tag.")
+            names.setdefault(slugify(name), name)
+        if len(names) > MAX_TAGS_PER_ARTICLE:
+            raise forms.ValidationError(f"Use at most {MAX_TAGS_PER_ARTICLE} tags.")
+        return list(names.values())
+
     def clean(self):
         cleaned = super().clean()
         cover_file = cleaned.get("cover_image")
@@ -53,6 +84,7 @@ class ArticleForm(forms.ModelForm):
         if commit:
             article.save()
             self.save_m2m()
+            article.set_tags(self.cleaned_data["tags"])
         return article
 
 
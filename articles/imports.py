@@ -0,0 +1,164 @@
+import csv
+import gzip
+import io
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Article, AuthorStats, Category, FeedStamp, allocate_slugs
+
+User = get_user_model()
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_STATUSES = {value for value, _ in Article.STATUS_CHOICES}
+TITLE_MAX_LENGTH = Article._meta.get_field("title").max_length
+
+
+class RejectedRow(ValueError):
+    pass
+
+
+def open_source(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def read_rows(handle, fmt):
+    if fmt == "csv":
+        for line_number, row in enumerate(csv.DictReader(handle), start=1):
+            yield line_number, row
+        return
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            yield line_number, None
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, {"__error__": "Invalid JSON."}
+            continue
+        if not isinstance(row, dict):
+            row = {"__error__": "Expected a JSON object."}
+        yield line_number, row
+
+
+def _pick(row, *keys):
+    for key in keys:
+        value = row.get(key)
+        if value in (None, ""):
+            continue
+        if not isinstance(value, str):
+            raise RejectedRow(f"{key} must be a string.")
+        return value.strip()
+    return None
+
+
+class ArticleImporter:
+    def __init__(self, default_status=Article.STATUS_PUBLISHED):
+        self.default_status = default_status
+        self.author_ids = {}
+        self.category_ids = {}
+        for pk, slug, name in Category.objects.values_list("pk", "slug", "name"):
+            self.category_ids[slug] = pk
+            self.category_ids[name.lower()] = pk
+
+    def _resolve_authors(self, rows):
+        missing = set()
+        for row in rows:
+            try:
+                username = row and _pick(row, "author", "author_username")
+            except RejectedRow:
+                # build() rejects the row with the same message.
+                continue
+            if username and username not in self.author_ids:
+                missing.add(username)
+        if missing:
+            self.author_ids.update(
+                User.objects.filter(username__in=missing).values_list("username", "pk")
+            )
+
+    def build(self, row):
+        if row is None:
+            raise RejectedRow("Empty row.")
+        if "__error__" in row:
+            raise RejectedRow(row["__error__"])
+        title = _pick(row, "title")
+        content = _pick(row, "content", "body")
+        if not title:
+            raise RejectedRow("Missing title.")
+        if len(title) > TITLE_MAX_LENGTH:
+            raise RejectedRow(f"Title longer than {TITLE_MAX_LENGTH} characters.")
+        if not content:
+            raise RejectedRow("Missing content.")
+        username = _pick(row, "author", "author_username")
+        author_id = self.author_ids.get(username)
+        if author_id is None:
+            raise RejectedRow(f"Unknown author {username!r}.")
+        category = _pick(row, "category", "category_slug")
+        category_id = self.category_ids.get(category) or self.category_ids.get(
+            (category or "").lower()
+        )
+        if category_id is None:
+            raise RejectedRow(f"Unknown category {category!r}.")
+        status = _pick(row, "status") or self.default_status
+        if status not in IMPORT_STATUSES:
+            raise RejectedRow(f"Unknown status {status!r}.")
+        published_at = None
+        if status == Article.STATUS_PUBLISHED:
+            raw_published = _pick(row, "published_at")
+            published_at = parse_datetime(raw_published) if raw_published else None
+            if raw_published and published_at is None:
+                raise RejectedRow(f"Invalid published_at {raw_published!r}.")
+            if published_at and timezone.is_naive(published_at):
+                published_at = timezone.make_aware(published_at)
+            published_at = published_at or timezone.now()
+        return Article(
+            title=title,
+            content=content,
+            author_id=author_id,
+            category_id=category_id,
+            status=status,
+            published_at=published_at,
+            external_cover_url=_pick(row, "external_cover_url", "cover_url") or "",
+        )
+
+    def import_batch(self, numbered_rows, progress=None):
+        self._resolve_authors([row for _, row in numbered_rows])
+        articles = []
+        rejected = []
+        for line_number, row in numbered_rows:
+            try:
+                articles.append(self.build(row))
+            except RejectedRow as exc:
+                rejected.append((line_number, str(exc)))
+        with transaction.atomic():
+            for article, slug in zip(
+                articles, allocate_slugs([article.title for article in articles])
+            ):
+                article.slug = slug
+            Article.objects.bulk_create(articles)
+            FeedStamp.touch(
+                {(FeedStamp.KIND_SITE, 0)}
+                | {(FeedStamp.KIND_CATEGORY, article.category_id) for article in articles}
+                | {(FeedStamp.KIND_AUTHOR, article.author_id) for article in articles}
+            )
+            published_authors = {
+                article.author_id
+                for article in articles
+                if article.status == Article.STATUS_PUBLISHED
+            }
+            if published_authors:
+                AuthorStats.refresh(published_authors)
+            if progress is not None:
+                progress.line = numbered_rows[-1][0]
+                progress.imported += len(articles)
+                progress.rejected += len(rejected)
+                progress.save()
+        return len(articles), rejected
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import aclosing
+from datetime import timedelta
+
+from django.db import transaction
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from .models import Article
+
+logger = logging.getLogger(__name__)
+
+LIVE_COALESCE_SECONDS = 1
+LIVE_RESYNC_SECONDS = 5
+LIVE_KEEPALIVE_SECONDS = 15
+LIVE_RETRY_MS = 5000
+LIVE_MAX_COMMENT_AUTHORS = 5
+
+_pending_lock = threading.Lock()
+_pending = {"stats": set(), "comments": defaultdict(list)}
+# Only touched from the event loop that serves the streams.
+_subscribers = defaultdict(set)
+_last_sent = {}
+_flusher = {"task": None, "resynced_at": None}
+
+
+class Subscriber:
+    def __init__(self):
+        self.events = {}
+        self.ready = asyncio.Event()
+
+    def push(self, name, data) -> None:
+        if name == "comments" and name in self.events:
+            previous = self.events[name]
+            authors = previous["authors"] + [
+                author for author in data["authors"] if author not in previous["authors"]
+            ]
+            data = {
+                "count": previous["count"] + data["count"],
+                "authors": authors[:LIVE_MAX_COMMENT_AUTHORS],
+            }
+        self.events[name] = data
+        self.ready.set()
+
+    def drain(self) -> dict:
+        events, self.events = self.events, {}
+        self.ready.clear()
+        return events
+
+
+def _watched(article_id) -> bool:
+    # Read from request threads without the loop; a stale answer only
+    # means one update is dropped or buffered until the next tick.
+    return article_id in _subscribers
+
+
+def _queue_stats(article_id) -> None:
+    if _watched(article_id):
+        with _pending_lock:
+            _pending["stats"].add(article_id)
+
+
+def _queue_comment(article_id, author) -> None:
+    if _watched(article_id):
+        with _pending_lock:
+            _pending["stats"].add(article_id)
+            _pending["comments"][article_id].append(author)
+
+
+def publish_stats(article_id) -> None:
+    transaction.on_commit(lambda: _queue_stats(article_id))
+
+
+def publish_comment(comment) -> None:
+    article_id, author = comment.article_id, comment.user.username
+    transaction.on_commit(lambda: _queue_comment(article_id, author))
+
+
+def stats_payload(row) -> dict:
+    return {
+        "score": row["net_score"],
+        "likes": row["total_likes"],
+        "dislikes": row["total_dislikes"],
+        "comments": row["comment_count"],
+    }
+
+
+def _stats_rows(**filters):
+    return (
+        Article.published.filter(**filters)
+        .with_engagement()
+        .values("pk", "net_score", "total_likes", "total_dislikes", "comment_count")
+    )
+
+
+async def load_stats(article_ids) -> dict:
+    return {
+        row["pk"]: stats_payload(row) async for row in _stats_rows(pk__in=article_ids)
+    }
+
+
+async def _changed_elsewhere(article_ids) -> set:
+    # Other worker processes cannot reach this hub, but they stamp
+    # engagement_updated_at on every reaction and comment.
+    now = timezone.now()
+    since = _flusher["resynced_at"] or now
+    _flusher["resynced_at"] = now
+    rows = Article.objects.filter(
+        pk__in=article_ids,
+        engagement_updated_at__gte=since - timedelta(seconds=LIVE_COALESCE_SECONDS),
+    ).values_list("pk", flat=True)
+    return {pk async for pk in rows}
+
+
+def _broadcast(article_id, name, data) -> None:
+    for subscriber in _subscribers.get(article_id, ()):
+        subscriber.push(name, data)
+
+
+async def flush() -> int:
+    with _pending_lock:
+        dirty, comments = _pending["stats"], _pending["comments"]
+        _pending["stats"], _pending["comments"] = set(), defaultdict(list)
+    watched = set(_subscribers)
+    resynced_at = _flusher["resynced_at"]
+    if watched and (
+        resynced_at is None
+        or (timezone.now() - resynced_at).total_seconds() >= LIVE_RESYNC_SECONDS
+    ):
+        dirty |= await _changed_elsewhere(watched)
+    dirty &= set(_subscribers)
+    sent = 0
+    if dirty:
+        for article_id, stats in (await load_stats(dirty)).items():
+            if _last_sent.get(article_id) != stats:
+                _last_sent[article_id] = stats
+                _broadcast(article_id, "stats", stats)
+                sent += 1
+    for article_id, authors in comments.items():
+        unique = list(dict.fromkeys(authors))
+        _broadcast(
+            article_id,
+            "comments",
+            {"count": len(authors), "authors": unique[:LIVE_MAX_COMMENT_AUTHORS]},
+        )
+        sent += 1
+    return sent
+
+
+async def _flush_forever() -> None:
+    try:
+        while _subscribers:
+            await asyncio.sleep(LIVE_COALESCE_SECONDS)
+            # A failed tick must not end the task, or every open stream on
+            # this process goes quiet until a new subscriber restarts it.
+            try:
+                await flush()
+            except Exception:
+                logger.exception("Could not flush live article stats")
+    finally:
+        _flusher["task"] = None
+
+
+def _ensure_flusher() -> None:
+    task = _flusher["task"]
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        _flusher["task"] = asyncio.create_task(_flush_forever())
+
+
+def subscribe(article_id, stats) -> Subscriber:
+    subscriber = Subscriber()
+    _subscribers[article_id].add(subscriber)
+    _last_sent.setdefault(article_id, stats)
+    _ensure_flusher()
+    return subscriber
+
+
+def unsubscribe(article_id, subscriber) -> None:
+    subscribers = _subscribers.get(article_id)
+    if subscribers is None:
+        return
+    subscribers.discard(subscriber)
+    if not subscribers:
+        del _subscribers[article_id]
+        _last_sent.pop(article_id, None)
+
+
+def format_event(name, data) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def stream(article_id, stats):
+    subscriber = subscribe(article_id, stats)
+    try:
+        yield f"retry: {LIVE_RETRY_MS}\n" + format_event("stats", stats)
+        while True:
+            try:
+                await asyncio.wait_for(subscriber.ready.wait(), LIVE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield "".join(
+                format_event(name, data) for name, data in subscriber.drain().items()
+            )
+    finally:
+        unsubscribe(article_id, subscriber)
+
+
+async def _send_stream(send, article_id, stats) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        }
+    )
+    async with aclosing(stream(article_id, stats)) as chunks:
+        async for chunk in chunks:
+            await send(
+                {"type": "http.response.body", "body": chunk.encode(), "more_body": True}
+            )
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+class LiveStreamRouter:
+    # Django's ASGI handler pins a sync thread to every request for as long
+    # as its response streams, so idle event streams are served here instead.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        article_id, stats = await self.resolve_stream(scope)
+        if article_id is None:
+            return await self.app(scope, receive, send)
+        tasks = [
+            asyncio.create_task(_send_stream(send, article_id, stats)),
+            asyncio.create_task(_wait_for_disconnect(receive)),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def resolve_stream(self, scope):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None, None
+        try:
+            match = resolve(scope["path"].removeprefix(scope.get("root_path", "")))
+        except Resolver404:
+            return None, None
+        if match.view_name != "articles:article_live":
+            return None, None
+        row = await _stats_rows(slug=match.kwargs["slug"]).afirst()
+        if row is None:
+            return None, None
+        return row["pk"], stats_payload(row)
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from articles.related import RELATED_TOP_K, build_related
+
+
+class Command(BaseCommand):
+    help = "Precompute TF-IDF related articles for new and changed published articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every article instead of only the changed ones.",
+        )
+        parser.add_argument(
+            "--same-category",
+            action="store_true",
+            help="Never suggest articles from another category.",
+        )
+        parser.add_argument("--top-k", type=int, default=RELATED_TOP_K)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        result = build_related(
+            full=options["full"],
+            same_category=options["same_category"],
+            k=max(options["top_k"], 1),
+        )
+        if not result["changed"]:
+            self.stdout.write(self.style.SUCCESS("Related articles are up to date."))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Scored {result['changed']} of {result['articles']} articles and "
+                f"rewrote {result['updated']} related lists "
+                f"in {time.monotonic() - started:.1f}s."
+            )
+        )
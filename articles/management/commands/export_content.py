@@ -0,0 +1,62 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.exports import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    export_chunks,
+    export_lines,
+    parse_since,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream articles with engagement counts, or raw engagement rows, as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "dataset",
+            nargs="?",
+            default="articles",
+            choices=sorted(EXPORT_DATASETS),
+            help="What to export (default: articles).",
+        )
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument(
+            "--since",
+            help="Only rows changed at or after this ISO date/datetime.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the output with gzip.",
+        )
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="Write to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_since(options["since"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        lines = export_lines(options["dataset"], options["format"], since)
+        chunks = export_chunks(lines, compress=options["gzip"])
+        written = 0
+        if options["output"]:
+            with open(options["output"], "wb") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    written += len(chunk)
+            self.stderr.write(
+                self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}.")
+            )
+        else:
+            stream = sys.stdout.buffer
+            for chunk in chunks:
+                stream.write(chunk)
+            stream.flush()
@@ -0,0 +1,109 @@
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.imports import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_STATUSES,
+    ArticleImporter,
+    open_source,
+    read_rows,
+)
+from articles.models import Article, ImportProgress
+
+
+class Command(BaseCommand):
+    help = "Bulk import articles from an NDJSON or CSV file (optionally gzipped)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=("ndjson", "csv"),
+            help="Input format (default: guessed from the file extension).",
+        )
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            "--status",
+            choices=sorted(IMPORT_STATUSES),
+            default=Article.STATUS_PUBLISHED,
+            help="Status for rows that do not specify one.",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="Append rejected rows as NDJSON to this file.",
+        )
+        parser.add_argument(
+            "--state",
+            help="Name the progress is saved under (default: the file's absolute path).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore any saved progress and start from the first row.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if path != "-" and not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+        fmt = options["format"] or (
+            "csv" if path.removesuffix(".gz").endswith(".csv") else "ndjson"
+        )
+        batch_size = max(options["batch_size"], 1)
+        state_key = options["state"] or (None if path == "-" else os.path.abspath(path))
+
+        if state_key:
+            progress, _ = ImportProgress.objects.get_or_create(source=state_key)
+            if options["restart"]:
+                progress.line = progress.imported = progress.rejected = 0
+                progress.save()
+            elif progress.line:
+                self.stdout.write(f"Resuming after row {progress.line}.")
+        else:
+            progress = ImportProgress(source="-")
+
+        importer = ArticleImporter(default_status=options["status"])
+        rejects = open(options["rejects"], "a", encoding="utf-8") if options["rejects"] else None
+        started = time.monotonic()
+        session_rows = 0
+        try:
+            with open_source(path) as handle:
+                rows = islice(read_rows(handle, fmt), progress.line, None)
+                while batch := list(islice(rows, batch_size)):
+                    batch_started = time.monotonic()
+                    imported, rejected = importer.import_batch(
+                        batch, progress if state_key else None
+                    )
+                    if not state_key:
+                        progress.line = batch[-1][0]
+                        progress.imported += imported
+                        progress.rejected += len(rejected)
+                    for line_number, reason in rejected:
+                        if rejects:
+                            rejects.write(
+                                json.dumps({"line": line_number, "reason": reason}) + "\n"
+                            )
+                        if options["verbosity"] > 1:
+                            self.stderr.write(f"Row {line_number}: {reason}")
+                    session_rows += len(batch)
+                    elapsed = time.monotonic() - batch_started
+                    self.stdout.write(
+                        f"Row {progress.line}: +{imported} imported, "
+                        f"{len(rejected)} rejected ({len(batch) / max(elapsed, 1e-6):.0f} rows/s)"
+                    )
+        finally:
+            if rejects:
+                rejects.close()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {progress.imported} articles, rejected {progress.rejected} rows "
+                f"({session_rows / max(elapsed, 1e-6):.0f} rows/s this run). "
+                "Run rollup_category_stats --full to refresh category activity."
+            )
+        )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from articles.models import AuthorStats
+
+
+class Command(BaseCommand):
+    help = "Recompute materialized author statistics from articles, reactions, and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "usernames",
+            nargs="*",
+            help="Only rebuild stats for these authors (default: everyone).",
+        )
+
+    def handle(self, *args, **options):
+        usernames = options["usernames"]
+        if usernames:
+            author_ids = list(
+                User.objects.filter(username__in=usernames).values_list("pk", flat=True)
+            )
+            AuthorStats.refresh(author_ids)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {len(author_ids)} authors."))
+        else:
+            AuthorStats.refresh()
+            self.stdout.write(self.style.SUCCESS("Rebuilt stats for all authors."))
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+
+from articles.models import CategoryDailyStats
+from articles.rollups import first_activity_date, rollup_category_stats
+
+
+class Command(BaseCommand):
+    help = "Roll up daily published/reaction/comment activity per category."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Recompute the last N days instead of resuming from the latest rollup.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild every day since the first recorded activity.",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=31,
+            help="Number of days recomputed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options["days"]:
+            start = today - timedelta(days=options["days"] - 1)
+        else:
+            latest = None
+            if not options["full"]:
+                latest = CategoryDailyStats.objects.aggregate(latest=Max("date"))["latest"]
+            start = latest or first_activity_date()
+        if start is None:
+            self.stdout.write("No activity to roll up yet.")
+            return
+
+        chunk = max(options["chunk_days"], 1)
+        written = 0
+        while start <= today:
+            end = min(start + timedelta(days=chunk - 1), today)
+            written += rollup_category_stats(start, end)
+            self.stdout.write(f"Rolled up {start} .. {end}")
+            start = end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily category rows."))
@@ -14,6 +14,7 @@ from articles.models import (
     Article,
     ArticleComment,
     ArticleReaction,
+    AuthorStats,
     Bookmark,
     Category,
     CATEGORY_FALLBACK_COVERS,
@@ -309,6 +310,8 @@ class Command(BaseCommand):
             for article in created_articles:
                 self._seed_interactions(article, all_users)
 
+            AuthorStats.refresh()
+
             self.stdout.write(self.style.SUCCESS("Engagement metrics applied. Seeding complete."))
 
     def _ensure_categories(self):
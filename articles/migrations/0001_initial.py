@@ -1,7 +1,3 @@
-<<<<<<< Updated upstream
-=======
-
->>>>>>> Stashed changes
 import django.core.validators
 import django.db.models.deletion
 from django.conf import settings
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_alter_article_cover_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='engagement_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
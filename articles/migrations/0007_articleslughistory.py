@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_article_engagement_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSlugHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slug_history', to='articles.article')),
+            ],
+            options={
+                'verbose_name_plural': 'article slug history',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, Max, Sum, Value, When
+
+
+def populate_author_stats(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    ArticleReaction = apps.get_model("articles", "ArticleReaction")
+    ArticleComment = apps.get_model("articles", "ArticleComment")
+    AuthorStats = apps.get_model("articles", "AuthorStats")
+    stats = {}
+    for row in (
+        Article.objects.filter(status="published")
+        .order_by()
+        .values("author_id")
+        .annotate(total=Count("pk"), latest=Max("published_at"))
+    ):
+        stats[row["author_id"]] = AuthorStats(
+            author_id=row["author_id"],
+            published_count=row["total"],
+            last_published_at=row["latest"],
+        )
+    for row in (
+        ArticleReaction.objects.filter(article__status="published")
+        .order_by()
+        .values("article__author_id")
+        .annotate(
+            score=Sum(
+                Case(
+                    When(value="like", then=Value(1)),
+                    When(value="dislike", then=Value(-1)),
+                    default=Value(0),
+                )
+            )
+        )
+    ):
+        stats[row["article__author_id"]].total_score = row["score"] or 0
+    for row in (
+        ArticleComment.objects.filter(article__status="published")
+        .order_by()
+        .values("article__author_id")
+        .annotate(total=Count("pk"))
+    ):
+        stats[row["article__author_id"]].comment_count = row["total"]
+    for entry in stats.values():
+        entry.avg_score = entry.total_score / entry.published_count
+    AuthorStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_articleslughistory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('published_count', models.PositiveIntegerField(default=0)),
+                ('total_score', models.IntegerField(default=0)),
+                ('avg_score', models.FloatField(default=0)),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('last_published_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='author_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'author stats',
+                'indexes': [models.Index(fields=['-published_count', 'author'], name='articles_au_publish_fd78b0_idx'), models.Index(fields=['-total_score', 'author'], name='articles_au_total_s_5589de_idx'), models.Index(fields=['-avg_score', 'author'], name='articles_au_avg_sco_039303_idx'), models.Index(fields=['-last_published_at', 'author'], name='articles_au_last_pu_d419bc_idx')],
+            },
+        ),
+        migrations.RunPython(populate_author_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_authorstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('published_count', models.PositiveIntegerField(default=0)),
+                ('reaction_count', models.PositiveIntegerField(default=0)),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('active_authors', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='articles.category')),
+            ],
+            options={
+                'verbose_name_plural': 'category daily stats',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['date', 'category'], name='articles_ca_date_a9afbc_idx')],
+                'constraints': [models.UniqueConstraint(fields=('category', 'date'), name='unique_category_daily_stats')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='related_built_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='articles.article')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.article')),
+            ],
+            options={
+                'ordering': ['article', 'rank'],
+                'indexes': [models.Index(fields=['related'], name='articles_re_related_cad83a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('article', 'rank'), name='unique_related_rank')],
+            },
+        ),
+    ]
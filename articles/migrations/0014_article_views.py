@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='view_count',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='ArticleDailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='articles.article')),
+            ],
+            options={
+                'verbose_name_plural': 'article daily views',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date', 'article', 'views'], name='articles_ar_date_4e4ceb_idx')],
+                'constraints': [models.UniqueConstraint(fields=('article', 'date'), name='unique_article_daily_views')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0014_article_views'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='article',
+            name='articles_ar_status_edb746_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='article',
+            name='articles_ar_publish_c1a2fc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', 'created_at'], name='articles_ar_status_cbb22b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-published_at', '-id'], name='article_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['category', '-published_at', '-id'], name='article_category_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['author', '-published_at', '-id'], name='article_author_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlecomment',
+            index=models.Index(fields=['article', 'parent', 'created_at'], name='articles_ar_article_c05711_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlereaction',
+            index=models.Index(fields=['article', 'value'], name='articles_ar_article_e30d41_idx'),
+        ),
+    ]
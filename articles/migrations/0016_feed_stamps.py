@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-19 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0015_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedStamp',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField()),
+                ('engaged_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_feed_stamp')],
+            },
+        ),
+    ]
@@ -1,10 +1,28 @@
-from django.conf import settings
+import re
+
 from django.conf import settings
 from django.db import models
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
 
+from jobs.queue import enqueue
+
 
 CATEGORY_FALLBACK_COVERS = {
     "Backend": "https://images.unsplash.com/photo-1555066931-4365d14bab8c?ixlib=rb-4.0.3&auto=format&fit=crop&w=1400&q=80",
@@ -17,12 +35,50 @@ CATEGORY_FALLBACK_COVERS = {
 
 User = settings.AUTH_USER_MODEL
 
+SLUG_BASE_MAX_LENGTH = 240
+SLUG_LOOKUP_BATCH_SIZE = 100
+SLUG_SUFFIX_RE = re.compile(r"(.+)-\d+")
+TIMELINE_BACKFILL_SIZE = 20
+TAG_NAME_MAX_LENGTH = 50
+RESERVED_SLUGS = {
+    "authors",
+    "bookmarks",
+    "categories",
+    "create",
+    "feed",
+    "following",
+    "moderation",
+    "notifications",
+    "popular",
+    "tags",
+}
+
+
+class CategoryQuerySet(models.QuerySet):
+    def with_published_count(self):
+        # A correlated count per category walks article_category_feed_idx,
+        # so the totals are live without a GROUP BY over every article.
+        return self.annotate(
+            published_count=Coalesce(
+                Subquery(
+                    Article.published.filter(category=OuterRef("pk"))
+                    .order_by()
+                    .values("category")
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+        )
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=120, unique=True)
     description = models.TextField(blank=True)
 
+    objects = CategoryQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
 
@@ -35,7 +91,115 @@ class Category(models.Model):
         super().save(*args, **kwargs)
 
 
-class PublishedArticleManager(models.Manager):
+def _suffix_base(slug):
+    match = SLUG_SUFFIX_RE.fullmatch(slug)
+    return match.group(1) if match else None
+
+
+def allocate_slugs(titles, article=None) -> list[str]:
+    bases = [slugify(title)[:SLUG_BASE_MAX_LENGTH].strip("-") or "article" for title in titles]
+    distinct_bases = sorted(set(bases))
+    taken = set(RESERVED_SLUGS)
+    for start in range(0, len(distinct_bases), SLUG_LOOKUP_BATCH_SIZE):
+        # ":" sorts right after "9", so each range only covers "<base>-<digit>…"
+        # slugs rather than every "<base>-anything".
+        batch = set(distinct_bases[start : start + SLUG_LOOKUP_BATCH_SIZE])
+        ranges = Q()
+        for base_slug in sorted(batch):
+            ranges |= Q(slug=base_slug) | Q(
+                slug__gte=f"{base_slug}-0", slug__lt=f"{base_slug}-:"
+            )
+        live = Article.objects.filter(ranges)
+        retired = ArticleSlugHistory.objects.filter(ranges)
+        if article is not None and article.pk:
+            live = live.exclude(pk=article.pk)
+            retired = retired.exclude(article_id=article.pk)
+        taken.update(
+            slug
+            for slug in live.order_by().values_list("slug", flat=True).union(
+                retired.order_by().values_list("slug", flat=True)
+            )
+            if slug in batch or _suffix_base(slug) in batch
+        )
+    slugs = []
+    next_suffix = {}
+    for base_slug in bases:
+        slug = base_slug
+        suffix = next_suffix.get(base_slug, 1)
+        if suffix > 1:
+            slug = f"{base_slug}-{suffix}"
+        while slug in taken:
+            suffix += 1
+            slug = f"{base_slug}-{suffix}"
+        next_suffix[base_slug] = suffix
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def allocate_slug(title, article=None) -> str:
+    return allocate_slugs([title], article=article)[0]
+
+
+def schedule_timeline_sync(article_ids) -> None:
+    article_ids = sorted(set(article_ids))
+    if article_ids:
+        transaction.on_commit(
+            lambda: enqueue("articles.sync_timeline", {"article_ids": article_ids})
+        )
+
+
+class ArticleQuerySet(models.QuerySet):
+    def moderate(self, status, moderator) -> int:
+        now = timezone.now()
+        rows = list(self.values_list("pk", "author_id"))
+        author_ids = {author_id for _, author_id in rows}
+        if status == Article.STATUS_PUBLISHED:
+            published_at = Coalesce(
+                "published_at", Value(now, output_field=models.DateTimeField())
+            )
+        else:
+            published_at = None
+        updated = self.update(
+            status=status,
+            published_at=published_at,
+            last_moderated_by=moderator,
+            last_moderated_at=now,
+            updated_at=now,
+        )
+        FeedStamp.touch_articles([pk for pk, _ in rows])
+        AuthorStats.refresh(author_ids)
+        ArticleTag.sync([pk for pk, _ in rows])
+        schedule_timeline_sync([pk for pk, _ in rows])
+        return updated
+
+    def with_engagement(self):
+        # Correlated counts instead of GROUP BY joins, so feeds can walk an
+        # index in order and only count reactions for the rows on the page.
+        def per_article(queryset):
+            return Coalesce(
+                Subquery(
+                    queryset.filter(article=OuterRef("pk"))
+                    .order_by()
+                    .values("article")
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+
+        return self.annotate(
+            total_likes=per_article(
+                ArticleReaction.objects.filter(value=ArticleReaction.VALUE_LIKE)
+            ),
+            total_dislikes=per_article(
+                ArticleReaction.objects.filter(value=ArticleReaction.VALUE_DISLIKE)
+            ),
+            comment_count=per_article(ArticleComment.objects.all()),
+        ).annotate(net_score=F("total_likes") - F("total_dislikes"))
+
+
+class PublishedArticleManager(models.Manager.from_queryset(ArticleQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(status=Article.STATUS_PUBLISHED)
 
@@ -78,34 +242,107 @@ class Article(models.Model):
         related_name="moderated_articles",
     )
     last_moderated_at = models.DateTimeField(null=True, blank=True)
+    engagement_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
+    related_built_at = models.DateTimeField(null=True, blank=True, editable=False)
+    view_count = models.PositiveBigIntegerField(default=0, editable=False)
+    tags = models.ManyToManyField(
+        "Tag", through="ArticleTag", related_name="articles", blank=True
+    )
 
-    objects = models.Manager()
+    objects = ArticleQuerySet.as_manager()
     published = PublishedArticleManager()
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["status"]),
-            models.Index(fields=["-published_at"]),
+            models.Index(fields=["status", "created_at"]),
+            # created_at is backdated by the demo seed, so the admin's created
+            # filter ranges over it instead of the primary key.
+            models.Index(fields=["created_at", "id"], name="article_created_idx"),
+            models.Index(
+                fields=["-published_at", "-id"],
+                condition=Q(status="published"),
+                name="article_published_idx",
+            ),
+            models.Index(
+                fields=["category", "-published_at", "-id"],
+                condition=Q(status="published"),
+                name="article_category_feed_idx",
+            ),
+            models.Index(
+                fields=["author", "-published_at", "-id"],
+                condition=Q(status="published"),
+                name="article_author_feed_idx",
+            ),
         ]
 
     def __str__(self) -> str:
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        for name in ("title", "slug", "status", "author_id", "category_id"):
+            if name in instance.__dict__:
+                setattr(instance, f"_loaded_{name}", instance.__dict__[name])
+        return instance
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            suffix = 1
-            while Article.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                suffix += 1
-                slug = f"{base_slug}-{suffix}"
-            self.slug = slug
+        loaded_slug = getattr(self, "_loaded_slug", None)
+        title_changed = self.title != getattr(self, "_loaded_title", self.title)
+        if not self.slug or (title_changed and self.slug == loaded_slug):
+            self.slug = allocate_slug(self.title, article=self)
         if self.status == self.STATUS_PUBLISHED and not self.published_at:
             self.published_at = timezone.now()
         if self.status != self.STATUS_PUBLISHED:
             self.published_at = None
         super().save(*args, **kwargs)
+        if loaded_slug and loaded_slug != self.slug:
+            ArticleSlugHistory.objects.filter(article=self, slug=self.slug).delete()
+            ArticleSlugHistory.objects.get_or_create(
+                slug=loaded_slug, defaults={"article": self}
+            )
+        loaded_status = getattr(self, "_loaded_status", None)
+        loaded_author_id = getattr(self, "_loaded_author_id", None)
+        if self.STATUS_PUBLISHED in {loaded_status, self.status} and (
+            loaded_status != self.status or loaded_author_id != self.author_id
+        ):
+            AuthorStats.refresh({self.author_id, loaded_author_id} - {None})
+            ArticleTag.sync([self.pk])
+            schedule_timeline_sync([self.pk])
+        previous = {
+            (FeedStamp.KIND_AUTHOR, loaded_author_id),
+            (FeedStamp.KIND_CATEGORY, getattr(self, "_loaded_category_id", None)),
+        }
+        FeedStamp.touch_articles(
+            [self.pk], also={scope for scope in previous if scope[1] is not None}
+        )
+        self._loaded_title = self.title
+        self._loaded_slug = self.slug
+        self._loaded_status = self.status
+        self._loaded_author_id = self.author_id
+        self._loaded_category_id = self.category_id
+
+    def set_tags(self, names) -> None:
+        wanted = {tag.pk for tag in Tag.get_or_create_many(names)}
+        current = set(self.article_tags.values_list("tag_id", flat=True))
+        if wanted == current:
+            return
+        self.article_tags.filter(tag_id__in=current - wanted).delete()
+        published_at = self.published_at if self.status == self.STATUS_PUBLISHED else None
+        ArticleTag.objects.bulk_create(
+            [
+                ArticleTag(article=self, tag_id=tag_id, published_at=published_at)
+                for tag_id in wanted - current
+            ],
+            ignore_conflicts=True,
+        )
+        Tag.refresh_counts(current ^ wanted)
+
+    @classmethod
+    def mark_engaged(cls, article_id) -> None:
+        cls.objects.filter(pk=article_id).update(engagement_updated_at=timezone.now())
+        FeedStamp.touch_articles([article_id], engagement=True)
 
     @property
     def likes_count(self) -> int:
@@ -119,6 +356,12 @@ class Article(models.Model):
             return self.total_dislikes
         return self.reactions.filter(value=ArticleReaction.VALUE_DISLIKE).count()
 
+    @property
+    def comments_count(self) -> int:
+        if hasattr(self, "comment_count") and self.comment_count is not None:
+            return self.comment_count
+        return self.comments.count()
+
     def can_edit(self, user) -> bool:
         if not user or not getattr(user, "is_authenticated", False):
             return False
@@ -161,6 +404,162 @@ class Article(models.Model):
         return None
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=TAG_NAME_MAX_LENGTH)
+    slug = models.SlugField(max_length=TAG_NAME_MAX_LENGTH, unique=True)
+    published_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+        indexes = [
+            models.Index(fields=["-published_count", "name"]),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse("articles:tag_detail", args=[self.slug])
+
+    @classmethod
+    def get_or_create_many(cls, names) -> list["Tag"]:
+        names_by_slug = {}
+        for name in names:
+            slug = slugify(name)[:TAG_NAME_MAX_LENGTH].strip("-")
+            if slug:
+                names_by_slug.setdefault(slug, name)
+        if not names_by_slug:
+            return []
+        cls.objects.bulk_create(
+            [cls(name=name, slug=slug) for slug, name in names_by_slug.items()],
+            ignore_conflicts=True,
+        )
+        tags = cls.objects.in_bulk(list(names_by_slug), field_name="slug")
+        return [tags[slug] for slug in names_by_slug]
+
+    @classmethod
+    def refresh_counts(cls, tag_ids) -> None:
+        tag_ids = set(tag_ids)
+        if not tag_ids:
+            return
+        FeedStamp.touch((FeedStamp.KIND_TAG, tag_id) for tag_id in tag_ids)
+        cls.objects.filter(pk__in=tag_ids).update(
+            published_count=Coalesce(
+                Subquery(
+                    ArticleTag.objects.filter(
+                        tag=OuterRef("pk"), published_at__isnull=False
+                    )
+                    .order_by()
+                    .values("tag")
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+        )
+
+
+class ArticleTag(models.Model):
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="article_tags"
+    )
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="article_tags")
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["article", "tag"], name="unique_article_tag"),
+        ]
+        indexes = [
+            models.Index(fields=["tag", "-published_at", "-article"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.article} tagged {self.tag}"
+
+    @classmethod
+    def sync(cls, article_ids) -> None:
+        rows = cls.objects.filter(article_id__in=set(article_ids))
+        tag_ids = set(rows.values_list("tag_id", flat=True))
+        if not tag_ids:
+            return
+        rows.update(
+            published_at=Subquery(
+                Article.published.filter(pk=OuterRef("article_id")).values(
+                    "published_at"
+                )[:1]
+            )
+        )
+        Tag.refresh_counts(tag_ids)
+
+
+class CategoryDailyStats(models.Model):
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    date = models.DateField()
+    published_count = models.PositiveIntegerField(default=0)
+    reaction_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    active_authors = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name_plural = "category daily stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "date"], name="unique_category_daily_stats"
+            ),
+        ]
+        indexes = [models.Index(fields=["date", "category"])]
+
+    def __str__(self) -> str:
+        return f"{self.category} on {self.date}"
+
+    @property
+    def activity(self) -> int:
+        return self.published_count + self.reaction_count + self.comment_count
+
+
+class ArticleDailyViews(models.Model):
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="daily_views"
+    )
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name_plural = "article daily views"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "date"], name="unique_article_daily_views"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date", "article", "views"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.article} on {self.date}: {self.views}"
+
+
+class ArticleSlugHistory(models.Model):
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="slug_history"
+    )
+    slug = models.SlugField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "article slug history"
+
+    def __str__(self) -> str:
+        return f"{self.slug} -> {self.article}"
+
+
 class ArticleReaction(models.Model):
     VALUE_LIKE = "like"
     VALUE_DISLIKE = "dislike"
@@ -181,10 +580,29 @@ class ArticleReaction(models.Model):
 
     class Meta:
         unique_together = ("article", "user")
+        indexes = [
+            models.Index(fields=["article", "value"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user} -> {self.article} ({self.value})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_value = instance.__dict__.get("value")
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded_value = getattr(self, "_loaded_value", None)
+        super().save(*args, **kwargs)
+        self._loaded_value = self.value
+        score_delta = REACTION_SCORES.get(self.value, 0) - REACTION_SCORES.get(
+            loaded_value, 0
+        )
+        if score_delta:
+            AuthorStats.apply_article_delta(self.article_id, score=score_delta)
+
 
 class Bookmark(models.Model):
     article = models.ForeignKey(
@@ -221,13 +639,415 @@ class ArticleComment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["article", "parent", "created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user} on {self.article}: {self.body[:40]}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            AuthorStats.apply_article_delta(self.article_id, comments=1)
+
     def can_delete(self, user) -> bool:
         if not user or not getattr(user, "is_authenticated", False):
             return False
         if getattr(user, "is_super_admin", False) or getattr(user, "is_admin", False):
             return True
         return self.user_id == getattr(user, "id", None)
+
+
+class Notification(models.Model):
+    KIND_COMMENT = "comment"
+    KIND_REPLY = "reply"
+    KIND_PUBLISHED = "published"
+    KIND_REJECTED = "rejected"
+
+    KIND_CHOICES = [
+        (KIND_COMMENT, "New comment"),
+        (KIND_REPLY, "New reply"),
+        (KIND_PUBLISHED, "Article published"),
+        (KIND_REJECTED, "Article rejected"),
+    ]
+
+    recipient = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="notifications"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="notifications"
+    )
+    actor = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    event_count = models.PositiveIntegerField(default=1)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["recipient", "-updated_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipient", "kind", "article"],
+                condition=models.Q(is_read=False),
+                name="unique_unread_notification",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.recipient}: {self.message}"
+
+    @property
+    def message(self) -> str:
+        title = self.article.title
+        actor = self.actor.username if self.actor else "Someone"
+        if self.kind == self.KIND_COMMENT:
+            if self.event_count > 1:
+                return f"{self.event_count} new comments on \"{title}\""
+            return f"{actor} commented on \"{title}\""
+        if self.kind == self.KIND_REPLY:
+            if self.event_count > 1:
+                return f"{self.event_count} new replies to your comments on \"{title}\""
+            return f"{actor} replied to your comment on \"{title}\""
+        if self.kind == self.KIND_PUBLISHED:
+            return f"\"{title}\" was published"
+        return f"\"{title}\" was not approved"
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="following"
+    )
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="followers"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "author"], name="unique_follow"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["author", "follower"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.follower} follows {self.author}"
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            AuthorStats.objects.get_or_create(author_id=self.author_id)
+            AuthorStats.objects.filter(author_id=self.author_id).update(
+                follower_count=F("follower_count") + 1
+            )
+            TimelineEntry.backfill(self.follower_id, self.author_id)
+
+
+class TimelineEntry(models.Model):
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    published_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-published_at", "-article"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "article"], name="unique_timeline_entry"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["owner", "-published_at", "-article"]),
+            models.Index(fields=["article"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.article} in {self.owner}'s timeline"
+
+    @classmethod
+    def backfill(cls, owner_id, author_id, limit=TIMELINE_BACKFILL_SIZE) -> None:
+        cls.objects.bulk_create(
+            [
+                cls(
+                    owner_id=owner_id,
+                    article_id=article_id,
+                    author_id=author_id,
+                    published_at=published_at,
+                )
+                for article_id, published_at in Article.published.filter(
+                    author_id=author_id
+                )
+                .order_by("-published_at", "-pk")
+                .values_list("pk", "published_at")[:limit]
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class RelatedArticle(models.Model):
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["article", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "rank"], name="unique_related_rank"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["related"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.related} related to {self.article}"
+
+
+REACTION_SCORES = {
+    ArticleReaction.VALUE_LIKE: 1,
+    ArticleReaction.VALUE_DISLIKE: -1,
+}
+
+
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="author_stats"
+    )
+    published_count = models.PositiveIntegerField(default=0)
+    total_score = models.IntegerField(default=0)
+    avg_score = models.FloatField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    last_published_at = models.DateTimeField(null=True, blank=True)
+    follower_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "author stats"
+        indexes = [
+            models.Index(fields=["-published_count", "author"]),
+            models.Index(fields=["-total_score", "author"]),
+            models.Index(fields=["-avg_score", "author"]),
+            models.Index(fields=["-last_published_at", "author"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Stats for {self.author}"
+
+    @classmethod
+    def apply_article_delta(cls, article_id, score=0, comments=0) -> None:
+        if not score and not comments:
+            return
+        new_total = F("total_score") + score
+        cls.objects.filter(
+            author__articles__pk=article_id,
+            author__articles__status=Article.STATUS_PUBLISHED,
+        ).update(
+            total_score=new_total,
+            avg_score=Coalesce(
+                Cast(new_total, FloatField()) / NullIf(F("published_count"), 0),
+                0.0,
+            ),
+            comment_count=F("comment_count") + comments,
+            updated_at=timezone.now(),
+        )
+
+    @classmethod
+    def refresh(cls, author_ids=None) -> None:
+        articles = Article.published.all()
+        reactions = ArticleReaction.objects.filter(
+            article__status=Article.STATUS_PUBLISHED
+        )
+        comments = ArticleComment.objects.filter(
+            article__status=Article.STATUS_PUBLISHED
+        )
+        follows = Follow.objects.all()
+        if author_ids is not None:
+            author_ids = set(author_ids)
+            if not author_ids:
+                return
+            articles = articles.filter(author_id__in=author_ids)
+            reactions = reactions.filter(article__author_id__in=author_ids)
+            comments = comments.filter(article__author_id__in=author_ids)
+            follows = follows.filter(author_id__in=author_ids)
+
+        stats = {
+            author_id: cls(author_id=author_id) for author_id in author_ids or ()
+        }
+        for row in (
+            articles.order_by()
+            .values("author_id")
+            .annotate(total=Count("pk"), latest=Max("published_at"))
+        ):
+            entry = stats.setdefault(row["author_id"], cls(author_id=row["author_id"]))
+            entry.published_count = row["total"]
+            entry.last_published_at = row["latest"]
+        for row in (
+            reactions.order_by()
+            .values("article__author_id")
+            .annotate(
+                score=Sum(
+                    Case(
+                        *(
+                            When(value=value, then=Value(points))
+                            for value, points in REACTION_SCORES.items()
+                        ),
+                        default=Value(0),
+                    )
+                )
+            )
+        ):
+            entry = stats.setdefault(
+                row["article__author_id"], cls(author_id=row["article__author_id"])
+            )
+            entry.total_score = row["score"] or 0
+        for row in (
+            comments.order_by()
+            .values("article__author_id")
+            .annotate(total=Count("pk"))
+        ):
+            entry = stats.setdefault(
+                row["article__author_id"], cls(author_id=row["article__author_id"])
+            )
+            entry.comment_count = row["total"]
+        for row in follows.order_by().values("author_id").annotate(total=Count("pk")):
+            entry = stats.setdefault(row["author_id"], cls(author_id=row["author_id"]))
+            entry.follower_count = row["total"]
+
+        now = timezone.now()
+        for entry in stats.values():
+            entry.avg_score = (
+                entry.total_score / entry.published_count if entry.published_count else 0
+            )
+            entry.updated_at = now
+        with transaction.atomic():
+            if author_ids is None:
+                cls.objects.update(
+                    published_count=0,
+                    total_score=0,
+                    avg_score=0,
+                    comment_count=0,
+                    last_published_at=None,
+                    follower_count=0,
+                    updated_at=now,
+                )
+            cls.objects.bulk_create(
+                stats.values(),
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["author"],
+                update_fields=[
+                    "published_count",
+                    "total_score",
+                    "avg_score",
+                    "comment_count",
+                    "last_published_at",
+                    "follower_count",
+                    "updated_at",
+                ],
+            )
+
+
+class FeedStamp(models.Model):
+    # When the articles of one feed (the whole site, a category, an author or
+    # a tag) last changed, so a conditional GET reads one row instead of
+    # aggregating every published article in it.
+    KIND_SITE = "site"
+    KIND_CATEGORY = "category"
+    KIND_AUTHOR = "author"
+    KIND_TAG = "tag"
+
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField()
+    engaged_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_feed_stamp"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id} changed {self.changed_at}"
+
+    @classmethod
+    def touch(cls, scopes, engagement=False) -> None:
+        scopes = sorted(set(scopes))
+        if not scopes:
+            return
+        now = timezone.now()
+        cls.objects.bulk_create(
+            [
+                cls(kind=kind, object_id=object_id, changed_at=now, engaged_at=now)
+                for kind, object_id in scopes
+            ],
+            update_conflicts=True,
+            unique_fields=["kind", "object_id"],
+            update_fields=["engaged_at" if engagement else "changed_at"],
+        )
+
+    @classmethod
+    def article_scopes(cls, article_ids) -> set:
+        scopes = {(cls.KIND_SITE, 0)}
+        for category_id, author_id, tag_id in Article.objects.filter(
+            pk__in=set(article_ids)
+        ).values_list("category_id", "author_id", "article_tags__tag_id"):
+            scopes |= {(cls.KIND_CATEGORY, category_id), (cls.KIND_AUTHOR, author_id)}
+            if tag_id is not None:
+                scopes.add((cls.KIND_TAG, tag_id))
+        return scopes
+
+    @classmethod
+    def touch_articles(cls, article_ids, engagement=False, also=()) -> None:
+        cls.touch(cls.article_scopes(article_ids) | set(also), engagement=engagement)
+
+    @classmethod
+    def site(cls) -> dict:
+        row = cls.objects.filter(kind=cls.KIND_SITE, object_id=0).values(
+            "changed_at", "engaged_at"
+        )
+        return row.first() or {"changed_at": None, "engaged_at": None}
+
+    @classmethod
+    def annotations(cls, kind) -> dict:
+        stamps = cls.objects.filter(kind=kind, object_id=OuterRef("pk"))
+        return {
+            "feed_changed_at": Subquery(stamps.values("changed_at")[:1]),
+            "feed_engaged_at": Subquery(stamps.values("engaged_at")[:1]),
+        }
+
+
+class ImportProgress(models.Model):
+    # Saved in the same transaction as each imported batch, so a resumed
+    # import never repeats or skips a committed row.
+    source = models.CharField(max_length=255, unique=True)
+    line = models.PositiveBigIntegerField(default=0)
+    imported = models.PositiveBigIntegerField(default=0)
+    rejected = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.source} at row {self.line}"
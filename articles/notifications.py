@@ -0,0 +1,126 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.caching import bump_user_version
+
+from .models import Article, Notification
+
+User = get_user_model()
+
+MODERATION_NOTIFICATION_KINDS = {
+    Article.STATUS_PUBLISHED: Notification.KIND_PUBLISHED,
+    Article.STATUS_REJECTED: Notification.KIND_REJECTED,
+}
+
+
+def notify(events):
+    events = [
+        (recipient_id, kind, article_id, actor_id)
+        for recipient_id, kind, article_id, actor_id in events
+        if recipient_id and recipient_id != actor_id
+    ]
+    if not events:
+        return
+    grouped = Counter(
+        (recipient_id, kind, article_id) for recipient_id, kind, article_id, _ in events
+    )
+    latest_actor = {
+        (recipient_id, kind, article_id): actor_id
+        for recipient_id, kind, article_id, actor_id in events
+    }
+    for attempt in range(2):
+        try:
+            new_per_recipient = _apply(grouped, latest_actor)
+            break
+        except IntegrityError:
+            # A concurrent writer created the same unread row; retry to collapse into it.
+            if attempt:
+                raise
+    for recipient_id in new_per_recipient:
+        transaction.on_commit(lambda pk=recipient_id: bump_user_version(pk))
+
+
+def _apply(grouped, latest_actor):
+    recipients = {recipient_id for recipient_id, _, _ in grouped}
+    article_ids = {article_id for _, _, article_id in grouped}
+    now = timezone.now()
+    with transaction.atomic():
+        unread = {
+            (row.recipient_id, row.kind, row.article_id): row
+            for row in Notification.objects.select_for_update().filter(
+                recipient_id__in=recipients,
+                article_id__in=article_ids,
+                is_read=False,
+            )
+            if (row.recipient_id, row.kind, row.article_id) in grouped
+        }
+        for key, row in unread.items():
+            row.event_count += grouped[key]
+            row.actor_id = latest_actor[key]
+            row.updated_at = now
+        Notification.objects.bulk_update(
+            unread.values(), ["event_count", "actor", "updated_at"]
+        )
+        created = Notification.objects.bulk_create(
+            Notification(
+                recipient_id=recipient_id,
+                kind=kind,
+                article_id=article_id,
+                actor_id=latest_actor[(recipient_id, kind, article_id)],
+                event_count=count,
+            )
+            for (recipient_id, kind, article_id), count in grouped.items()
+            if (recipient_id, kind, article_id) not in unread
+        )
+        new_per_recipient = Counter(row.recipient_id for row in created)
+        for recipient_id, count in new_per_recipient.items():
+            User.objects.filter(pk=recipient_id).update(
+                unread_notification_count=F("unread_notification_count") + count
+            )
+    return new_per_recipient
+
+
+def notify_comment(comment):
+    article = comment.article
+    events = []
+    if comment.parent_id:
+        events.append(
+            (comment.parent.user_id, Notification.KIND_REPLY, article.pk, comment.user_id)
+        )
+    if not comment.parent_id or comment.parent.user_id != article.author_id:
+        events.append(
+            (article.author_id, Notification.KIND_COMMENT, article.pk, comment.user_id)
+        )
+    notify(events)
+
+
+def notify_moderation(articles, moderator):
+    notify(
+        (
+            article.author_id,
+            MODERATION_NOTIFICATION_KINDS[article.status],
+            article.pk,
+            moderator.pk,
+        )
+        for article in articles
+        if article.status in MODERATION_NOTIFICATION_KINDS
+    )
+
+
+def mark_read(user, notifications=None):
+    queryset = Notification.objects.filter(recipient=user, is_read=False)
+    if notifications is not None:
+        queryset = queryset.filter(pk__in=[item.pk for item in notifications])
+    with transaction.atomic():
+        updated = queryset.update(is_read=True)
+        if updated:
+            remaining = Notification.objects.filter(recipient=user, is_read=False).count()
+            User.objects.filter(pk=user.pk).update(unread_notification_count=remaining)
+    if updated:
+        user.unread_notification_count = remaining
+        bump_user_version(user.pk)
+    return updated
@@ -0,0 +1,166 @@
+import atexit
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .models import Article, ArticleDailyViews
+
+logger = logging.getLogger(__name__)
+
+VIEW_FLUSH_SECONDS = 10
+VIEW_FLUSH_MAX_KEYS = 500
+VIEW_DEDUP_SECONDS = 30 * 60
+MOST_READ_WINDOW_DAYS = 7
+BOT_USER_AGENT_RE = re.compile(
+    r"bot|crawl|spider|slurp|preview|monitor|headless|lighthouse|facebookexternalhit"
+    r"|curl|wget|python-|httpclient|java/|go-http|okhttp|scrapy",
+    re.IGNORECASE,
+)
+
+_buffer_lock = threading.Lock()
+_buffer = {"views": Counter(), "flushed_at": time.monotonic(), "timer": None}
+
+
+def is_bot(request) -> bool:
+    agent = request.META.get("HTTP_USER_AGENT", "")
+    return not agent or bool(BOT_USER_AGENT_RE.search(agent))
+
+
+def _viewer_identity(request) -> str:
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    session_key = request.session.session_key
+    if session_key:
+        return f"session:{session_key}"
+    fingerprint = "|".join(
+        (request.META.get("REMOTE_ADDR", ""), request.META.get("HTTP_USER_AGENT", ""))
+    )
+    return f"anon:{hashlib.md5(fingerprint.encode()).hexdigest()}"
+
+
+def _arm_timer() -> None:
+    # Called with the buffer lock held, so a quiet process still writes its
+    # views within VIEW_FLUSH_SECONDS instead of waiting for more traffic.
+    if _buffer["timer"] is None:
+        timer = threading.Timer(VIEW_FLUSH_SECONDS, _flush_on_timer)
+        timer.daemon = True
+        _buffer["timer"] = timer
+        timer.start()
+
+
+def _flush_on_timer() -> None:
+    try:
+        flush_views()
+    finally:
+        connection.close()
+
+
+def record_view(request, article_id) -> bool:
+    if request.method != "GET" or is_bot(request):
+        return False
+    seen_key = f"views:seen:{article_id}:{_viewer_identity(request)}"
+    if not cache.add(seen_key, 1, timeout=VIEW_DEDUP_SECONDS):
+        return False
+    with _buffer_lock:
+        _buffer["views"][(article_id, timezone.localdate())] += 1
+        _arm_timer()
+        due = (
+            len(_buffer["views"]) >= VIEW_FLUSH_MAX_KEYS
+            or time.monotonic() - _buffer["flushed_at"] >= VIEW_FLUSH_SECONDS
+        )
+    if due:
+        flush_views()
+    return True
+
+
+def counts_views(view_func):
+    # Wraps the conditional page decorator so 304 revalidations are counted
+    # too; the view or its validators put the published article id on the
+    # request.
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        article_id = getattr(request, "viewed_article_id", None)
+        if article_id is not None and response.status_code in (200, 304):
+            record_view(request, article_id)
+        return response
+
+    return wrapper
+
+
+def _increments(field, counts):
+    ids_by_count = defaultdict(list)
+    for key, count in counts.items():
+        ids_by_count[count].append(key)
+    return Case(
+        *(
+            When(**{f"{field}__in": ids}, then=Value(count))
+            for count, ids in ids_by_count.items()
+        ),
+        default=Value(0),
+    )
+
+
+def _write(views) -> None:
+    existing = set(
+        Article.objects.filter(pk__in={article_id for article_id, _ in views})
+        .order_by()
+        .values_list("pk", flat=True)
+    )
+    by_day = defaultdict(Counter)
+    totals = Counter()
+    for (article_id, day), count in views.items():
+        if article_id in existing:
+            by_day[day][article_id] += count
+            totals[article_id] += count
+    if not totals:
+        return
+    with transaction.atomic():
+        ArticleDailyViews.objects.bulk_create(
+            [
+                ArticleDailyViews(article_id=article_id, date=day, views=0)
+                for day, counts in by_day.items()
+                for article_id in counts
+            ],
+            ignore_conflicts=True,
+        )
+        for day, counts in by_day.items():
+            ArticleDailyViews.objects.filter(date=day, article_id__in=counts).update(
+                views=F("views") + _increments("article_id", counts)
+            )
+        Article.objects.filter(pk__in=totals).update(
+            view_count=F("view_count") + _increments("pk", totals)
+        )
+
+
+def flush_views() -> int:
+    with _buffer_lock:
+        views = _buffer["views"]
+        _buffer["views"] = Counter()
+        _buffer["flushed_at"] = time.monotonic()
+        timer, _buffer["timer"] = _buffer["timer"], None
+    if timer is not None:
+        timer.cancel()
+    if not views:
+        return 0
+    try:
+        _write(views)
+    except DatabaseError:
+        logger.exception("Could not flush %s buffered article views", sum(views.values()))
+        with _buffer_lock:
+            _buffer["views"].update(views)
+            _arm_timer()
+        return 0
+    return sum(views.values())
+
+
+atexit.register(flush_views)
@@ -0,0 +1,242 @@
+import re
+from collections import Counter
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from scipy import sparse
+
+from .models import Article, RelatedArticle
+
+RELATED_TOP_K = 4
+RELATED_MIN_SCORE = 0.05
+RELATED_MIN_DF = 2
+RELATED_TITLE_WEIGHT = 3
+RELATED_CHUNK_SIZE = 256
+RELATED_READ_CHUNK_SIZE = 2000
+RELATED_WRITE_BATCH_SIZE = 500
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+STOP_WORDS = frozenset(
+    """
+    about above after again against all also and any are because been before being
+    below between both but can could did does doing down during each few for from
+    further had has have having her here hers him his how into its itself just more
+    most not now off once only other our ours out over own same she should some such
+    than that the their theirs them then there these they this those through too under
+    until very was were what when where which while who whom why will with would you
+    your yours
+    """.split()
+)
+
+
+def tokenize(text) -> list[str]:
+    return [
+        token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS
+    ]
+
+
+def _vectorize(documents):
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    counts = []
+    for title, content in documents:
+        terms = Counter(tokenize(content))
+        for token in tokenize(title):
+            terms[token] += RELATED_TITLE_WEIGHT
+        for token, count in terms.items():
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (
+            np.asarray(counts, dtype=np.float32),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64),
+        ),
+        shape=(len(indptr) - 1, len(vocabulary)),
+    )
+    document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    matrix = matrix[:, np.flatnonzero(document_frequency >= RELATED_MIN_DF)].tocsr()
+    document_frequency = document_frequency[document_frequency >= RELATED_MIN_DF]
+
+    idf = np.log((1 + matrix.shape[0]) / (1 + document_frequency)) + 1
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices].astype(np.float32)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags((1 / norms).astype(np.float32)) @ matrix
+
+
+def _rank(scores, row_categories, column_categories, same_category):
+    same = row_categories[:, None] == column_categories[None, :]
+    if same_category:
+        scores = np.where(same, scores, 0)
+    return np.where(scores >= RELATED_MIN_SCORE, scores + same, -1)
+
+
+def _top_k(ranking, ids, k):
+    k = min(k, ranking.shape[1])
+    if k == 0:
+        return ranking[:, :0], ids[:, :0]
+    top = np.argpartition(-ranking, k - 1, axis=1)[:, :k]
+    ranking = np.take_along_axis(ranking, top, axis=1)
+    ids = np.take_along_axis(ids, top, axis=1)
+    order = np.argsort(-ranking, axis=1, kind="stable")
+    return np.take_along_axis(ranking, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+
+def _neighbours(ranking_row, id_row, categories, category):
+    return [
+        (int(index), float(rank - (categories[index] == category)))
+        for rank, index in zip(ranking_row, id_row)
+        if rank > 0
+    ]
+
+
+def _stored_neighbours(article_ids):
+    stored = {}
+    for start in range(0, len(article_ids), RELATED_WRITE_BATCH_SIZE):
+        for article_id, related_id, score in (
+            RelatedArticle.objects.filter(
+                article_id__in=article_ids[start : start + RELATED_WRITE_BATCH_SIZE]
+            )
+            .order_by("article_id", "rank")
+            .values_list("article_id", "related_id", "score")
+        ):
+            stored.setdefault(article_id, []).append((related_id, score))
+    return stored
+
+
+def _write(lists, built_at) -> None:
+    article_ids = list(lists)
+    for start in range(0, len(article_ids), RELATED_WRITE_BATCH_SIZE):
+        batch = article_ids[start : start + RELATED_WRITE_BATCH_SIZE]
+        with transaction.atomic():
+            RelatedArticle.objects.filter(article_id__in=batch).delete()
+            RelatedArticle.objects.bulk_create(
+                RelatedArticle(
+                    article_id=article_id,
+                    related_id=related_id,
+                    rank=rank,
+                    score=round(score, 6),
+                )
+                for article_id in batch
+                for rank, (related_id, score) in enumerate(lists[article_id], start=1)
+            )
+            Article.objects.filter(pk__in=batch).update(related_built_at=built_at)
+
+
+def build_related(full=False, same_category=False, k=RELATED_TOP_K) -> dict:
+    built_at = timezone.now()
+    RelatedArticle.objects.exclude(article__status=Article.STATUS_PUBLISHED).delete()
+    orphaned = set(
+        RelatedArticle.objects.exclude(related__status=Article.STATUS_PUBLISHED)
+        .values_list("article_id", flat=True)
+        .distinct()
+    )
+    stale = Article.published.filter(
+        Q(related_built_at__isnull=True)
+        | Q(updated_at__gt=F("related_built_at"))
+        | Q(pk__in=orphaned)
+    )
+    if not full and not stale.exists():
+        return {"articles": 0, "changed": 0, "updated": 0}
+
+    pks = []
+    categories = []
+    documents = []
+    for pk, category_id, title, content in (
+        Article.published.order_by("pk")
+        .values_list("pk", "category_id", "title", "content")
+        .iterator(chunk_size=RELATED_READ_CHUNK_SIZE)
+    ):
+        pks.append(pk)
+        categories.append(category_id)
+        documents.append((title, content))
+    if not pks:
+        return {"articles": 0, "changed": 0, "updated": 0}
+    pks = np.asarray(pks, dtype=np.int64)
+    categories = np.asarray(categories, dtype=np.int64)
+    matrix = _vectorize(documents)
+    del documents
+
+    if full:
+        changed = np.arange(len(pks))
+    else:
+        changed = np.flatnonzero(
+            np.isin(pks, np.fromiter(stale.values_list("pk", flat=True), dtype=np.int64))
+        )
+    # Running best candidates among the changed articles for every other
+    # article, so an edit can also move into its neighbours' lists.
+    best_ranking = np.full((len(pks), k), -1.0)
+    best_ids = np.full((len(pks), k), -1, dtype=np.int64)
+    lists = {}
+    transposed = matrix.T.tocsc()
+    for start in range(0, len(changed), RELATED_CHUNK_SIZE):
+        rows = changed[start : start + RELATED_CHUNK_SIZE]
+        scores = (matrix[rows] @ transposed).toarray()
+        scores[np.arange(len(rows)), rows] = 0
+        ranking, ids = _top_k(
+            _rank(scores, categories[rows], categories, same_category),
+            np.broadcast_to(np.arange(len(pks)), scores.shape),
+            k,
+        )
+        for offset, row in enumerate(rows):
+            lists[row] = _neighbours(ranking[offset], ids[offset], categories, categories[row])
+        if not full:
+            best_ranking, best_ids = _top_k(
+                np.hstack(
+                    [best_ranking, _rank(scores.T, categories, categories[rows], same_category)]
+                ),
+                np.hstack([best_ids, np.broadcast_to(rows, (len(pks), len(rows)))]),
+                k,
+            )
+
+    if not full:
+        changed_rows = set(changed.tolist())
+        position = {int(pk): row for row, pk in enumerate(pks)}
+        affected = set(np.flatnonzero(best_ranking[:, 0] > 0).tolist())
+        changed_pks = pks[changed].tolist()
+        for start in range(0, len(changed_pks), RELATED_WRITE_BATCH_SIZE):
+            affected.update(
+                position[article_id]
+                for article_id in RelatedArticle.objects.filter(
+                    related_id__in=changed_pks[start : start + RELATED_WRITE_BATCH_SIZE]
+                ).values_list("article_id", flat=True)
+                if article_id in position
+            )
+        affected -= changed_rows
+        stored = _stored_neighbours([int(pks[row]) for row in affected])
+        for row in affected:
+            current = [
+                (position[related_id], score)
+                for related_id, score in stored.get(int(pks[row]), [])
+                if related_id in position
+            ]
+            merged = {index: score for index, score in current if index not in changed_rows}
+            merged.update(
+                _neighbours(best_ranking[row], best_ids[row], categories, categories[row])
+            )
+            category = categories[row]
+            ranked = sorted(
+                (
+                    item
+                    for item in merged.items()
+                    if not same_category or categories[item[0]] == category
+                ),
+                key=lambda item: (categories[item[0]] == category, item[1]),
+                reverse=True,
+            )[:k]
+            if [(index, round(score, 6)) for index, score in ranked] != current:
+                lists[row] = ranked
+
+    _write(
+        {
+            int(pks[row]): [(int(pks[index]), score) for index, score in neighbours]
+            for row, neighbours in lists.items()
+        },
+        built_at,
+    )
+    return {"articles": len(pks), "changed": len(changed), "updated": len(lists)}
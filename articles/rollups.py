@@ -0,0 +1,174 @@
+import math
+import threading
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import (
+    Article,
+    ArticleComment,
+    ArticleReaction,
+    Category,
+    CategoryDailyStats,
+    Tag,
+)
+
+TRENDING_WINDOW_DAYS = 7
+TRENDING_LIMIT = 6
+TRENDING_CACHE_SECONDS = 600
+SPARKLINE_DAYS = 30
+TAG_CLOUD_LIMIT = 30
+TAG_CLOUD_LEVELS = 5
+
+_trending_lock = threading.Lock()
+_trending_cache = {"expires_at": 0.0, "categories": []}
+_tag_cloud_cache = {"expires_at": 0.0, "tags": []}
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, dt_time.min))
+
+
+def first_activity_date():
+    candidates = [
+        Article.published.aggregate(first=Min("published_at"))["first"],
+        ArticleReaction.objects.aggregate(first=Min("created_at"))["first"],
+        ArticleComment.objects.aggregate(first=Min("created_at"))["first"],
+    ]
+    candidates = [value for value in candidates if value is not None]
+    if not candidates:
+        return None
+    return timezone.localdate(min(candidates))
+
+
+def rollup_category_stats(start_date, end_date) -> int:
+    window_start = _day_start(start_date)
+    window_end = _day_start(end_date + timedelta(days=1))
+    rows = {}
+
+    def row_for(category_id, day):
+        key = (category_id, day)
+        if key not in rows:
+            rows[key] = CategoryDailyStats(category_id=category_id, date=day)
+        return rows[key]
+
+    published = (
+        Article.published.filter(
+            published_at__gte=window_start, published_at__lt=window_end
+        )
+        .order_by()
+        .annotate(day=TruncDate("published_at"))
+        .values("category_id", "day")
+        .annotate(total=Count("pk"), authors=Count("author", distinct=True))
+    )
+    for row in published:
+        entry = row_for(row["category_id"], row["day"])
+        entry.published_count = row["total"]
+        entry.active_authors = row["authors"]
+
+    for model, field in (
+        (ArticleReaction, "reaction_count"),
+        (ArticleComment, "comment_count"),
+    ):
+        engagement = (
+            model.objects.filter(created_at__gte=window_start, created_at__lt=window_end)
+            .order_by()
+            .annotate(day=TruncDate("created_at"), category_id=F("article__category_id"))
+            .values("category_id", "day")
+            .annotate(total=Count("pk"))
+        )
+        for row in engagement:
+            setattr(row_for(row["category_id"], row["day"]), field, row["total"])
+
+    with transaction.atomic():
+        CategoryDailyStats.objects.filter(
+            date__gte=start_date, date__lte=end_date
+        ).delete()
+        CategoryDailyStats.objects.bulk_create(rows.values(), batch_size=500)
+    return len(rows)
+
+
+def trending_categories():
+    now = time.monotonic()
+    if _trending_cache["expires_at"] > now:
+        return _trending_cache["categories"]
+    with _trending_lock:
+        if _trending_cache["expires_at"] > now:
+            return _trending_cache["categories"]
+        since = timezone.localdate() - timedelta(days=TRENDING_WINDOW_DAYS - 1)
+        categories = list(
+            Category.objects.filter(daily_stats__date__gte=since)
+            .annotate(
+                activity=Sum("daily_stats__published_count")
+                + Sum("daily_stats__reaction_count")
+                + Sum("daily_stats__comment_count")
+            )
+            .filter(activity__gt=0)
+            .order_by("-activity", "name")[:TRENDING_LIMIT]
+        )
+        if not categories:
+            categories = list(Category.objects.all()[:TRENDING_LIMIT])
+        _trending_cache["categories"] = categories
+        _trending_cache["expires_at"] = now + TRENDING_CACHE_SECONDS
+    return categories
+
+
+def tag_cloud_levels(tags):
+    counts = [math.log1p(tag.published_count) for tag in tags]
+    low, high = min(counts, default=0), max(counts, default=0)
+    span = (high - low) or 1
+    return {
+        tag.pk: 1 + round((count - low) / span * (TAG_CLOUD_LEVELS - 1))
+        for tag, count in zip(tags, counts)
+    }
+
+
+def popular_tags():
+    now = time.monotonic()
+    if _tag_cloud_cache["expires_at"] > now:
+        return _tag_cloud_cache["tags"]
+    with _trending_lock:
+        if _tag_cloud_cache["expires_at"] > now:
+            return _tag_cloud_cache["tags"]
+        tags = list(
+            Tag.objects.filter(published_count__gt=0).order_by(
+                "-published_count", "name"
+            )[:TAG_CLOUD_LIMIT]
+        )
+        levels = tag_cloud_levels(tags)
+        for tag in tags:
+            tag.level = levels[tag.pk]
+        tags.sort(key=lambda tag: tag.name.lower())
+        _tag_cloud_cache["tags"] = tags
+        _tag_cloud_cache["expires_at"] = now + TRENDING_CACHE_SECONDS
+    return tags
+
+
+def category_activity(category, days=SPARKLINE_DAYS):
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    by_date = {
+        row.date: row
+        for row in CategoryDailyStats.objects.filter(category=category, date__gte=since)
+    }
+    series = []
+    for offset in range(days):
+        day = since + timedelta(days=offset)
+        row = by_date.get(day)
+        series.append({"date": day, "value": row.activity if row else 0})
+    return series
+
+
+def sparkline_points(values, width=240, height=48):
+    if not values:
+        return ""
+    peak = max(values) or 1
+    step = width / max(len(values) - 1, 1)
+    return " ".join(
+        f"{index * step:.1f},{height - (value / peak) * height:.1f}"
+        for index, value in enumerate(values)
+    )
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import (
+    REACTION_SCORES,
+    Article,
+    ArticleComment,
+    ArticleReaction,
+    AuthorStats,
+    Bookmark,
+    FeedStamp,
+    Follow,
+    Tag,
+    TimelineEntry,
+)
+
+# Counters are kept from signals rather than save()/delete() overrides, so
+# queryset deletes, admin bulk deletes and cascades (deleting a user, an
+# article or a comment thread) keep them right too.
+
+
+def _per_delete(origin, name, factory):
+    # Every row removed by one delete call shares its origin, the instance or
+    # queryset delete() was called on, so receivers keep their state there.
+    state = getattr(origin, name, None)
+    if state is None:
+        state = factory()
+        if origin is not None:
+            setattr(origin, name, state)
+    return state
+
+
+def _deleted_articles():
+    return {"authors": set(), "tags": set(), "refreshed": False}
+
+
+@receiver(pre_delete, sender=get_user_model())
+def note_deleted_user(sender, instance, origin=None, **kwargs):
+    _per_delete(origin, "_deleted_user_ids", set).add(instance.pk)
+
+
+@receiver(pre_delete, sender=Article)
+def touch_deleted_article_feeds(sender, instance, origin=None, **kwargs):
+    FeedStamp.touch_articles([instance.pk])
+    if instance.status == Article.STATUS_PUBLISHED:
+        deleted = _per_delete(origin, "_deleted_articles", _deleted_articles)
+        deleted["authors"].add(instance.author_id)
+        deleted["tags"].update(instance.article_tags.values_list("tag_id", flat=True))
+
+
+@receiver(post_delete, sender=Article)
+def refresh_deleted_article_counts(sender, instance, origin=None, **kwargs):
+    # Every article of the call is gone before the first post_delete, so one
+    # refresh covers them all. Authors deleted in the same call are skipped,
+    # or their stats rows would be recreated for users about to disappear.
+    deleted = _per_delete(origin, "_deleted_articles", _deleted_articles)
+    if deleted["refreshed"]:
+        return
+    deleted["refreshed"] = True
+    AuthorStats.refresh(deleted["authors"] - getattr(origin, "_deleted_user_ids", set()))
+    Tag.refresh_counts(deleted["tags"])
+
+
+@receiver(post_delete, sender=ArticleReaction)
+def remove_reaction_score(sender, instance, **kwargs):
+    AuthorStats.apply_article_delta(
+        instance.article_id, score=-REACTION_SCORES.get(instance.value, 0)
+    )
+
+
+@receiver(post_delete, sender=ArticleComment)
+def remove_comment_count(sender, instance, **kwargs):
+    # Sent for every reply a thread's delete cascades to, however deep.
+    AuthorStats.apply_article_delta(instance.article_id, comments=-1)
+
+
+@receiver(post_delete, sender=Follow)
+def remove_follow(sender, instance, **kwargs):
+    AuthorStats.objects.filter(
+        author_id=instance.author_id, follower_count__gt=0
+    ).update(follower_count=F("follower_count") - 1)
+    TimelineEntry.objects.filter(
+        owner_id=instance.follower_id, author_id=instance.author_id
+    ).delete()
+
+
+@receiver(post_save, sender=ArticleReaction)
+@receiver(post_save, sender=ArticleComment)
+@receiver(post_save, sender=Bookmark)
+@receiver(post_delete, sender=ArticleReaction)
+@receiver(post_delete, sender=ArticleComment)
+@receiver(post_delete, sender=Bookmark)
+def mark_article_engaged(sender, instance, origin=None, **kwargs):
+    # One delete call marks each article once, however many of its rows go.
+    marked = _per_delete(origin, "_engaged_article_ids", set)
+    if instance.article_id not in marked:
+        marked.add(instance.article_id)
+        Article.mark_engaged(instance.article_id)
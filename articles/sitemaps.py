@@ -0,0 +1,203 @@
+import hashlib
+from xml.sax.saxutils import escape
+
+from django.core.cache import cache
+from django.db.models import Count, F, Max, Q
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views import View
+
+from .models import Article, AuthorStats, Category, FeedStamp
+
+SITEMAP_SHARD_SIZE = 10000
+SITEMAP_CHUNK_SIZE = 2000
+SITEMAP_MAX_AGE = 60 * 60
+SITEMAP_CACHE_SECONDS = 60 * 60 * 24
+SITEMAP_CONTENT_TYPE = "application/xml; charset=utf-8"
+SITEMAP_XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def _lastmod(value):
+    return f"<lastmod>{value.isoformat(timespec='seconds')}</lastmod>" if value else ""
+
+
+def _url_entry(loc, lastmod=None):
+    return f"<url><loc>{escape(loc)}</loc>{_lastmod(lastmod)}</url>\n"
+
+
+def _sitemap_response(request, rows, version, last_modified=None):
+    etag = f'"{hashlib.md5(str(version).encode()).hexdigest()}"'
+    not_modified = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if not_modified is None:
+        response = StreamingHttpResponse(rows, content_type=SITEMAP_CONTENT_TYPE)
+    else:
+        response = not_modified
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, public=True, max_age=SITEMAP_MAX_AGE)
+    return response
+
+
+def _cached_summary(name, build):
+    # Publishing, editing or unpublishing moves the site stamp, and that is
+    # all that changes these summaries, so they are recomputed only then.
+    changed_at = FeedStamp.site()["changed_at"]
+    cache_key = f"sitemaps:{name}:{changed_at.isoformat() if changed_at else 'none'}"
+    summary = cache.get(cache_key)
+    if summary is None:
+        summary = build()
+        cache.set(cache_key, summary, SITEMAP_CACHE_SECONDS)
+    return summary
+
+
+def _index_shards():
+    article_shards = list(
+        Article.published.order_by()
+        .annotate(shard=(F("pk") - 1) / SITEMAP_SHARD_SIZE)
+        .values("shard")
+        .annotate(lastmod=Max("updated_at"))
+        .order_by("shard")
+    )
+    author_shards = list(
+        AuthorStats.objects.filter(published_count__gt=0)
+        .order_by()
+        .annotate(shard=(F("author_id") - 1) / SITEMAP_SHARD_SIZE)
+        .values("shard")
+        .annotate(lastmod=Max("last_published_at"))
+        .order_by("shard")
+    )
+    return article_shards, author_shards
+
+
+def _section_lastmods():
+    categories = list(
+        Category.objects.annotate(
+            lastmod=Max(
+                "articles__updated_at",
+                filter=Q(articles__status=Article.STATUS_PUBLISHED),
+            )
+        ).values_list("slug", "lastmod")
+    )
+    latest = Article.published.aggregate(lastmod=Max("updated_at"))["lastmod"]
+    return categories, latest
+
+
+def _shard_bounds(shard):
+    return shard * SITEMAP_SHARD_SIZE + 1, (shard + 1) * SITEMAP_SHARD_SIZE
+
+
+class SitemapIndexView(View):
+    def get(self, request):
+        base = request.build_absolute_uri("/").rstrip("/")
+        article_shards, author_shards = _cached_summary("index", _index_shards)
+        last_modified = max(
+            (row["lastmod"] for row in article_shards + author_shards if row["lastmod"]),
+            default=None,
+        )
+
+        def rows():
+            yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+            yield f'<sitemapindex xmlns="{SITEMAP_XMLNS}">\n'
+            yield (
+                f"<sitemap><loc>{escape(base + reverse('articles:sitemap_sections'))}</loc>"
+                f"{_lastmod(last_modified)}</sitemap>\n"
+            )
+            for name, shards in (
+                ("articles:sitemap_articles", article_shards),
+                ("articles:sitemap_authors", author_shards),
+            ):
+                for row in shards:
+                    loc = base + reverse(name, args=[row["shard"]])
+                    yield f"<sitemap><loc>{escape(loc)}</loc>{_lastmod(row['lastmod'])}</sitemap>\n"
+            yield "</sitemapindex>\n"
+
+        version = (base, article_shards, author_shards)
+        return _sitemap_response(request, rows(), version, last_modified)
+
+
+class SectionSitemapView(View):
+    def get(self, request):
+        base = request.build_absolute_uri("/").rstrip("/")
+        categories, latest = _cached_summary("sections", _section_lastmods)
+
+        def rows():
+            yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+            yield f'<urlset xmlns="{SITEMAP_XMLNS}">\n'
+            for name in (
+                "articles:article_list",
+                "articles:popular_list",
+                "articles:category_list",
+                "articles:author_list",
+            ):
+                yield _url_entry(base + reverse(name), latest)
+            for slug, lastmod in categories:
+                yield _url_entry(
+                    base + reverse("articles:category_detail", args=[slug]), lastmod
+                )
+            yield "</urlset>\n"
+
+        return _sitemap_response(request, rows(), (base, latest, categories), latest)
+
+
+class ArticleSitemapView(View):
+    def get(self, request, shard):
+        first_id, last_id = _shard_bounds(shard)
+        shard_qs = Article.published.filter(pk__gte=first_id, pk__lte=last_id)
+        summary = shard_qs.aggregate(total=Count("pk"), lastmod=Max("updated_at"))
+        if not summary["total"]:
+            raise Http404("Empty sitemap shard.")
+        base = request.build_absolute_uri("/").rstrip("/")
+        placeholder = "--slug--"
+        url_pattern = base + reverse("articles:article_detail", args=[placeholder])
+
+        def rows():
+            yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+            yield f'<urlset xmlns="{SITEMAP_XMLNS}">\n'
+            entries = (
+                shard_qs.order_by("pk")
+                .values_list("slug", "updated_at")
+                .iterator(chunk_size=SITEMAP_CHUNK_SIZE)
+            )
+            for slug, updated_at in entries:
+                yield _url_entry(url_pattern.replace(placeholder, slug), updated_at)
+            yield "</urlset>\n"
+
+        version = (base, shard, summary["total"], summary["lastmod"])
+        return _sitemap_response(request, rows(), version, summary["lastmod"])
+
+
+class AuthorSitemapView(View):
+    def get(self, request, shard):
+        first_id, last_id = _shard_bounds(shard)
+        shard_qs = AuthorStats.objects.filter(
+            published_count__gt=0, author_id__gte=first_id, author_id__lte=last_id
+        )
+        summary = shard_qs.aggregate(total=Count("pk"), lastmod=Max("last_published_at"))
+        if not summary["total"]:
+            raise Http404("Empty sitemap shard.")
+        base = request.build_absolute_uri("/").rstrip("/")
+
+        def rows():
+            yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+            yield f'<urlset xmlns="{SITEMAP_XMLNS}">\n'
+            entries = (
+                shard_qs.order_by("author_id")
+                .values_list("author__username", "last_published_at")
+                .iterator(chunk_size=SITEMAP_CHUNK_SIZE)
+            )
+            for username, last_published_at in entries:
+                yield _url_entry(
+                    base + reverse("articles:author_detail", args=[username]),
+                    last_published_at,
+                )
+            yield "</urlset>\n"
+
+        version = (base, shard, summary["total"], summary["lastmod"])
+        return _sitemap_response(request, rows(), version, summary["lastmod"])
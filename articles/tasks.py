@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from jobs.registry import job
+
+from .models import AuthorStats
+from .related import build_related
+from .rollups import rollup_category_stats
+from .timeline import sync_timeline
+
+
+@job("articles.rollup_category_stats", every=timedelta(hours=1))
+def rollup_recent_category_stats(days=2):
+    today = timezone.localdate()
+    rollup_category_stats(today - timedelta(days=days - 1), today)
+
+
+@job("articles.rebuild_author_stats", every=timedelta(days=1), timeout=60 * 60)
+def rebuild_author_stats(author_ids=None):
+    AuthorStats.refresh(author_ids)
+
+
+@job("articles.sync_timeline")
+def sync_timelines(article_ids):
+    for article_id in article_ids:
+        sync_timeline(article_id)
+
+
+@job("articles.build_related", every=timedelta(hours=1), timeout=60 * 60)
+def build_related_articles():
+    build_related()
+
+
+@job("articles.rebuild_related", every=timedelta(days=1), timeout=2 * 60 * 60)
+def rebuild_related_articles(same_category=False):
+    build_related(full=True, same_category=same_category)
@@ -0,0 +1,51 @@
+import hashlib
+
+from django import template
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+CARD_CACHE_SECONDS = 60 * 60 * 24
+CARD_TEMPLATE = "includes/article_card.html"
+
+
+def card_cache_key(article, show_author=True, show_category=True) -> str:
+    parts = [
+        article.updated_at.isoformat(),
+        article.engagement_updated_at.isoformat() if article.engagement_updated_at else "",
+    ]
+    if show_author:
+        parts.append(article.author.username)
+    if show_category:
+        parts += [article.category.slug, article.category.name]
+    version = hashlib.md5("|".join(parts).encode()).hexdigest()
+    return f"card:{int(show_author)}{int(show_category)}:{article.pk}:{version}"
+
+
+@register.simple_tag(takes_context=True)
+def prefetch_cards(context, articles, show_author=True, show_category=True):
+    keys = [card_cache_key(article, show_author, show_category) for article in articles]
+    context.render_context.setdefault("card_fragments", {}).update(cache.get_many(keys))
+    return ""
+
+
+@register.simple_tag(takes_context=True)
+def article_card(context, article, show_author=True, show_category=True):
+    key = card_cache_key(article, show_author, show_category)
+    fragments = context.render_context.setdefault("card_fragments", {})
+    html = fragments.get(key)
+    if html is None:
+        html = cache.get(key)
+    if html is None:
+        html = get_template(CARD_TEMPLATE).render(
+            {
+                "article": article,
+                "show_author": show_author,
+                "show_category": show_category,
+            }
+        )
+        cache.set(key, html, CARD_CACHE_SECONDS)
+    fragments[key] = html
+    return mark_safe(html)
@@ -0,0 +1,15 @@
+from django import template
+
+from articles.rollups import popular_tags, trending_categories
+
+register = template.Library()
+
+
+@register.inclusion_tag("includes/trending_topics.html")
+def trending_topics():
+    return {"categories": trending_categories()}
+
+
+@register.inclusion_tag("includes/tag_cloud.html")
+def tag_cloud():
+    return {"tags": popular_tags()}
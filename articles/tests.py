@@ -1,2 +1,1959 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
 
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.db.models import Count
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.queue import claim_next, run_job
+
+from . import live, pageviews, rollups
+from .api import ENGAGEMENT_BATCH_SIZE, encode_cursor
+from .forms import ArticleForm
+from .models import (
+    Article,
+    ArticleComment,
+    ArticleDailyViews,
+    ArticleReaction,
+    ArticleSlugHistory,
+    ArticleTag,
+    AuthorStats,
+    Bookmark,
+    Category,
+    CategoryDailyStats,
+    FeedStamp,
+    Follow,
+    ImportProgress,
+    Notification,
+    RelatedArticle,
+    Tag,
+    TimelineEntry,
+    allocate_slugs,
+)
+from .related import build_related
+from .templatetags.card_tags import card_cache_key
+from .timeline import timeline_page
+
+User = get_user_model()
+
+SEED_AUTHORS = 40
+SEED_READERS = 80
+SEED_ARTICLES = 1500
+SEED_TAGS = 60
+SEED_PASSWORD = "seed-pass-123"
+# Walking a whole table, through an index or not, and reading every
+# published article are both full scans of a large table.
+FULL_SCAN_RE = re.compile(
+    r"^(?:SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?"
+    r"|SEARCH (\w+) USING (?:COVERING )?INDEX \w+ \(status=\?\))(?: LEFT-JOIN)?$"
+)
+TABLE_ALIAS_RE = re.compile(r'"(\w+)" ([A-Z]\d+)\b')
+LOOP_RE = re.compile(r"^(?:SCAN|SEARCH) (\w+)")
+FEED_TABLES = {"articles_article", "articles_articletag", "articles_timelineentry"}
+# Tables that stay small no matter how much content the site has.
+SMALL_TABLES = {"articles_category", "articles_categorydailystats", "django_content_type"}
+# Queries that exist to aggregate a whole set, by page. Any other full scan,
+# including these queries on other pages, is a problem.
+PLAN_AGGREGATES = {
+    "home": ("SELECT COUNT(*)",),
+    "home page 3": ("SELECT COUNT(*)",),
+    "popular": ("SELECT COUNT(*)", "SELECT MAX("),
+    "sitemap": ('SELECT (("articles_article"."id"',),
+    "sitemap sections": ('SELECT MAX("articles_article"."updated_at")',),
+    "moderation": ("SELECT COUNT(",),
+}
+BROWSER_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) Firefox/131.0"
+PAGE_TIME_CEILING = 0.5
+# Wall-clock ceilings depend on the machine, so they only run when asked for.
+PAGE_TIME_CHECKS = os.environ.get("PAGE_TIME_CHECKS", "").lower() in {"1", "true", "yes"}
+ROLES = ("anonymous", "member", "admin")
+# Most queries each page may run for an anonymous visitor, a regular member
+# and an admin, with every cache cold. None means the role cannot see it.
+QUERY_BUDGETS = {
+    "home": (7, 9, 9),
+    "home page 3": (7, 9, 9),
+    "popular": (7, 9, 9),
+    "most read": (7, 9, 9),
+    "categories": (4, 6, 6),
+    "category": (9, 11, 11),
+    "category feed": (3, 3, 3),
+    "tags": (4, 6, 6),
+    "tag": (6, 8, 8),
+    "authors": (6, 8, 8),
+    "author": (6, 9, 9),
+    "author feed": (3, 3, 3),
+    "feed": (2, 2, 2),
+    "sitemap": (3, 3, 3),
+    "sitemap sections": (3, 3, 3),
+    "sitemap articles": (1, 1, 1),
+    "sitemap authors": (1, 1, 1),
+    "article": (8, 12, 12),
+    "api articles": (1, 1, 1),
+    "api articles page": (1, 1, 1),
+    "api category articles": (1, 1, 1),
+    "api author articles": (1, 1, 1),
+    "api article": (1, 1, 1),
+    "api categories": (1, 1, 1),
+    "api category": (1, 1, 1),
+    "api authors": (1, 1, 1),
+    "api author": (1, 1, 1),
+    "api engagement": (1, 3, 3),
+    "bookmarks": (None, 6, 6),
+    "following": (None, 8, 7),
+    "notifications": (None, 11, 7),
+    "create": (None, 5, 5),
+    "moderation": (None, None, 8),
+    "edit": (None, None, 7),
+}
+# Pages that answer a signed-in user without access with a 404, so other
+# authors' articles are not revealed. Otherwise denied pages redirect to the
+# login page or answer 403.
+NOT_FOUND_WHEN_DENIED = {"edit"}
+# Aggregates over every published article rather than a single page.
+TIME_CEILINGS = {"popular": 1.0, "most read": 1.0}
+
+
+def seed_site(seed=45):
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(SEED_PASSWORD)
+    categories = list(Category.objects.all())
+
+    User.objects.bulk_create(
+        [User(username="seed-admin", password=password, role=User.ROLE_ADMIN)]
+        + [
+            User(username=f"author{index}", password=password, bio="Writes a lot.")
+            for index in range(SEED_AUTHORS)
+        ]
+        + [
+            User(username=f"reader{index}", password=password)
+            for index in range(SEED_READERS)
+        ]
+    )
+    authors = list(User.objects.filter(username__startswith="author"))
+    readers = list(User.objects.filter(username__startswith="reader"))
+
+    statuses = [Article.STATUS_PUBLISHED] * 8 + [
+        Article.STATUS_PENDING,
+        Article.STATUS_DRAFT,
+    ]
+    articles = []
+    for index in range(SEED_ARTICLES):
+        status = rng.choice(statuses)
+        created_at = now - timedelta(hours=index * 3 + rng.randint(0, 2))
+        articles.append(
+            Article(
+                title=f"Seeded article {index}",
+                slug=f"seeded-article-{index}",
+                author=rng.choice(authors),
+                category=rng.choice(categories),
+                content=f"Body of seeded article {index}. " * 20,
+                status=status,
+                published_at=created_at if status == Article.STATUS_PUBLISHED else None,
+            )
+        )
+    Article.objects.bulk_create(articles)
+    articles = list(Article.objects.order_by("pk"))
+    for article in articles:
+        article.created_at = article.published_at or now - timedelta(days=1)
+    Article.objects.bulk_update(articles, ["created_at"])
+    published = [article for article in articles if article.status == Article.STATUS_PUBLISHED]
+
+    reactions = []
+    bookmarks = []
+    for article in published[:600]:
+        for reader in rng.sample(readers, rng.randint(0, 12)):
+            reactions.append(
+                ArticleReaction(
+                    article=article,
+                    user=reader,
+                    value=rng.choice(
+                        [ArticleReaction.VALUE_LIKE] * 4 + [ArticleReaction.VALUE_DISLIKE]
+                    ),
+                )
+            )
+        for reader in rng.sample(readers, rng.randint(0, 2)):
+            bookmarks.append(Bookmark(article=article, user=reader))
+    ArticleReaction.objects.bulk_create(reactions)
+    Bookmark.objects.bulk_create(bookmarks)
+
+    comments = ArticleComment.objects.bulk_create(
+        ArticleComment(
+            article=article,
+            user=rng.choice(readers),
+            body=f"Thoughts on {article.title}",
+        )
+        for article in published[:400]
+        for _ in range(rng.randint(0, 5))
+    )
+    ArticleComment.objects.bulk_create(
+        ArticleComment(
+            article_id=comment.article_id,
+            user=rng.choice(readers),
+            parent=comment,
+            body="Agreed.",
+        )
+        for comment in comments
+        if rng.random() < 0.4
+    )
+
+    tags = Tag.get_or_create_many([f"topic {index}" for index in range(SEED_TAGS)])
+    ArticleTag.objects.bulk_create(
+        ArticleTag(article=article, tag=tag, published_at=article.published_at)
+        for article in articles
+        for tag in rng.sample(tags, rng.randint(0, 4))
+    )
+    Tag.refresh_counts([tag.pk for tag in tags])
+
+    Follow.objects.bulk_create(
+        Follow(follower=reader, author=author)
+        for reader in readers
+        for author in rng.sample(authors, 5)
+    )
+    for follow in Follow.objects.all():
+        TimelineEntry.backfill(follow.follower_id, follow.author_id)
+    AuthorStats.refresh()
+    build_related()
+    rollups.rollup_category_stats(rollups.first_activity_date(), timezone.localdate())
+
+    today = timezone.localdate()
+    ArticleDailyViews.objects.bulk_create(
+        ArticleDailyViews(article=article, date=today - timedelta(days=day), views=rng.randint(1, 50))
+        for article in published[:300]
+        for day in range(rng.randint(1, 10))
+    )
+    Notification.objects.bulk_create(
+        Notification(
+            recipient=readers[0],
+            kind=Notification.KIND_COMMENT,
+            article=article,
+            actor=readers[1],
+            is_read=index % 3 != 0,
+        )
+        for index, article in enumerate(published[:40])
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return {
+        "admin": User.objects.get(username="seed-admin"),
+        "author": authors[0],
+        "reader": readers[0],
+        "category": categories[0],
+        "tag": Tag.objects.order_by("-published_count").first(),
+        "article": Article.published.annotate(total=Count("comments"))
+        .order_by("-total")
+        .first(),
+    }
+
+
+def seeded_pages(data):
+    article = data["article"]
+    author = data["author"].username
+    return {
+        "home": reverse("articles:article_list"),
+        "home page 3": reverse("articles:article_list") + "?page=3",
+        "popular": reverse("articles:popular_list"),
+        "most read": reverse("articles:most_read_list"),
+        "categories": reverse("articles:category_list"),
+        "category": reverse("articles:category_detail", args=[data["category"].slug]),
+        "category feed": reverse("articles:category_feed_rss", args=[data["category"].slug]),
+        "tags": reverse("articles:tag_list"),
+        "tag": reverse("articles:tag_detail", args=[data["tag"].slug]),
+        "authors": reverse("articles:author_list"),
+        "author": reverse("articles:author_detail", args=[author]),
+        "author feed": reverse("articles:author_feed_rss", args=[author]),
+        "feed": reverse("articles:feed_rss"),
+        "sitemap": reverse("articles:sitemap_index"),
+        "sitemap sections": reverse("articles:sitemap_sections"),
+        "sitemap articles": reverse("articles:sitemap_articles", args=[0]),
+        "sitemap authors": reverse("articles:sitemap_authors", args=[0]),
+        "article": article.get_absolute_url(),
+        "api articles": reverse("articles:api_articles"),
+        "api articles page": api_next_page(reverse("articles:api_articles") + "?limit=50"),
+        "api category articles": reverse("articles:api_articles")
+        + f"?category={data['category'].slug}&fields=slug,title,likes,dislikes,excerpt",
+        "api author articles": reverse("articles:api_articles") + f"?author={author}",
+        "api article": reverse("articles:api_article_detail", args=[article.slug]),
+        "api categories": reverse("articles:api_categories"),
+        "api category": reverse("articles:api_category_detail", args=[data["category"].slug]),
+        "api authors": reverse("articles:api_authors"),
+        "api author": reverse("articles:api_author_detail", args=[author]),
+        "api engagement": reverse("articles:api_engagement")
+        + "?slugs="
+        + ",".join(
+            Article.published.order_by("-published_at", "-pk").values_list("slug", flat=True)[
+                :ENGAGEMENT_BATCH_SIZE
+            ]
+        ),
+    }
+
+
+def api_next_page(url):
+    return Client().get(url).json()["next"]
+
+
+def member_pages():
+    return {
+        "bookmarks": reverse("articles:bookmark_list"),
+        "following": reverse("articles:following_feed"),
+        "notifications": reverse("articles:notification_list"),
+        "create": reverse("articles:article_create"),
+    }
+
+
+def admin_pages(data):
+    return {
+        "moderation": reverse("articles:moderation_queue"),
+        "edit": reverse("articles:article_update", args=[data["article"].slug]),
+    }
+
+
+def cold_caches():
+    cache.clear()
+    rollups._trending_cache["expires_at"] = 0
+    rollups._tag_cloud_cache["expires_at"] = 0
+    # Starts a fresh flush window so no buffered views are written mid-request.
+    pageviews.flush_views()
+
+
+def query_fingerprint(sql) -> str:
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    return re.sub(r"\((?:\?, )*\?\)", "(...)", sql)
+
+
+def repeated_queries_report(queries) -> str:
+    counts = Counter(query_fingerprint(query["sql"]) for query in queries)
+    repeated = [
+        f"  {count}x {fingerprint[:300]}"
+        for fingerprint, count in counts.most_common()
+        if count > 1
+    ]
+    return "\n".join(repeated) or "  (no query ran more than once)"
+
+
+class QueryBudgetMixin:
+    def assertPageBudget(self, name, url, max_queries, max_seconds=PAGE_TIME_CEILING):
+        cold_caches()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = self.client.get(url, HTTP_USER_AGENT=BROWSER_USER_AGENT)
+            elapsed = time.perf_counter() - started
+        self.assertEqual(response.status_code, 200, url)
+        if len(captured) > max_queries:
+            self.fail(
+                f"{name} ({url}) ran {len(captured)} queries, budget is {max_queries}.\n"
+                f"Repeated query fingerprints:\n{repeated_queries_report(captured)}"
+            )
+        if PAGE_TIME_CHECKS:
+            self.assertLessEqual(
+                elapsed,
+                max_seconds,
+                f"{name} ({url}) took {elapsed * 1000:.0f}ms, "
+                f"ceiling is {max_seconds * 1000:.0f}ms",
+            )
+
+    def assertPageDenied(self, name, url):
+        response = self.client.get(url, HTTP_USER_AGENT=BROWSER_USER_AGENT)
+        signed_in = "_auth_user_id" in self.client.session
+        denied = (404,) if signed_in and name in NOT_FOUND_WHEN_DENIED else (302, 403)
+        self.assertIn(response.status_code, denied, f"{name} ({url})")
+
+    def assertPageBudgets(self, pages, budgets, role, user=None, time_ceilings=None):
+        if user is not None:
+            self.client.force_login(user)
+        for name, url in pages.items():
+            max_queries = budgets[name][ROLES.index(role)]
+            with self.subTest(role=role, page=name):
+                if max_queries is None:
+                    self.assertPageDenied(name, url)
+                    continue
+                self.assertPageBudget(
+                    name,
+                    url,
+                    max_queries,
+                    (time_ceilings or {}).get(name, PAGE_TIME_CEILING),
+                )
+
+
+class QueryFingerprintTests(SimpleTestCase):
+    def test_literals_and_in_lists_are_collapsed(self):
+        self.assertEqual(
+            query_fingerprint(
+                """SELECT "a"."id" FROM "a" U0 WHERE U0."b" = 'x''y' AND "a"."id" IN (1, 22, 3)"""
+            ),
+            """SELECT "a"."id" FROM "a" U0 WHERE U0."b" = ? AND "a"."id" IN (...)""",
+        )
+
+    def test_report_lists_repeated_queries_first(self):
+        queries = [
+            {"sql": 'SELECT COUNT(*) FROM "comments" WHERE "article_id" = 1'},
+            {"sql": 'SELECT COUNT(*) FROM "comments" WHERE "article_id" = 2'},
+            {"sql": 'SELECT * FROM "articles" LIMIT 10'},
+        ]
+        self.assertEqual(
+            repeated_queries_report(queries),
+            '  2x SELECT COUNT(*) FROM "comments" WHERE "article_id" = ?',
+        )
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_site()
+
+    def site_pages(self):
+        return {**seeded_pages(self.data), **member_pages(), **admin_pages(self.data)}
+
+    def test_every_page_has_a_budget(self):
+        self.assertEqual(set(self.site_pages()), set(QUERY_BUDGETS))
+
+    def test_anonymous_budgets(self):
+        self.assertPageBudgets(self.site_pages(), QUERY_BUDGETS, "anonymous", None, TIME_CEILINGS)
+
+    def test_member_budgets(self):
+        self.assertPageBudgets(
+            self.site_pages(), QUERY_BUDGETS, "member", self.data["reader"], TIME_CEILINGS
+        )
+
+    def test_admin_budgets(self):
+        self.assertPageBudgets(
+            self.site_pages(), QUERY_BUDGETS, "admin", self.data["admin"], TIME_CEILINGS
+        )
+
+
+class QueryPlanMixin:
+    def plan_problems(self, url, aggregates=()):
+        queries = []
+
+        def capture(execute, sql, params, many, context):
+            if not many and sql.lstrip().upper().startswith("SELECT"):
+                queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        tables = set(connection.introspection.table_names()) - SMALL_TABLES
+        problems = []
+        with connection.cursor() as cursor:
+            for sql, params in queries:
+                aliases = {alias: table for table, alias in TABLE_ALIAS_RE.findall(sql)}
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = cursor.fetchall()
+                outer = [step for _, parent, _, step in plan if parent == 0]
+                # An index walk in the page's order stops at the LIMIT.
+                stops_early = " LIMIT " in sql and "USE TEMP B-TREE FOR ORDER BY" not in outer
+                for _, _, _, step in plan:
+                    match = FULL_SCAN_RE.match(step)
+                    table = match and (match.group(1) or match.group(2))
+                    if (
+                        match
+                        and aliases.get(table, table) in tables
+                        and not (stops_early and " INDEX " in step)
+                        and not sql.startswith(aggregates)
+                    ):
+                        problems.append(f"{step}\n    {sql}")
+                driving = LOOP_RE.match(outer[0]) if outer else None
+                if (
+                    " LIMIT " in sql
+                    and driving
+                    and driving.group(1) in FEED_TABLES
+                    and "USE TEMP B-TREE FOR ORDER BY" in outer
+                    and "USE TEMP B-TREE FOR GROUP BY" not in outer
+                ):
+                    problems.append(f"sorts the whole feed for one page\n    {sql}")
+        return problems
+
+    def assertIndexedPlans(self, pages, sorted_pages=(), aggregates=PLAN_AGGREGATES):
+        for name, url in pages.items():
+            with self.subTest(page=name):
+                problems = [
+                    problem
+                    for problem in self.plan_problems(url, aggregates.get(name, ()))
+                    if name not in sorted_pages or not problem.startswith("sorts")
+                ]
+                self.assertFalse(
+                    problems, f"{name} ({url}) has unindexed plans:\n" + "\n".join(problems)
+                )
+
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_site()
+
+    def setUp(self):
+        cold_caches()
+
+    def test_public_pages_use_indexes(self):
+        # Most read is ranked by a computed total, so only its scans are checked.
+        self.assertIndexedPlans(seeded_pages(self.data), sorted_pages={"most read"})
+
+    def test_member_pages_use_indexes(self):
+        self.client.force_login(self.data["reader"])
+        self.assertIndexedPlans(member_pages())
+
+    def test_admin_pages_use_indexes(self):
+        self.client.force_login(self.data["admin"])
+        self.assertIndexedPlans(admin_pages(self.data))
+
+    def test_index_walks_and_status_searches_are_full_scans(self):
+        for step in (
+            "SCAN articles_article",
+            "SCAN articles_article USING INDEX article_published_idx",
+            "SCAN articles_article USING COVERING INDEX article_author_feed_idx",
+            "SEARCH articles_article USING COVERING INDEX articles_ar_status_cbb22b_idx (status=?)",
+        ):
+            self.assertTrue(FULL_SCAN_RE.match(step), step)
+        for step in (
+            "SEARCH articles_article USING INDEX articles_ar_status_cbb22b_idx (status=? AND created_at>?)",
+            "SEARCH articles_article USING INDEX article_category_feed_idx (category_id=?)",
+            "SEARCH articles_article USING INTEGER PRIMARY KEY (rowid=?)",
+        ):
+            self.assertFalse(FULL_SCAN_RE.match(step), step)
+
+    def test_aggregates_are_only_allowed_where_listed(self):
+        self.assertFalse(self.plan_problems("/", PLAN_AGGREGATES["home"]))
+        problems = self.plan_problems("/")
+        self.assertEqual(len(problems), 1, problems)
+        self.assertIn("articles_ar_status_cbb22b_idx (status=?)", problems[0])
+
+    def test_feed_queries_walk_published_indexes(self):
+        category = self.data["category"]
+        author = self.data["author"]
+        for queryset, index in (
+            (Article.published.order_by("-published_at", "-pk"), "article_published_idx"),
+            (
+                Article.published.filter(category=category).order_by("-published_at", "-pk"),
+                "article_category_feed_idx",
+            ),
+            (
+                Article.published.filter(author=author).order_by("-published_at", "-pk"),
+                "article_author_feed_idx",
+            ),
+        ):
+            with self.subTest(index=index):
+                self.assertIn(index, queryset.with_engagement()[:10].explain())
+
+
+class LiveStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="live-author", password=SEED_PASSWORD)
+        cls.readers = User.objects.bulk_create(
+            User(username=f"live-reader{index}", password=SEED_PASSWORD)
+            for index in range(1000)
+        )
+        cls.article = Article.objects.create(
+            title="Live article",
+            author=cls.author,
+            category=Category.objects.create(name="Live"),
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+            published_at=timezone.now(),
+        )
+
+    def setUp(self):
+        # A stream left open by a failed test must not leak into the next one.
+        live._subscribers.clear()
+        live._last_sent.clear()
+        live._flusher["resynced_at"] = timezone.now()
+
+    def like_burst(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for reader in self.readers:
+                ArticleReaction.objects.create(
+                    article=self.article, user=reader, value=ArticleReaction.VALUE_LIKE
+                )
+                live.publish_stats(self.article.pk)
+
+    async def test_burst_of_reactions_is_one_update(self):
+        stats = (await live.load_stats([self.article.pk]))[self.article.pk]
+        subscriber = live.subscribe(self.article.pk, stats)
+        try:
+            await sync_to_async(self.like_burst)()
+            self.assertEqual(await live.flush(), 1)
+            self.assertEqual(
+                subscriber.drain(),
+                {"stats": {"score": 1000, "likes": 1000, "dislikes": 0, "comments": 0}},
+            )
+            self.assertEqual(await live.flush(), 0)
+        finally:
+            live.unsubscribe(self.article.pk, subscriber)
+
+    async def test_comment_notices_are_merged(self):
+        subscriber = live.subscribe(self.article.pk, {})
+        try:
+            for reader in self.readers[:3] + self.readers[:1]:
+                live._queue_comment(self.article.pk, reader.username)
+            await live.flush()
+            self.assertEqual(
+                subscriber.drain()["comments"],
+                {"count": 4, "authors": ["live-reader0", "live-reader1", "live-reader2"]},
+            )
+        finally:
+            live.unsubscribe(self.article.pk, subscriber)
+
+    async def test_flusher_survives_a_failed_tick(self):
+        ticks = []
+
+        async def flaky_flush():
+            ticks.append(len(ticks))
+            if len(ticks) == 1:
+                raise DatabaseError("database is locked")
+            return 0
+
+        async def second_tick():
+            while len(ticks) < 2:
+                await asyncio.sleep(0)
+
+        with (
+            mock.patch.object(live, "LIVE_COALESCE_SECONDS", 0),
+            mock.patch.object(live, "flush", flaky_flush),
+            self.assertLogs("articles.live", "ERROR"),
+        ):
+            subscriber = live.subscribe(self.article.pk, {})
+            task = live._flusher["task"]
+            try:
+                await asyncio.wait_for(second_tick(), 1)
+                self.assertFalse(task.done())
+            finally:
+                live.unsubscribe(self.article.pk, subscriber)
+            await asyncio.wait_for(task, 1)
+
+    def test_unwatched_articles_are_not_buffered(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            live.publish_stats(self.article.pk)
+        self.assertNotIn(self.article.pk, live._pending["stats"])
+
+    async def test_router_streams_current_totals_then_updates(self):
+        fallback_scopes = []
+        messages = asyncio.Queue()
+        incoming = asyncio.Queue()
+
+        async def fallback(scope, receive, send):
+            fallback_scopes.append(scope)
+
+        router = live.LiveStreamRouter(fallback)
+        url = reverse("articles:article_live", args=[self.article.slug])
+        scope = {"type": "http", "method": "GET", "path": url}
+        serving = asyncio.create_task(router(scope, incoming.get, messages.put))
+        start = await asyncio.wait_for(messages.get(), 1)
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        first = (await asyncio.wait_for(messages.get(), 1))["body"].decode()
+        self.assertIn("retry: ", first)
+        self.assertIn('event: stats\ndata: {"score":0,"likes":0,"dislikes":0,"comments":0}', first)
+        live._queue_comment(self.article.pk, "live-reader0")
+        await live.flush()
+        update = (await asyncio.wait_for(messages.get(), 1))["body"].decode()
+        self.assertIn('event: comments\ndata: {"count":1,"authors":["live-reader0"]}', update)
+        await incoming.put({"type": "http.disconnect"})
+        await asyncio.wait_for(serving, 1)
+        self.assertNotIn(self.article.pk, live._subscribers)
+
+        missing = {**scope, "path": reverse("articles:article_live", args=["missing"])}
+        await router(missing, incoming.get, messages.put)
+        await router({**scope, "path": "/"}, incoming.get, messages.put)
+        self.assertEqual([scope["path"] for scope in fallback_scopes], [missing["path"], "/"])
+
+    def test_view_tells_clients_without_the_router_to_stop(self):
+        url = reverse("articles:article_live", args=[self.article.slug])
+        self.assertEqual(self.client.get(url).status_code, 204)
+        missing = reverse("articles:article_live", args=["missing"])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="api-author", password=SEED_PASSWORD)
+        cls.category = Category.objects.create(name="Api")
+        now = timezone.now()
+        Article.objects.bulk_create(
+            Article(
+                title=f"Api article {index}",
+                slug=f"api-article-{index}",
+                author=cls.author,
+                category=cls.category,
+                content="Body " * 100,
+                status=Article.STATUS_DRAFT if index % 7 == 0 else Article.STATUS_PUBLISHED,
+                # Several articles share a timestamp so the cursor has to break ties.
+                published_at=now - timedelta(minutes=index // 3, microseconds=index % 2),
+            )
+            for index in range(25)
+        )
+
+    def walk(self, url):
+        slugs = []
+        while url:
+            payload = self.client.get(url).json()
+            slugs += [row["slug"] for row in payload["data"]]
+            url = payload["next"]
+        return slugs
+
+    def test_cursor_walks_the_feed_in_order_without_gaps(self):
+        expected = list(
+            Article.published.order_by("-published_at", "-pk").values_list("slug", flat=True)
+        )
+        self.assertEqual(
+            self.walk(reverse("articles:api_articles") + "?limit=4&fields=slug"), expected
+        )
+
+    def test_sparse_fieldsets(self):
+        response = self.client.get(
+            reverse("articles:api_articles") + "?limit=1&fields=slug,likes,excerpt"
+        )
+        row = response.json()["data"][0]
+        self.assertEqual(set(row), {"slug", "likes", "excerpt"})
+        self.assertEqual(len(row["excerpt"]), 280)
+        response = self.client.get(reverse("articles:api_articles") + "?fields=slug,password")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json()["error"])
+
+    def test_etag_revalidation(self):
+        url = reverse("articles:api_article_detail", args=["api-article-1"])
+        response = self.client.get(url)
+        self.assertEqual(response.json()["data"]["author"], "api-author")
+        self.assertIn("public", response["Cache-Control"])
+        self.assertNotIn("Vary", response)
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        Article.objects.filter(slug="api-article-1").update(title="Renamed")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+
+    def test_engagement_batch_runs_constant_queries(self):
+        reader = User.objects.create(username="api-reader", password=SEED_PASSWORD)
+        articles = list(Article.published.order_by("pk"))
+        ArticleReaction.objects.create(
+            article=articles[0], user=reader, value=ArticleReaction.VALUE_DISLIKE
+        )
+        Bookmark.objects.create(article=articles[1], user=reader)
+        url = reverse("articles:api_engagement")
+        with self.assertNumQueries(1):
+            few = self.client.get(f"{url}?slugs={articles[0].slug}")
+        with self.assertNumQueries(1):
+            many = self.client.get(
+                f"{url}?slugs={','.join(article.slug for article in articles[:10])}"
+                f"&ids={','.join(str(article.pk) for article in articles[10:])},999999"
+            )
+        self.assertEqual(
+            few.json()["data"],
+            {
+                articles[0].slug: {
+                    "id": articles[0].pk,
+                    "likes": 0,
+                    "dislikes": 1,
+                    "score": -1,
+                    "comments": 0,
+                }
+            },
+        )
+        self.assertEqual(len(many.json()["data"]), len(articles))
+        self.assertIn("public", few["Cache-Control"])
+
+        self.client.force_login(reader)
+        response = self.client.get(f"{url}?ids={articles[0].pk},{articles[1].pk}")
+        data = response.json()["data"]
+        self.assertEqual(
+            (data[articles[0].slug]["reaction"], data[articles[0].slug]["bookmarked"]),
+            ("dislike", False),
+        )
+        self.assertEqual(
+            (data[articles[1].slug]["reaction"], data[articles[1].slug]["bookmarked"]),
+            (None, True),
+        )
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+
+    def test_errors_are_json(self):
+        for url, status in (
+            (reverse("articles:api_article_detail", args=["api-article-0"]), 404),
+            (reverse("articles:api_author_detail", args=["nobody"]), 404),
+            (reverse("articles:api_articles") + "?cursor=not-a-cursor", 400),
+            (reverse("articles:api_articles") + "?cursor=WyJ4IiwxXQ", 400),
+            (reverse("articles:api_articles") + "?limit=500", 400),
+            (reverse("articles:api_engagement"), 400),
+            (reverse("articles:api_engagement") + "?ids=1,x", 400),
+            (
+                reverse("articles:api_engagement")
+                + "?ids="
+                + ",".join(str(pk) for pk in range(ENGAGEMENT_BATCH_SIZE + 1)),
+                400,
+            ),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status)
+                self.assertIn("error", response.json())
+
+    def test_decodable_cursors_with_bad_values_are_rejected(self):
+        published = "2024-01-01T00:00:00+00:00"
+        for name, values in (
+            ("api_articles", [published, 10**30]),
+            ("api_articles", [published, "seven"]),
+            ("api_articles", [published, 1.5]),
+            ("api_articles", [published, True]),
+            ("api_articles", ["yesterday", 1]),
+            ("api_articles", [None, 1]),
+            ("api_articles", [{"at": published}, 1]),
+            ("api_categories", [["AI"]]),
+            ("api_authors", [-(10**30)]),
+        ):
+            with self.subTest(name=name, values=values):
+                url = reverse(f"articles:{name}") + "?cursor=" + encode_cursor(values)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"error": "Invalid cursor."})
+
+
+class ConditionalFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="stamp-author", password=SEED_PASSWORD)
+        cls.reader = User.objects.create(username="stamp-reader", password=SEED_PASSWORD)
+        cls.category = Category.objects.create(name="Stamps")
+        cls.other = Category.objects.create(name="Other stamps")
+        cls.article = Article.objects.create(
+            title="Stamped",
+            author=cls.author,
+            category=cls.category,
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+        )
+        cls.article.set_tags(["stamps"])
+
+    def setUp(self):
+        cold_caches()
+
+    def etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response["ETag"]
+
+    def pages(self):
+        return {
+            "home": reverse("articles:article_list"),
+            "category": reverse("articles:category_detail", args=[self.category.slug]),
+            "other category": reverse("articles:category_detail", args=[self.other.slug]),
+            "author": reverse("articles:author_detail", args=[self.author.username]),
+            "tag": reverse("articles:tag_detail", args=["stamps"]),
+            "rss": reverse("articles:feed_rss"),
+        }
+
+    def changed_pages(self, change):
+        before = {name: self.etag(url) for name, url in self.pages().items()}
+        change()
+        cold_caches()
+        return {name for name, url in self.pages().items() if self.etag(url) != before[name]}
+
+    def test_revalidation_reads_no_articles(self):
+        for name, url in self.pages().items():
+            etag = self.etag(url)
+            with self.subTest(page=name), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertFalse(
+                [query["sql"] for query in queries if '"articles_article"' in query["sql"]]
+            )
+
+    def test_edits_change_their_feeds(self):
+        def edit():
+            self.article.title = "Stamped again"
+            self.article.save()
+
+        self.assertEqual(
+            self.changed_pages(edit), {"home", "category", "author", "tag", "rss"}
+        )
+
+    def test_moving_an_article_changes_both_categories(self):
+        def move():
+            self.article.category = self.other
+            self.article.save()
+
+        self.assertLessEqual({"category", "other category"}, self.changed_pages(move))
+
+    def test_reactions_change_pages_but_not_rss(self):
+        def like():
+            ArticleReaction.objects.create(
+                article=self.article, user=self.reader, value=ArticleReaction.VALUE_LIKE
+            )
+
+        self.assertEqual(self.changed_pages(like), {"home", "category", "author", "tag"})
+
+    def test_moderation_and_queryset_deletes_change_feeds(self):
+        moderator = User.objects.create(username="stamp-moderator", role=User.ROLE_ADMIN)
+        changed = self.changed_pages(
+            lambda: Article.objects.filter(pk=self.article.pk).moderate(
+                Article.STATUS_DRAFT, moderator
+            )
+        )
+        self.assertEqual(changed, {"home", "category", "author", "tag", "rss"})
+        self.assertEqual(
+            self.changed_pages(lambda: self.author.articles.all().delete()),
+            {"home", "category", "author", "tag", "rss"},
+        )
+
+
+class ModerationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username="moderator", role=User.ROLE_ADMIN)
+        cls.member = User.objects.create(username="moderated-member")
+        cls.author = User.objects.create(username="moderated-author")
+        cls.category = Category.objects.create(name="Queue")
+        cls.other = Category.objects.create(name="Queue two")
+        now = timezone.now()
+        Article.objects.bulk_create(
+            Article(
+                title=f"Pending {index}",
+                slug=f"pending-{index}",
+                author=cls.author if index % 2 else cls.member,
+                category=cls.category if index < 20 else cls.other,
+                content="Body",
+                status=Article.STATUS_PENDING,
+                created_at=now,
+            )
+            for index in range(30)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def queue(self, **params):
+        response = self.client.get(reverse("articles:moderation_queue"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.context
+
+    def test_queue_pages_oldest_first_and_filters(self):
+        first = self.queue()
+        self.assertEqual(len(first["articles"]), 25)
+        self.assertEqual(first["articles"][0].slug, "pending-0")
+        self.assertEqual(len(self.queue(page=2)["articles"]), 5)
+        filtered = self.queue(category=self.other.slug, author=self.author.username)
+        self.assertEqual(
+            {article.slug for article in filtered["articles"]},
+            {f"pending-{index}" for index in range(21, 30, 2)},
+        )
+
+    def test_members_cannot_moderate(self):
+        self.client.force_login(self.member)
+        self.assertEqual(self.client.get(reverse("articles:moderation_queue")).status_code, 403)
+        response = self.client.post(
+            reverse("articles:moderation_bulk"), {"action": "publish", "articles": ["1"]}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Article.objects.filter(status=Article.STATUS_PUBLISHED).exists())
+
+    def test_bulk_publish_only_touches_pending_selection(self):
+        published_at = timezone.now() - timedelta(days=3)
+        Article.objects.filter(slug="pending-1").update(published_at=published_at)
+        Article.objects.filter(slug="pending-2").update(status=Article.STATUS_REJECTED)
+        ids = list(
+            Article.objects.filter(slug__in=["pending-0", "pending-1", "pending-2"]).values_list(
+                "pk", flat=True
+            )
+        )
+        next_url = reverse("articles:moderation_queue") + "?category=" + self.category.slug
+        response = self.client.post(
+            reverse("articles:moderation_bulk"),
+            {"action": "publish", "articles": [str(pk) for pk in ids] + ["junk"], "next": next_url},
+        )
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
+        rows = {
+            article.slug: article
+            for article in Article.objects.filter(pk__in=ids).select_related("last_moderated_by")
+        }
+        self.assertEqual(rows["pending-0"].status, Article.STATUS_PUBLISHED)
+        self.assertIsNotNone(rows["pending-0"].published_at)
+        self.assertEqual(rows["pending-0"].last_moderated_by, self.admin)
+        self.assertEqual(rows["pending-1"].published_at, published_at)
+        self.assertEqual(rows["pending-2"].status, Article.STATUS_REJECTED)
+        self.assertIsNone(rows["pending-2"].last_moderated_by)
+
+    def test_bulk_reject_clears_published_at(self):
+        article = Article.objects.get(slug="pending-3")
+        self.client.post(
+            reverse("articles:moderation_bulk"), {"action": "reject", "articles": [article.pk]}
+        )
+        article.refresh_from_db()
+        self.assertEqual(article.status, Article.STATUS_REJECTED)
+        self.assertIsNone(article.published_at)
+
+
+class SlugAllocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="slug-author")
+        cls.category = Category.objects.create(name="Slugs")
+
+    def article(self, title, **kwargs):
+        return Article.objects.create(
+            title=title, author=self.author, category=self.category, content="Body", **kwargs
+        )
+
+    def test_suffixes_skip_taken_reserved_and_batch_slugs(self):
+        for slug in ("python", "python-2", "python-tips-and-tricks", "python-3-tips"):
+            self.article("Python", slug=slug)
+        with CaptureQueriesContext(connection) as queries:
+            slugs = allocate_slugs(["Python", "Python", "Feed", "!!!"])
+        self.assertEqual(slugs, ["python-3", "python-4", "feed-2", "article"])
+        self.assertEqual(len(queries), 1)
+        with connection.cursor() as cursor:
+            cursor.execute(queries[0]["sql"])
+            fetched = {row[0] for row in cursor.fetchall()}
+        self.assertEqual(fetched, {"python", "python-2", "python-3-tips"})
+
+    def test_renamed_articles_redirect_and_keep_their_old_slug(self):
+        article = self.article("First title", status=Article.STATUS_PUBLISHED)
+        article.title = "Second title"
+        article.save()
+        self.assertEqual(article.slug, "second-title")
+        response = self.client.get(reverse("articles:article_detail", args=["first-title"]))
+        self.assertRedirects(
+            response,
+            reverse("articles:article_detail", args=["second-title"]),
+            status_code=301,
+        )
+        self.assertEqual(self.article("First title").slug, "first-title-2")
+
+        article.title = "First title"
+        article.save()
+        self.assertEqual(article.slug, "first-title")
+        self.assertEqual(
+            set(ArticleSlugHistory.objects.filter(article=article).values_list("slug", flat=True)),
+            {"second-title"},
+        )
+
+    def test_slug_edited_with_the_title_is_kept(self):
+        article = self.article("Title")
+        article.title = "Another title"
+        article.slug = "custom-slug"
+        article.save()
+        self.assertEqual(Article.objects.get(pk=article.pk).slug, "custom-slug")
+
+    def test_deferred_loads_do_not_recurse(self):
+        article = self.article("Deferred")
+        loaded = Article.objects.only("pk", "author_id").get(pk=article.pk)
+        loaded.save(update_fields=["author"])
+        self.assertEqual(Article.objects.get(pk=article.pk).slug, "deferred")
+
+
+class AuthorStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="stats-author")
+        cls.readers = [User.objects.create(username=f"stats-reader{index}") for index in range(3)]
+        cls.category = Category.objects.create(name="Stats")
+
+    def publish(self, title):
+        return Article.objects.create(
+            title=title,
+            author=self.author,
+            category=self.category,
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+        )
+
+    def stats(self):
+        return AuthorStats.objects.filter(author=self.author).values(
+            "published_count",
+            "total_score",
+            "avg_score",
+            "comment_count",
+            "last_published_at",
+            "follower_count",
+        ).get()
+
+    def test_incremental_updates_match_a_full_refresh(self):
+        first, second = self.publish("One"), self.publish("Two")
+        like, dislike = ArticleReaction.VALUE_LIKE, ArticleReaction.VALUE_DISLIKE
+        ArticleReaction.objects.create(article=first, user=self.readers[0], value=like)
+        ArticleReaction.objects.create(article=first, user=self.readers[1], value=like)
+        flipped = ArticleReaction.objects.create(article=second, user=self.readers[0], value=like)
+        flipped.value = dislike
+        flipped.save()
+        ArticleReaction.objects.get(article=first, user=self.readers[1]).delete()
+        comment = ArticleComment.objects.create(article=first, user=self.readers[0], body="Hi")
+        ArticleComment.objects.create(article=first, user=self.readers[1], body="Re", parent=comment)
+        ArticleComment.objects.create(article=second, user=self.readers[2], body="Hey")
+        comment.delete()
+        Follow.objects.create(follower=self.readers[0], author=self.author)
+        Follow.objects.create(follower=self.readers[1], author=self.author)
+        Follow.objects.get(follower=self.readers[0], author=self.author).delete()
+
+        incremental = self.stats()
+        self.assertEqual(incremental["published_count"], 2)
+        self.assertEqual(incremental["total_score"], 0)
+        self.assertEqual(incremental["comment_count"], 1)
+        self.assertEqual(incremental["follower_count"], 1)
+        AuthorStats.refresh([self.author.pk])
+        self.assertEqual(self.stats(), incremental)
+
+    def test_unpublishing_updates_counts(self):
+        article = self.publish("Only")
+        self.assertEqual(self.stats()["published_count"], 1)
+        article.status = Article.STATUS_DRAFT
+        article.save()
+        self.assertEqual(self.stats()["published_count"], 0)
+        self.assertIsNone(self.stats()["last_published_at"])
+
+    def test_deleting_a_user_keeps_counts_right(self):
+        leaving = User.objects.create(username="stats-leaving")
+        theirs = Article.objects.create(
+            title="Theirs",
+            author=leaving,
+            category=self.category,
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+        )
+        theirs.set_tags(["leaving", "shared"])
+        ours = self.publish("Ours")
+        ours.set_tags(["shared"])
+        like = ArticleReaction.VALUE_LIKE
+        ArticleReaction.objects.create(article=theirs, user=self.readers[0], value=like)
+        ArticleReaction.objects.create(article=ours, user=leaving, value=like)
+        ArticleComment.objects.create(article=ours, user=leaving, body="Bye")
+        Follow.objects.create(follower=leaving, author=self.author)
+        self.assertEqual(
+            (self.stats()["total_score"], self.stats()["follower_count"]), (1, 1)
+        )
+
+        leaving.delete()
+        incremental = self.stats()
+        self.assertEqual(incremental["published_count"], 1)
+        self.assertEqual(incremental["total_score"], 0)
+        self.assertEqual(incremental["comment_count"], 0)
+        self.assertEqual(incremental["follower_count"], 0)
+        AuthorStats.refresh([self.author.pk])
+        self.assertEqual(self.stats(), incremental)
+        self.assertFalse(AuthorStats.objects.filter(author_id=leaving.pk).exists())
+        self.assertEqual(
+            dict(Tag.objects.values_list("slug", "published_count")),
+            {"leaving": 0, "shared": 1},
+        )
+
+    def test_deleting_a_thread_removes_every_nested_reply(self):
+        article = self.publish("Thread")
+        parent = ArticleComment.objects.create(article=article, user=self.readers[0], body="0")
+        root = parent
+        for depth in range(1, 5):
+            parent = ArticleComment.objects.create(
+                article=article, user=self.readers[depth % 3], body=str(depth), parent=parent
+            )
+        ArticleComment.objects.create(article=article, user=self.readers[1], body="Other")
+        self.assertEqual(self.stats()["comment_count"], 6)
+        root.delete()
+        self.assertEqual(self.stats()["comment_count"], 1)
+
+    def test_queryset_deletes_keep_counts_right(self):
+        first, second = self.publish("First"), self.publish("Second")
+        first.set_tags(["bulk"])
+        second.set_tags(["bulk"])
+        for reader in self.readers:
+            ArticleReaction.objects.create(
+                article=first, user=reader, value=ArticleReaction.VALUE_LIKE
+            )
+        ArticleReaction.objects.filter(user__in=self.readers[:2]).delete()
+        self.assertEqual(self.stats()["total_score"], 1)
+        Article.objects.filter(author=self.author).delete()
+        self.assertEqual(self.stats()["published_count"], 0)
+        self.assertEqual(self.stats()["total_score"], 0)
+        self.assertEqual(Tag.objects.get(slug="bulk").published_count, 0)
+
+    def test_directory_lists_published_authors_by_sort(self):
+        quiet = User.objects.create(username="stats-quiet")
+        AuthorStats.objects.create(author=quiet)
+        self.publish("Listed")
+        response = self.client.get(reverse("articles:author_list"), {"sort": "published"})
+        self.assertEqual(
+            [stats.author.username for stats in response.context["authors"]], ["stats-author"]
+        )
+        self.assertEqual(response.context["sort"], "published")
+        response = self.client.get(reverse("articles:author_list"), {"sort": "bogus"})
+        self.assertEqual(response.context["sort"], "name")
+
+
+class CategoryRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="rollup-author")
+        cls.reader = User.objects.create(username="rollup-reader")
+        cls.busy = Category.objects.create(name="Busy")
+        cls.quiet = Category.objects.create(name="Quiet")
+
+    def setUp(self):
+        rollups._trending_cache["expires_at"] = 0.0
+
+    def publish(self, title, category, **extra):
+        return Article.objects.create(
+            title=title,
+            author=self.author,
+            category=category,
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+            **extra,
+        )
+
+    def test_published_counts_are_live(self):
+        self.publish("Kept", self.busy)
+        self.publish("Also kept", self.busy)
+        unpublished = self.publish("Unpublished", self.busy)
+        deleted = self.publish("Deleted", self.quiet)
+        Article.objects.create(title="Draft", author=self.author, category=self.quiet, content="")
+        unpublished.status = Article.STATUS_DRAFT
+        unpublished.save()
+        deleted.delete()
+        expected = {"Busy": 2, "Quiet": 0}
+        response = self.client.get(reverse("articles:category_list"))
+        self.assertEqual(
+            {
+                category.name: category.published_count
+                for category in response.context["categories"]
+                if category.name in expected
+            },
+            expected,
+        )
+        payload = self.client.get(reverse("articles:api_categories") + "?fields=name,articles")
+        self.assertEqual(
+            {
+                row["name"]: row["articles"]
+                for row in payload.json()["data"]
+                if row["name"] in expected
+            },
+            expected,
+        )
+        self.assertFalse(CategoryDailyStats.objects.exists())
+
+    def test_rollup_feeds_trending_and_sparklines(self):
+        today = timezone.localdate()
+        old = self.publish("Old", self.quiet, published_at=timezone.now() - timedelta(days=20))
+        fresh = self.publish("Fresh", self.busy)
+        ArticleReaction.objects.create(
+            article=fresh, user=self.reader, value=ArticleReaction.VALUE_LIKE
+        )
+        ArticleComment.objects.create(article=old, user=self.reader, body="Late")
+        rollups.rollup_category_stats(today - timedelta(days=29), today)
+
+        row = CategoryDailyStats.objects.get(category=self.busy, date=today)
+        self.assertEqual((row.published_count, row.reaction_count, row.comment_count), (1, 1, 0))
+        self.assertEqual(
+            [category.name for category in rollups.trending_categories()], ["Busy", "Quiet"]
+        )
+        series = rollups.category_activity(self.quiet)
+        self.assertEqual(len(series), rollups.SPARKLINE_DAYS)
+        self.assertEqual(series[-1]["value"], 1)
+        self.assertEqual(sum(point["value"] for point in series), 2)
+
+        # Re-running a window replaces its rows rather than adding to them.
+        rollups.rollup_category_stats(today, today)
+        self.assertEqual(
+            CategoryDailyStats.objects.filter(category=self.busy, date=today).count(), 1
+        )
+
+
+class SyndicationFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="feed-author", password=SEED_PASSWORD)
+        cls.category = Category.objects.create(name="Feeds")
+        cls.other = Category.objects.create(name="Other feeds")
+        cls.article = Article.objects.create(
+            title="Syndicated",
+            author=cls.author,
+            category=cls.category,
+            content="Body " * 200,
+            status=Article.STATUS_PUBLISHED,
+        )
+        Article.objects.create(
+            title="Unlisted draft", author=cls.author, category=cls.category, content="Body"
+        )
+
+    def setUp(self):
+        cold_caches()
+
+    def feeds(self):
+        category, author = self.category.slug, self.author.username
+        return {
+            "rss": reverse("articles:feed_rss"),
+            "atom": reverse("articles:feed_atom"),
+            "category rss": reverse("articles:category_feed_rss", args=[category]),
+            "category atom": reverse("articles:category_feed_atom", args=[category]),
+            "other category": reverse("articles:category_feed_rss", args=[self.other.slug]),
+            "author rss": reverse("articles:author_feed_rss", args=[author]),
+            "author atom": reverse("articles:author_feed_atom", args=[author]),
+        }
+
+    def test_feeds_list_published_articles(self):
+        for name, url in self.feeds().items():
+            with self.subTest(feed=name):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                kind = "atom" if "atom" in name else "rss"
+                self.assertIn(f"application/{kind}+xml", response["Content-Type"])
+                body = response.content.decode()
+                self.assertEqual("Syndicated" in body, name != "other category")
+                self.assertNotIn("Unlisted draft", body)
+        missing = reverse("articles:category_feed_rss", args=["no-such-category"])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_bodies_are_cached_until_an_article_changes(self):
+        url = self.feeds()["category rss"]
+        first = self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get(url)
+        self.assertEqual(again.content, first.content)
+        self.assertEqual(again["ETag"], first["ETag"])
+        self.assertFalse([query for query in queries if '"articles_article"' in query["sql"]])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        self.article.title = "Syndicated, revised"
+        self.article.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertIn("Syndicated, revised", changed.content.decode())
+
+    def test_publishing_elsewhere_leaves_category_feeds_alone(self):
+        before = {name: self.client.get(url)["ETag"] for name, url in self.feeds().items()}
+        Article.objects.create(
+            title="Elsewhere",
+            author=User.objects.create(username="feed-other-author"),
+            category=self.other,
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+        )
+        changed = {
+            name for name, url in self.feeds().items() if self.client.get(url)["ETag"] != before[name]
+        }
+        self.assertEqual(changed, {"rss", "atom", "other category"})
+
+
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="map-author")
+        cls.category = Category.objects.create(name="Maps")
+        cls.articles = [
+            Article.objects.create(
+                title=f"Mapped {index}",
+                author=cls.author,
+                category=cls.category,
+                content="Body",
+                status=Article.STATUS_PUBLISHED if index else Article.STATUS_DRAFT,
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        cold_caches()
+
+    def test_shards_list_published_articles(self):
+        index = self.client.get(reverse("articles:sitemap_index"))
+        body = b"".join(index.streaming_content).decode()
+        shard = reverse("articles:sitemap_articles", args=[0])
+        self.assertIn(shard, body)
+        self.assertIn(reverse("articles:sitemap_authors", args=[0]), body)
+        urls = b"".join(self.client.get(shard).streaming_content).decode()
+        for article in self.articles:
+            detail = reverse("articles:article_detail", args=[article.slug])
+            self.assertEqual(detail in urls, article.status == Article.STATUS_PUBLISHED)
+        sections = b"".join(
+            self.client.get(reverse("articles:sitemap_sections")).streaming_content
+        ).decode()
+        self.assertIn(reverse("articles:category_detail", args=[self.category.slug]), sections)
+        empty = reverse("articles:sitemap_articles", args=[9])
+        self.assertEqual(self.client.get(empty).status_code, 404)
+
+    def test_index_is_cached_until_an_article_changes(self):
+        url = reverse("articles:sitemap_index")
+        first = self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get(url)
+        self.assertEqual(len(queries), 1, [query["sql"] for query in queries])
+        self.assertEqual(again["ETag"], first["ETag"])
+
+        draft = self.articles[0]
+        draft.status = Article.STATUS_PUBLISHED
+        draft.save()
+        self.assertNotEqual(self.client.get(url)["ETag"], first["ETag"])
+
+
+class ContentExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="export-author")
+        cls.admin = User.objects.create(username="export-admin", role=User.ROLE_ADMIN)
+        cls.reader = User.objects.create(username="export-reader")
+        category = Category.objects.create(name="Exports")
+        cls.old, cls.new = (
+            Article.objects.create(
+                title=title,
+                author=cls.author,
+                category=category,
+                content="Body",
+                status=Article.STATUS_PUBLISHED,
+            )
+            for title in ("Old export", "New export")
+        )
+        ArticleReaction.objects.create(
+            article=cls.new, user=cls.reader, value=ArticleReaction.VALUE_LIKE
+        )
+        ArticleComment.objects.create(article=cls.new, user=cls.reader, body="Nice")
+        Bookmark.objects.create(article=cls.new, user=cls.reader)
+        long_ago = timezone.now() - timedelta(days=30)
+        Article.objects.filter(pk=cls.old.pk).update(
+            updated_at=long_ago, engagement_updated_at=long_ago
+        )
+
+    def rows(self, **params):
+        response = self.client.get(reverse("articles:content_export"), params)
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content)
+        if params.get("gzip") == "1":
+            body = gzip.decompress(body)
+        return body.decode()
+
+    def test_ndjson_articles_carry_engagement_counts(self):
+        self.client.force_login(self.admin)
+        rows = {
+            row["slug"]: row for row in map(json.loads, self.rows(gzip="1").splitlines())
+        }
+        self.assertEqual(set(rows), {self.old.slug, self.new.slug})
+        counts = ("like_count", "dislike_count", "comment_count", "bookmark_count")
+        self.assertEqual([rows[self.new.slug][name] for name in counts], [1, 0, 1, 1])
+        self.assertEqual(rows[self.old.slug]["author_username"], "export-author")
+
+    def test_csv_since_and_datasets(self):
+        self.client.force_login(self.admin)
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        lines = list(csv.reader(io.StringIO(self.rows(format="csv", since=since))))
+        self.assertEqual(lines[0][:3], ["id", "slug", "title"])
+        self.assertEqual([line[1] for line in lines[1:]], [self.new.slug])
+        reactions = self.rows(dataset="reactions").splitlines()
+        self.assertEqual(json.loads(reactions[0])["user_username"], "export-reader")
+        response = self.client.get(reverse("articles:content_export"), {"dataset": "users"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_is_admin_only(self):
+        self.client.force_login(self.reader)
+        self.assertEqual(self.client.get(reverse("articles:content_export")).status_code, 403)
+
+    def test_command_writes_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "comments.csv")
+            call_command(
+                "export_content", "comments", format="csv", output=path, stderr=io.StringIO()
+            )
+            with open(path, newline="") as handle:
+                lines = list(csv.reader(handle))
+        self.assertEqual(lines[1][-2:-1], ["Nice"])
+        with self.assertRaises(CommandError):
+            call_command("export_content", since="yesterday")
+
+
+class ArticleImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="import-author")
+        cls.category = Category.objects.create(name="Imports")
+
+    def write_source(self, directory):
+        rows = [
+            {
+                "title": f"Imported {index}",
+                "content": "Body",
+                "author": "import-author",
+                "category": "imports",
+            }
+            for index in range(5)
+        ]
+        rows.insert(3, {"title": "No author", "content": "Body", "category": "imports"})
+        path = os.path.join(directory, "articles.ndjson")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(row) + "\n" for row in rows)
+        return path
+
+    def test_interrupted_import_resumes_after_the_last_committed_batch(self):
+        calls = []
+        touch = FeedStamp.touch.__func__
+
+        def failing_touch(cls, scopes, engagement=False):
+            calls.append(scopes)
+            if len(calls) == 2:
+                raise RuntimeError("Connection lost.")
+            return touch(cls, scopes, engagement)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_source(directory)
+            with mock.patch.object(FeedStamp, "touch", classmethod(failing_touch)):
+                with self.assertRaises(RuntimeError):
+                    call_command("import_articles", path, batch_size=2, stdout=io.StringIO())
+            self.assertEqual(self.category.articles.count(), 2)
+            progress = ImportProgress.objects.get(source=os.path.abspath(path))
+            self.assertEqual((progress.line, progress.imported), (2, 2))
+
+            out = io.StringIO()
+            call_command("import_articles", path, batch_size=2, stdout=out)
+        self.assertIn("Resuming after row 2.", out.getvalue())
+        self.assertEqual(
+            sorted(self.category.articles.values_list("title", flat=True)),
+            [f"Imported {index}" for index in range(5)],
+        )
+        progress.refresh_from_db()
+        self.assertEqual((progress.line, progress.imported, progress.rejected), (6, 5, 1))
+
+    def test_malformed_rows_are_rejected_without_stopping_the_import(self):
+        good = {
+            "title": "Good",
+            "content": "Body",
+            "author": "import-author",
+            "category": "imports",
+        }
+        lines = [
+            "[1, 2]",
+            '"just a string"',
+            json.dumps({**good, "title": ["Not", "text"]}),
+            json.dumps({**good, "category": 7}),
+            json.dumps({**good, "author": {"username": "import-author"}}),
+            json.dumps(good),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "malformed.ndjson")
+            rejects = os.path.join(directory, "rejects.jsonl")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.writelines(line + "\n" for line in lines)
+            call_command("import_articles", path, rejects=rejects, stdout=io.StringIO())
+            with open(rejects, encoding="utf-8") as handle:
+                errors = [json.loads(line)["reason"] for line in handle]
+        self.assertEqual(list(self.category.articles.values_list("title", flat=True)), ["Good"])
+        self.assertEqual(
+            errors,
+            [
+                "Expected a JSON object.",
+                "Expected a JSON object.",
+                "title must be a string.",
+                "category must be a string.",
+                "author must be a string.",
+            ],
+        )
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="inbox-author")
+        cls.readers = [User.objects.create(username=f"inbox-reader{index}") for index in range(3)]
+        cls.article = Article.objects.create(
+            title="Inbox",
+            author=cls.author,
+            category=Category.objects.create(name="Inbox"),
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def comment(self, user, parent=None):
+        self.client.force_login(user)
+        self.client.post(
+            reverse("articles:comment_create", args=[self.article.slug]),
+            {"body": "Hello", "parent_id": parent.pk if parent else ""},
+        )
+        return ArticleComment.objects.latest("pk")
+
+    def unread(self, user):
+        return User.objects.get(pk=user.pk).unread_notification_count
+
+    def test_events_collapse_into_one_unread_row(self):
+        first = self.comment(self.readers[0])
+        self.comment(self.readers[1])
+        self.comment(self.author)
+        self.comment(self.readers[2], parent=first)
+
+        notification = Notification.objects.get(recipient=self.author)
+        self.assertEqual(
+            (notification.kind, notification.event_count, notification.actor),
+            (Notification.KIND_COMMENT, 3, self.readers[2]),
+        )
+        self.assertEqual(notification.message, '3 new comments on "Inbox"')
+        self.assertEqual(self.unread(self.author), 1)
+        reply = Notification.objects.get(recipient=self.readers[0])
+        self.assertEqual(reply.kind, Notification.KIND_REPLY)
+        self.assertFalse(Notification.objects.filter(recipient__in=self.readers[1:]).exists())
+
+    def test_reading_resets_the_count_and_starts_a_new_row(self):
+        self.comment(self.readers[0])
+        self.client.force_login(self.author)
+        response = self.client.get(reverse("articles:notification_list"))
+        self.assertEqual(len(response.context["notifications"]), 1)
+        self.assertEqual(self.unread(self.author), 0)
+
+        self.comment(self.readers[1])
+        self.assertEqual(self.unread(self.author), 1)
+        self.assertEqual(Notification.objects.filter(recipient=self.author).count(), 2)
+
+    def test_full_saves_keep_the_unread_count(self):
+        stale = User.objects.get(pk=self.author.pk)
+        self.comment(self.readers[0])
+        stale.first_name = "Stale"
+        stale.save()
+        self.assertEqual(self.unread(self.author), 1)
+
+
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="timeline-author")
+        cls.other = User.objects.create(username="timeline-other")
+        cls.followers = [
+            User.objects.create(username=f"timeline-fan{index}") for index in range(2)
+        ]
+        cls.stranger = User.objects.create(username="timeline-stranger")
+        cls.category = Category.objects.create(name="Timeline")
+        for follower in cls.followers:
+            Follow.objects.create(follower=follower, author=cls.author)
+        Follow.objects.create(follower=cls.followers[0], author=cls.other)
+
+    def publish(self, title, author=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(
+                title=title,
+                author=author or self.author,
+                category=self.category,
+                content="Body",
+                status=Article.STATUS_PUBLISHED,
+            )
+        self.run_jobs()
+        return article
+
+    def run_jobs(self):
+        while claimed := claim_next():
+            self.assertTrue(run_job(claimed))
+
+    def walk(self, user, size=2):
+        ids, cursor = timeline_page(user, size=size)
+        while cursor:
+            more, cursor = timeline_page(user, cursor, size=size)
+            ids += more
+        return ids
+
+    def test_publishing_fans_out_to_followers_only(self):
+        article = self.publish("Fanned out")
+        self.assertEqual(
+            set(TimelineEntry.objects.filter(article=article).values_list("owner", flat=True)),
+            {follower.pk for follower in self.followers},
+        )
+        self.assertEqual(timeline_page(self.stranger), ([], None))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            article.status = Article.STATUS_DRAFT
+            article.save()
+        self.run_jobs()
+        self.assertFalse(TimelineEntry.objects.filter(article=article).exists())
+
+    def test_pages_walk_every_followed_article_newest_first(self):
+        authors = [self.author, self.other, self.author, self.other, self.author]
+        articles = [
+            self.publish(f"Walk {index}", author) for index, author in enumerate(authors)
+        ]
+        expected = [article.pk for article in reversed(articles)]
+        self.assertEqual(self.walk(self.followers[0]), expected)
+        self.assertEqual(
+            self.walk(self.followers[1]),
+            [article.pk for article in reversed(articles) if article.author == self.author],
+        )
+
+    def test_popular_authors_are_merged_in_at_read_time(self):
+        with mock.patch("articles.timeline.FANOUT_MAX_FOLLOWERS", 1):
+            popular = self.publish("Popular")
+            fanned = self.publish("Fanned", self.other)
+            self.assertFalse(TimelineEntry.objects.filter(article=popular).exists())
+            self.assertEqual(self.walk(self.followers[0], size=1), [fanned.pk, popular.pk])
+            self.assertEqual(self.walk(self.followers[1]), [popular.pk])
+
+        response = self.client.get(reverse("articles:following_feed"))
+        self.assertEqual(response.status_code, 302)
+        self.client.force_login(self.followers[0])
+        response = self.client.get(reverse("articles:following_feed"))
+        self.assertEqual([article.title for article in response.context["articles"]], ["Fanned"])
+
+
+class RelatedArticleTests(TestCase):
+    TOPICS = {
+        "python": "python asyncio coroutines event loop tasks awaitable generators",
+        "kubernetes": "kubernetes cluster pods deployment containers scheduling nodes",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="related-author")
+        cls.category = Category.objects.create(name="Related")
+        cls.other_category = Category.objects.create(name="Related elsewhere")
+        cls.articles = {}
+        for topic, words in cls.TOPICS.items():
+            for index in range(3):
+                cls.articles[f"{topic}{index}"] = Article.objects.create(
+                    title=f"{topic.title()} {index}",
+                    author=cls.author,
+                    category=cls.other_category if index == 2 else cls.category,
+                    content=f"{words} " * (index + 1),
+                    status=Article.STATUS_PUBLISHED,
+                )
+
+    def lists(self):
+        lists = {}
+        for article_id, related_id in RelatedArticle.objects.order_by(
+            "article_id", "rank"
+        ).values_list("article_id", "related_id"):
+            lists.setdefault(article_id, []).append(related_id)
+        return lists
+
+    def related_to(self, name):
+        return self.lists().get(self.articles[name].pk, [])
+
+    def test_neighbours_share_a_topic_and_prefer_the_same_category(self):
+        build_related()
+        python = {self.articles[f"python{index}"].pk for index in range(3)}
+        self.assertEqual(
+            self.related_to("python0")[:2],
+            [self.articles["python1"].pk, self.articles["python2"].pk],
+        )
+        self.assertLessEqual(set(self.related_to("python0")), python)
+        self.assertEqual(build_related(), {"articles": 0, "changed": 0, "updated": 0})
+
+        response = self.client.get(self.articles["python0"].get_absolute_url())
+        self.assertEqual(
+            [article.pk for article in response.context["related_articles"]],
+            self.related_to("python0"),
+        )
+
+    def test_incremental_builds_match_a_full_rebuild(self):
+        build_related()
+        edited = self.articles["kubernetes0"]
+        edited.content = self.TOPICS["python"]
+        edited.save()
+        unpublished = self.articles["python1"]
+        unpublished.status = Article.STATUS_DRAFT
+        unpublished.save()
+        # The edit plus the two lists that pointed at the unpublished article.
+        self.assertEqual(build_related()["changed"], 3)
+        incremental = self.lists()
+        self.assertNotIn(unpublished.pk, {pk for ids in incremental.values() for pk in ids})
+        self.assertIn(edited.pk, self.related_to("python0"))
+        build_related(full=True)
+        self.assertEqual(incremental, self.lists())
+
+
+class TagCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="tag-author")
+        cls.category = Category.objects.create(name="Tagged")
+
+    def write(self, title, tags, status=Article.STATUS_PUBLISHED):
+        article = Article.objects.create(
+            title=title,
+            author=self.author,
+            category=self.category,
+            content="Body",
+            status=status,
+        )
+        article.set_tags(tags)
+        return article
+
+    def counts(self):
+        return dict(Tag.objects.values_list("slug", "published_count"))
+
+    def test_counts_follow_publishing_retagging_and_deletes(self):
+        first = self.write("First", ["Python", "python", "Web Dev"])
+        draft = self.write("Draft", ["python"], status=Article.STATUS_DRAFT)
+        self.assertEqual(self.counts(), {"python": 1, "web-dev": 1})
+
+        draft.status = Article.STATUS_PUBLISHED
+        draft.save()
+        self.assertEqual(self.counts()["python"], 2)
+        first.set_tags(["web dev", "rust"])
+        self.assertEqual(self.counts(), {"python": 1, "web-dev": 1, "rust": 1})
+        first.status = Article.STATUS_DRAFT
+        first.save()
+        self.assertEqual(self.counts(), {"python": 1, "web-dev": 0, "rust": 0})
+        draft.delete()
+        self.assertEqual(self.counts()["python"], 0)
+
+    def test_pages_list_tags_by_count_and_only_published_articles(self):
+        self.write("Popular one", ["popular", "niche"])
+        self.write("Popular two", ["popular"])
+        self.write("Hidden", ["popular", "unused"], status=Article.STATUS_DRAFT)
+        response = self.client.get(reverse("articles:tag_list"))
+        self.assertEqual([tag.slug for tag in response.context["tags"]], ["popular", "niche"])
+        response = self.client.get(reverse("articles:tag_detail", args=["popular"]))
+        self.assertEqual(
+            [article.title for article in response.context["articles"]],
+            ["Popular two", "Popular one"],
+        )
+
+    def test_form_limits_and_dedupes_tags(self):
+        def form(tags):
+            data = {
+                "title": "Form",
+                "category": self.category.pk,
+                "content": "Body",
+                "external_cover_url": "https://example.com/cover.png",
+            }
+            return ArticleForm(data={**data, "tags": tags}, user=self.author)
+
+        deduped = form("Go, go ,  Big   Data,,")
+        self.assertTrue(deduped.is_valid(), deduped.errors)
+        self.assertEqual(deduped.cleaned_data["tags"], ["Go", "Big Data"])
+        too_many = form(",".join(f"tag{index}" for index in range(9)))
+        self.assertFalse(too_many.is_valid())
+        self.assertIn("tags", too_many.errors)
+
+
+class PageViewTests(TestCase):
+    BROWSER = "Mozilla/5.0 (X11; Linux x86_64) Firefox/130.0"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="views-author")
+        category = Category.objects.create(name="Views")
+        cls.article, cls.draft = (
+            Article.objects.create(
+                title=title,
+                author=cls.author,
+                category=category,
+                content="Body",
+                status=status,
+            )
+            for title, status in (
+                ("Viewed", Article.STATUS_PUBLISHED),
+                ("Unviewed draft", Article.STATUS_DRAFT),
+            )
+        )
+
+    def setUp(self):
+        cold_caches()
+
+    def view(self, article=None, ip="10.1.0.1", agent=BROWSER, **headers):
+        url = reverse("articles:article_detail", args=[(article or self.article).slug])
+        return self.client.get(url, REMOTE_ADDR=ip, HTTP_USER_AGENT=agent, **headers)
+
+    def views(self, article=None):
+        article = Article.objects.get(pk=(article or self.article).pk)
+        daily = ArticleDailyViews.objects.filter(article=article).values_list("views", flat=True)
+        return article.view_count, sum(daily)
+
+    def test_views_are_deduplicated_per_viewer(self):
+        first = self.view()
+        self.view()
+        self.view(ip="10.1.0.2", agent="Googlebot/2.1")
+        self.view(ip="10.1.0.3", agent="")
+        self.client.force_login(self.author)
+        self.view(self.draft)
+        pageviews.flush_views()
+        self.assertEqual(self.views(), (1, 1))
+        self.assertEqual(self.views(self.draft), (0, 0))
+        self.assertEqual(first.status_code, 200)
+
+    def test_revalidations_count_as_views(self):
+        etag = self.view()["ETag"]
+        revalidated = self.view(ip="10.1.0.9", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+        pageviews.flush_views()
+        self.assertEqual(self.views(), (2, 2))
+
+    def test_buffered_views_flush_on_a_timer(self):
+        flushed = threading.Event()
+        written = []
+
+        def write(views):
+            written.append(dict(views))
+            flushed.set()
+
+        with mock.patch.object(pageviews, "VIEW_FLUSH_SECONDS", 0.05), mock.patch.object(
+            pageviews, "_write", write
+        ):
+            pageviews.flush_views()
+            self.view()
+            self.assertTrue(flushed.wait(5))
+        self.assertEqual(written, [{(self.article.pk, timezone.localdate()): 1}])
+        self.assertIsNone(pageviews._buffer["timer"])
+
+
+class CardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username="card-author")
+        cls.category = Category.objects.create(name="Cards")
+        cls.article = Article.objects.create(
+            title="Carded",
+            author=cls.author,
+            category=cls.category,
+            content="Body",
+            status=Article.STATUS_PUBLISHED,
+        )
+
+    def setUp(self):
+        cold_caches()
+
+    def card(self):
+        url = reverse("articles:category_detail", args=[self.category.slug])
+        html = self.client.get(url).content.decode()
+        start = html.index('data-article-stats="carded"')
+        return html[start : html.index("</div>", start)]
+
+    def like(self, username):
+        return ArticleReaction.objects.create(
+            article=self.article,
+            user=User.objects.create(username=username),
+            value=ArticleReaction.VALUE_LIKE,
+        )
+
+    def test_cards_are_cached_until_engagement_changes(self):
+        self.assertIn("<strong>0</strong> upvotes", self.card())
+        article = Article.objects.get(pk=self.article.pk)
+        self.assertTrue(cache.get(card_cache_key(article, show_category=False)))
+        self.like("card-fan")
+        self.assertIn("<strong>1</strong> upvotes", self.card())
+
+    def test_queryset_and_cascade_deletes_expire_cards(self):
+        reaction = self.like("card-fan")
+        self.like("card-other-fan")
+        self.assertIn("<strong>2</strong> upvotes", self.card())
+        ArticleReaction.objects.filter(pk=reaction.pk).delete()
+        self.assertIn("<strong>1</strong> upvotes", self.card())
+        User.objects.filter(username="card-other-fan").delete()
+        self.assertIn("<strong>0</strong> upvotes", self.card())
+
+    def test_each_delete_marks_an_article_once(self):
+        comment = ArticleComment.objects.create(article=self.article, user=self.author, body="Hi")
+        for index in range(3):
+            ArticleComment.objects.create(
+                article=self.article, user=self.author, body=f"Re {index}", parent=comment
+            )
+        with mock.patch.object(Article, "mark_engaged") as mark_engaged:
+            comment.delete()
+        mark_engaged.assert_called_once_with(self.article.pk)
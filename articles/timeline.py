@@ -0,0 +1,101 @@
+import heapq
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Q
+
+from .models import Article, AuthorStats, Follow, TimelineEntry
+
+FANOUT_MAX_FOLLOWERS = 10000
+TIMELINE_BATCH_SIZE = 1000
+TIMELINE_PAGE_SIZE = 10
+
+
+def sync_timeline(article_id) -> int:
+    TimelineEntry.objects.filter(article_id=article_id).delete()
+    article = (
+        Article.published.filter(pk=article_id)
+        .values("author_id", "published_at")
+        .first()
+    )
+    if article is None:
+        return 0
+    follower_count = (
+        AuthorStats.objects.filter(author_id=article["author_id"])
+        .values_list("follower_count", flat=True)
+        .first()
+    )
+    if (follower_count or 0) > FANOUT_MAX_FOLLOWERS:
+        return 0
+    followers = (
+        Follow.objects.filter(author_id=article["author_id"])
+        .order_by()
+        .values_list("follower_id", flat=True)
+        .iterator(chunk_size=TIMELINE_BATCH_SIZE)
+    )
+    written = 0
+    batch = []
+    for follower_id in followers:
+        batch.append(
+            TimelineEntry(
+                owner_id=follower_id,
+                article_id=article_id,
+                author_id=article["author_id"],
+                published_at=article["published_at"],
+            )
+        )
+        if len(batch) >= TIMELINE_BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+    return written
+
+
+def encode_cursor(published_at, article_id) -> str:
+    return f"{int(published_at.timestamp() * 1_000_000)}-{article_id}"
+
+
+def decode_cursor(cursor):
+    try:
+        stamp, article_id = cursor.split("-")
+        published_at = datetime.fromtimestamp(int(stamp) / 1_000_000, tz=dt_timezone.utc)
+        return published_at, int(article_id)
+    except (AttributeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def _before(cursor, published_field, id_field):
+    if cursor is None:
+        return Q()
+    published_at, article_id = cursor
+    return Q(**{f"{published_field}__lt": published_at}) | Q(
+        **{published_field: published_at, f"{id_field}__lt": article_id}
+    )
+
+
+def timeline_page(user, cursor=None, size=TIMELINE_PAGE_SIZE):
+    cursor = decode_cursor(cursor) if cursor else None
+    entries = list(
+        TimelineEntry.objects.filter(owner=user)
+        .filter(_before(cursor, "published_at", "article_id"))
+        .order_by("-published_at", "-article_id")
+        .values_list("published_at", "article_id")[: size + 1]
+    )
+    large_authors = list(
+        Follow.objects.filter(
+            follower=user, author__author_stats__follower_count__gt=FANOUT_MAX_FOLLOWERS
+        ).values_list("author_id", flat=True)
+    )
+    if large_authors:
+        pulled = (
+            Article.published.filter(author_id__in=large_authors)
+            .filter(_before(cursor, "published_at", "pk"))
+            .order_by("-published_at", "-pk")
+            .values_list("published_at", "pk")[: size + 1]
+        )
+        entries = heapq.nlargest(size + 1, set(entries) | set(pulled))
+    page = entries[:size]
+    next_cursor = encode_cursor(*page[-1]) if len(entries) > size else None
+    return [article_id for _, article_id in page], next_cursor
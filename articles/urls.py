@@ -1,22 +1,55 @@
 from django.urls import path
 
+from .api import (
+    ApiIndexView,
+    ArticleApiDetailView,
+    ArticleApiListView,
+    AuthorApiDetailView,
+    AuthorApiListView,
+    CategoryApiDetailView,
+    CategoryApiListView,
+    EngagementApiView,
+)
+from .feeds import (
+    AuthorArticlesAtomFeed,
+    AuthorArticlesFeed,
+    CategoryArticlesAtomFeed,
+    CategoryArticlesFeed,
+    LatestArticlesAtomFeed,
+    LatestArticlesFeed,
+)
+from .sitemaps import (
+    ArticleSitemapView,
+    AuthorSitemapView,
+    SectionSitemapView,
+    SitemapIndexView,
+)
 from .views import (
+    ArticleBulkModerateView,
     ArticleCreateView,
     ArticleDeleteView,
     ArticleDetailView,
+    ArticleLiveStreamView,
     ArticleListView,
     ArticleModerateView,
     ArticleUpdateView,
     AuthorDetailView,
     AuthorListView,
+    MostReadArticleListView,
     BookmarkListView,
     CategoryArticleListView,
     CategoryListView,
+    ContentExportView,
+    FollowingFeedView,
+    NotificationListView,
     PendingArticleListView,
     PopularArticleListView,
+    TagArticleListView,
+    TagListView,
     ArticleCommentCreateView,
     ArticleCommentDeleteView,
     ToggleBookmarkView,
+    ToggleFollowView,
     ToggleReactionView,
 )
 
@@ -24,18 +57,96 @@ app_name = "articles"
 
 urlpatterns = [
     path("", ArticleListView.as_view(), name="article_list"),
+    path("sitemap.xml", SitemapIndexView.as_view(), name="sitemap_index"),
+    path(
+        "sitemap-sections.xml",
+        SectionSitemapView.as_view(),
+        name="sitemap_sections",
+    ),
+    path(
+        "sitemap-articles-<int:shard>.xml",
+        ArticleSitemapView.as_view(),
+        name="sitemap_articles",
+    ),
+    path(
+        "sitemap-authors-<int:shard>.xml",
+        AuthorSitemapView.as_view(),
+        name="sitemap_authors",
+    ),
+    path("api/v1/", ApiIndexView.as_view(), name="api_index"),
+    path("api/v1/articles/", ArticleApiListView.as_view(), name="api_articles"),
+    path(
+        "api/v1/articles/<slug:slug>/",
+        ArticleApiDetailView.as_view(),
+        name="api_article_detail",
+    ),
+    path("api/v1/categories/", CategoryApiListView.as_view(), name="api_categories"),
+    path(
+        "api/v1/categories/<slug:slug>/",
+        CategoryApiDetailView.as_view(),
+        name="api_category_detail",
+    ),
+    path("api/v1/engagement/", EngagementApiView.as_view(), name="api_engagement"),
+    path("api/v1/authors/", AuthorApiListView.as_view(), name="api_authors"),
+    path(
+        "api/v1/authors/<str:username>/",
+        AuthorApiDetailView.as_view(),
+        name="api_author_detail",
+    ),
+    path("feed/", LatestArticlesFeed(), name="feed_rss"),
+    path("feed/atom/", LatestArticlesAtomFeed(), name="feed_atom"),
     path("popular/", PopularArticleListView.as_view(), name="popular_list"),
+    path("popular/most-read/", MostReadArticleListView.as_view(), name="most_read_list"),
     path("categories/", CategoryListView.as_view(), name="category_list"),
     path(
         "categories/<slug:slug>/",
         CategoryArticleListView.as_view(),
         name="category_detail",
     ),
+    path(
+        "categories/<slug:slug>/feed/",
+        CategoryArticlesFeed(),
+        name="category_feed_rss",
+    ),
+    path(
+        "categories/<slug:slug>/feed/atom/",
+        CategoryArticlesAtomFeed(),
+        name="category_feed_atom",
+    ),
+    path("tags/", TagListView.as_view(), name="tag_list"),
+    path("tags/<slug:slug>/", TagArticleListView.as_view(), name="tag_detail"),
     path("authors/", AuthorListView.as_view(), name="author_list"),
     path("authors/<str:username>/", AuthorDetailView.as_view(), name="author_detail"),
+    path(
+        "authors/<str:username>/follow/",
+        ToggleFollowView.as_view(),
+        name="toggle_follow",
+    ),
+    path(
+        "authors/<str:username>/feed/",
+        AuthorArticlesFeed(),
+        name="author_feed_rss",
+    ),
+    path(
+        "authors/<str:username>/feed/atom/",
+        AuthorArticlesAtomFeed(),
+        name="author_feed_atom",
+    ),
     path("bookmarks/", BookmarkListView.as_view(), name="bookmark_list"),
     path("create/", ArticleCreateView.as_view(), name="article_create"),
+    path("following/", FollowingFeedView.as_view(), name="following_feed"),
+    path(
+        "notifications/",
+        NotificationListView.as_view(),
+        name="notification_list",
+    ),
     path("moderation/", PendingArticleListView.as_view(), name="moderation_queue"),
+    path(
+        "moderation/bulk/",
+        ArticleBulkModerateView.as_view(),
+        name="moderation_bulk",
+    ),
+    path("moderation/export/", ContentExportView.as_view(), name="content_export"),
     path(
         "moderation/<slug:slug>/<str:action>/",
         ArticleModerateView.as_view(),
@@ -49,6 +160,7 @@ urlpatterns = [
         ToggleReactionView.as_view(),
         name="toggle_reaction",
     ),
+    path("<slug:slug>/live/", ArticleLiveStreamView.as_view(), name="article_live"),
     path("<slug:slug>/comment/", ArticleCommentCreateView.as_view(), name="comment_create"),
     path("<slug:slug>/comment/<int:pk>/delete/", ArticleCommentDeleteView.as_view(), name="comment_delete"),
     path("<slug:slug>/", ArticleDetailView.as_view(), name="article_detail"),
@@ -3,27 +3,88 @@ from datetime import timedelta
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Avg, Count, F, Max, Q, Sum
-from django.http import Http404, HttpResponseRedirect, JsonResponse
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import (
+    Avg,
+    Count,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+)
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponsePermanentRedirect,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views import View
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
+    TemplateView,
     UpdateView,
 )
 
 from accounts.mixins import RoleRequiredMixin
+from accounts.throttling import ThrottleMixin
+from .conditional import (
+    article_validators,
+    author_feed_validators,
+    category_feed_validators,
+    conditional_page,
+    feed_validators,
+    most_read_validators,
+    tag_feed_validators,
+)
+from .exports import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    export_chunks,
+    export_lines,
+    parse_since,
+)
 from .forms import ArticleForm, CommentForm
-from .models import Article, ArticleComment, ArticleReaction, Bookmark, Category
+from .live import publish_comment, publish_stats
+from .models import (
+    Article,
+    ArticleComment,
+    ArticleDailyViews,
+    ArticleReaction,
+    ArticleSlugHistory,
+    AuthorStats,
+    Bookmark,
+    Category,
+    Follow,
+    Notification,
+    RelatedArticle,
+    Tag,
+)
+from .notifications import mark_read, notify_comment, notify_moderation
+from .pageviews import MOST_READ_WINDOW_DAYS, counts_views
+from .related import RELATED_TOP_K
+from .rollups import category_activity, sparkline_points, tag_cloud_levels
+from .timeline import timeline_page
 
 User = get_user_model()
 
 
+@method_decorator(conditional_page(feed_validators), name="dispatch")
 class ArticleListView(ListView):
     model = Article
     template_name = "articles/article_list.html"
@@ -33,36 +94,23 @@ class ArticleListView(ListView):
     def get_queryset(self):
         return (
             Article.published.select_related("author", "category")
-            .annotate(
-                total_likes=Count(
-                    "reactions",
-                    filter=Q(reactions__value=ArticleReaction.VALUE_LIKE),
-                    distinct=True,
-                ),
-                total_dislikes=Count(
-                    "reactions",
-                    filter=Q(reactions__value=ArticleReaction.VALUE_DISLIKE),
-                    distinct=True,
-                ),
-                comment_count=Count("comments", distinct=True),
-            )
-            .annotate(net_score=F("total_likes") - F("total_dislikes"))
-            .order_by("-published_at", "-created_at")
+            .with_engagement()
+            .order_by("-published_at", "-pk")
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context["page_hero"] = self.get_page_hero(context)
+        return context
+
+    def get_page_hero(self, context):
         now = timezone.now()
-        total_articles = Article.published.count()
+        total_articles = context["paginator"].count
         new_week = Article.published.filter(
             published_at__gte=now - timedelta(days=7)
         ).count()
-        active_authors = (
-            User.objects.filter(articles__status=Article.STATUS_PUBLISHED)
-            .distinct()
-            .count()
-        )
-        context["page_hero"] = {
+        active_authors = AuthorStats.objects.filter(published_count__gt=0).count()
+        return {
             "tag": "Cetix spotlight",
             "title": "Fresh drops for engineers & builders",
             "description": (
@@ -83,7 +131,6 @@ class ArticleListView(ListView):
                 {"label": "new this week", "value": new_week or 0},
             ],
         }
-        return context
 
 
 class PopularArticleListView(ArticleListView):
@@ -96,8 +143,7 @@ class PopularArticleListView(ArticleListView):
             .filter(net_score__gte=5)
         )
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    def get_page_hero(self, context):
         qs = self.object_list
         score_expr = F("total_likes") - F("total_dislikes")
         aggregates = qs.aggregate(
@@ -110,7 +156,7 @@ class PopularArticleListView(ArticleListView):
             .order_by("-count")
             .first()
         )
-        context["page_hero"] = {
+        return {
             "tag": "Popular right now",
             "title": "Community endorsed knowledge",
             "description": (
@@ -138,9 +184,60 @@ class PopularArticleListView(ArticleListView):
                 },
             ],
         }
-        return context
 
 
+@method_decorator(conditional_page(most_read_validators), name="dispatch")
+class MostReadArticleListView(ArticleListView):
+    template_name = "articles/most_read_list.html"
+
+    def get_queryset(self):
+        self.recent_views = ArticleDailyViews.objects.filter(
+            date__gt=timezone.localdate() - timedelta(days=MOST_READ_WINDOW_DAYS)
+        )
+        return (
+            super()
+            .get_queryset()
+            .filter(pk__in=self.recent_views.values("article"))
+            .annotate(
+                recent_views=Subquery(
+                    self.recent_views.filter(article=OuterRef("pk"))
+                    .order_by()
+                    .values("article")
+                    .annotate(total=Sum("views"))
+                    .values("total")
+                )
+            )
+            .order_by("-recent_views", "-published_at")
+        )
+
+    def get_page_hero(self, context):
+        totals = self.recent_views.filter(
+            article__status=Article.STATUS_PUBLISHED
+        ).aggregate(reads=Sum("views"), articles=Count("article", distinct=True))
+        return {
+            "tag": "Most read",
+            "title": "What the community is actually reading",
+            "description": (
+                f"Ranked by distinct reads over the last {MOST_READ_WINDOW_DAYS} days, "
+                "not votes. Crawlers and repeat visits are not counted."
+            ),
+            "primary": {
+                "label": "Submit your draft",
+                "url": reverse("articles:article_create"),
+            },
+            "secondary": {
+                "label": "Top voted",
+                "url": reverse("articles:popular_list"),
+            },
+            "stats": [
+                {"label": "reads this week", "value": totals["reads"] or 0},
+                {"label": "articles read", "value": totals["articles"] or 0},
+            ],
+        }
+
+
+@method_decorator(counts_views, name="dispatch")
+@method_decorator(conditional_page(article_validators), name="dispatch")
 class ArticleDetailView(DetailView):
     model = Article
     template_name = "articles/article_detail.html"
@@ -153,16 +250,30 @@ class ArticleDetailView(DetailView):
             Article.objects.select_related(
                 "author", "category", "last_moderated_by"
             )
-            .prefetch_related(
-                "reactions",
-                "bookmarks",
-                "comments",
-                "comments__user",
-                "comments__replies",
-                "comments__replies__user",
-            )
+            .with_engagement()
+            .prefetch_related("tags")
         )
 
+    def get(self, request, *args, **kwargs):
+        try:
+            response = super().get(request, *args, **kwargs)
+        except Http404:
+            current_slug = (
+                ArticleSlugHistory.objects.filter(
+                    slug=kwargs["slug"], article__status=Article.STATUS_PUBLISHED
+                )
+                .values_list("article__slug", flat=True)
+                .first()
+            )
+            if current_slug is None:
+                raise
+            return HttpResponsePermanentRedirect(
+                reverse("articles:article_detail", args=[current_slug])
+            )
+        if self.object.status == Article.STATUS_PUBLISHED:
+            request.viewed_article_id = self.object.pk
+        return response
+
     def get_object(self, queryset=None):
         article = super().get_object(queryset)
         user = self.request.user
@@ -183,7 +294,9 @@ class ArticleDetailView(DetailView):
         top_level_comments = (
             article.comments.filter(parent__isnull=True)
             .select_related("user")
-            .prefetch_related("replies__user")
+            .prefetch_related(
+                Prefetch("replies", queryset=ArticleComment.objects.select_related("user"))
+            )
         )
         for comment in top_level_comments:
             comment.can_delete_user = comment.can_delete(user)
@@ -199,7 +312,15 @@ class ArticleDetailView(DetailView):
                 "can_edit": article.can_edit(user),
                 "comment_form": CommentForm(),
                 "top_level_comments": top_level_comments,
-                "comments_count": article.comments.count(),
+                "comments_count": article.comments_count,
+                "related_articles": [
+                    link.related
+                    for link in RelatedArticle.objects.filter(
+                        article=article, related__status=Article.STATUS_PUBLISHED
+                    )
+                    .select_related("related__author", "related__category")
+                    .order_by("rank")[:RELATED_TOP_K]
+                ],
             }
         )
         return context
@@ -290,33 +411,62 @@ class ArticleDeleteView(ArticleAuthorMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
+MODERATION_ACTIONS = {
+    "publish": Article.STATUS_PUBLISHED,
+    "reject": Article.STATUS_REJECTED,
+}
+
+
+def moderation_redirect(request):
+    next_url = request.POST.get("next")
+    if next_url and url_has_allowed_host_and_scheme(
+        next_url,
+        allowed_hosts={request.get_host()},
+        require_https=request.is_secure(),
+    ):
+        return HttpResponseRedirect(next_url)
+    return HttpResponseRedirect(reverse("articles:moderation_queue"))
+
+
 class PendingArticleListView(RoleRequiredMixin, ListView):
     model = Article
     template_name = "articles/moderation_queue.html"
     context_object_name = "articles"
     allowed_roles = ("is_admin",)
+    paginate_by = 25
 
     def get_queryset(self):
-        return (
+        self.category_filter = self.request.GET.get("category", "").strip()
+        self.author_filter = self.request.GET.get("author", "").strip()
+        queryset = (
             Article.objects.filter(status=Article.STATUS_PENDING)
             .select_related("author", "category")
-            .order_by("created_at")
+            .order_by("created_at", "pk")
         )
+        if self.category_filter:
+            queryset = queryset.filter(category__slug=self.category_filter)
+        if self.author_filter:
+            queryset = queryset.filter(author__username=self.author_filter)
+        return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        qs = context["articles"]
-        pending_count = qs.count()
-        oldest = qs.first()
+        stats = Article.objects.filter(status=Article.STATUS_PENDING).aggregate(
+            pending_count=Count("pk"),
+            oldest=Min("created_at"),
+        )
         oldest_age = (
-            (timezone.now() - oldest.created_at).days if oldest else 0
+            (timezone.now() - stats["oldest"]).days if stats["oldest"] else 0
         )
+        context["categories"] = Category.objects.only("name", "slug")
+        context["category_filter"] = self.category_filter
+        context["author_filter"] = self.author_filter
         context["page_hero"] = {
             "tag": "Moderation desk",
             "title": "Review the latest submissions",
             "description": "Approve the strongest write-ups, send feedback, and keep the feed trustworthy.",
             "stats": [
-                {"label": "pending items", "value": pending_count},
+                {"label": "pending items", "value": stats["pending_count"]},
                 {"label": "oldest in queue (days)", "value": oldest_age},
                 {
                     "label": "recent approver",
@@ -332,21 +482,74 @@ class ArticleModerateView(RoleRequiredMixin, View):
 
     def post(self, request, slug, action):
         article = get_object_or_404(Article, slug=slug)
-        if action not in {"publish", "reject"}:
+        if action not in MODERATION_ACTIONS:
             raise Http404("Unknown moderation action.")
+        article.status = MODERATION_ACTIONS[action]
+        article.last_moderated_by = request.user
+        article.last_moderated_at = timezone.now()
+        article.save()
+        notify_moderation([article], request.user)
         if action == "publish":
-            article.status = Article.STATUS_PUBLISHED
-            article.last_moderated_by = request.user
-            article.last_moderated_at = timezone.now()
-            article.save()
             messages.success(request, f"Published '{article.title}'.")
         else:
-            article.status = Article.STATUS_REJECTED
-            article.last_moderated_by = request.user
-            article.last_moderated_at = timezone.now()
-            article.save()
             messages.warning(request, f"Rejected '{article.title}'.")
-        return HttpResponseRedirect(reverse("articles:moderation_queue"))
+        return moderation_redirect(request)
+
+
+class ContentExportView(RoleRequiredMixin, View):
+    allowed_roles = ("is_admin",)
+
+    def get(self, request):
+        dataset = request.GET.get("dataset", "articles")
+        fmt = request.GET.get("format", "ndjson")
+        if dataset not in EXPORT_DATASETS or fmt not in EXPORT_FORMATS:
+            raise Http404("Unknown export.")
+        try:
+            since = parse_since(request.GET.get("since"))
+        except ValueError:
+            raise Http404("Invalid since value.")
+        compress = request.GET.get("gzip") == "1"
+
+        extension = "jsonl" if fmt == "ndjson" else fmt
+        filename = f"{dataset}.{extension}" + (".gz" if compress else "")
+        response = StreamingHttpResponse(
+            export_chunks(export_lines(dataset, fmt, since), compress=compress),
+            content_type="application/gzip" if compress else EXPORT_CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class ArticleBulkModerateView(RoleRequiredMixin, View):
+    allowed_roles = ("is_admin",)
+
+    def post(self, request):
+        action = request.POST.get("action")
+        if action not in MODERATION_ACTIONS:
+            raise Http404("Unknown moderation action.")
+        article_ids = {
+            int(value) for value in request.POST.getlist("articles") if value.isdigit()
+        }
+        if not article_ids:
+            messages.info(request, "Select at least one article to moderate.")
+            return moderation_redirect(request)
+        with transaction.atomic():
+            pending = Article.objects.filter(
+                pk__in=article_ids, status=Article.STATUS_PENDING
+            )
+            targets = list(pending.only("pk", "author_id"))
+            updated = pending.filter(
+                pk__in=[article.pk for article in targets]
+            ).moderate(MODERATION_ACTIONS[action], request.user)
+            for article in targets:
+                article.status = MODERATION_ACTIONS[action]
+            notify_moderation(targets, request.user)
+        if action == "publish":
+            messages.success(request, f"Published {updated} article(s).")
+        else:
+            messages.warning(request, f"Rejected {updated} article(s).")
+        return moderation_redirect(request)
 
 
 class CategoryListView(ListView):
@@ -355,15 +558,7 @@ class CategoryListView(ListView):
     context_object_name = "categories"
 
     def get_queryset(self):
-        return (
-            Category.objects.annotate(
-                published_count=Count(
-                    "articles",
-                    filter=Q(articles__status=Article.STATUS_PUBLISHED),
-                )
-            )
-            .order_by("name")
-        )
+        return Category.objects.with_published_count().order_by("name")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -397,6 +592,7 @@ class CategoryListView(ListView):
         return context
 
 
+@method_decorator(conditional_page(category_feed_validators), name="dispatch")
 class CategoryArticleListView(ListView):
     model = Article
     template_name = "articles/category_detail.html"
@@ -408,34 +604,28 @@ class CategoryArticleListView(ListView):
         return (
             Article.published.filter(category=self.category)
             .select_related("author", "category")
-            .annotate(
-                total_likes=Count(
-                    "reactions",
-                    filter=Q(reactions__value=ArticleReaction.VALUE_LIKE),
-                ),
-                total_dislikes=Count(
-                    "reactions",
-                    filter=Q(reactions__value=ArticleReaction.VALUE_DISLIKE),
-                ),
-                comment_count=Count("comments", distinct=True),
-            )
-            .annotate(net_score=F("total_likes") - F("total_dislikes"))
+            .with_engagement()
+            .order_by("-published_at", "-pk")
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         qs = self.object_list
         score_expr = F("total_likes") - F("total_dislikes")
+        # One pass over the category's feed index; a separate distinct count
+        # of authors walks every published article by author instead.
         aggregates = qs.aggregate(
             top_score=Max(score_expr),
             avg_score=Avg(score_expr),
+            contributors=Count("author", distinct=True),
         )
-        contributors = (
-            qs.values("author")
-            .distinct()
-            .count()
-        )
+        contributors = aggregates["contributors"]
+        activity = category_activity(self.category)
         context["category"] = self.category
+        context["activity"] = activity
+        context["activity_points"] = sparkline_points(
+            [day["value"] for day in activity]
+        )
         context["page_hero"] = {
             "tag": self.category.name,
             "title": f"{self.category.name} knowledge base",
@@ -450,7 +640,7 @@ class CategoryArticleListView(ListView):
                 "url": reverse("articles:category_list"),
             },
             "stats": [
-                {"label": "articles", "value": qs.count()},
+                {"label": "articles", "value": context["paginator"].count},
                 {"label": "active authors", "value": contributors},
                 {
                     "label": "avg score",
@@ -463,30 +653,123 @@ class CategoryArticleListView(ListView):
         return context
 
 
+AUTHOR_SORTS = {
+    "name": ("Name", ("author__username",)),
+    "published": ("Most published", ("-published_count", "author_id")),
+    "score": ("Top score", ("-total_score", "author_id")),
+    "average": ("Best average", ("-avg_score", "author_id")),
+    "recent": ("Recently active", ("-last_published_at", "author_id")),
+}
+
+
+class TagListView(ListView):
+    model = Tag
+    template_name = "articles/tag_list.html"
+    context_object_name = "tags"
+    paginate_by = 100
+
+    def get_queryset(self):
+        return Tag.objects.filter(published_count__gt=0).order_by(
+            "-published_count", "name"
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        tags = context["tags"] = list(context["tags"])
+        levels = tag_cloud_levels(tags)
+        for tag in tags:
+            tag.level = levels[tag.pk]
+        context["page_hero"] = {
+            "tag": "Explore by tag",
+            "title": "Every thread readers are pulling on",
+            "description": "Tags are added by authors, so they go deeper than the categories.",
+            "primary": {
+                "label": "Write and tag a post",
+                "url": reverse("articles:article_create"),
+            },
+            "secondary": {
+                "label": "All categories",
+                "url": reverse("articles:category_list"),
+            },
+            "stats": [
+                {"label": "tags in use", "value": context["paginator"].count},
+                {
+                    "label": "most used",
+                    "value": tags[0].name if tags else "-",
+                },
+            ],
+        }
+        return context
+
+
+@method_decorator(conditional_page(tag_feed_validators), name="dispatch")
+class TagArticleListView(ListView):
+    model = Article
+    template_name = "articles/tag_detail.html"
+    context_object_name = "articles"
+    paginate_by = 10
+
+    def get_queryset(self):
+        self.tag = get_object_or_404(Tag, slug=self.kwargs["slug"])
+        return (
+            Article.published.filter(article_tags__tag=self.tag)
+            .select_related("author", "category")
+            .with_engagement()
+            .order_by("-article_tags__published_at", "-pk")
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["tag"] = self.tag
+        context["page_hero"] = {
+            "tag": f"#{self.tag.slug}",
+            "title": f"Articles tagged {self.tag.name}",
+            "description": "Everything the community has published under this tag, newest first.",
+            "primary": {
+                "label": "Write about this",
+                "url": reverse("articles:article_create"),
+            },
+            "secondary": {
+                "label": "All tags",
+                "url": reverse("articles:tag_list"),
+            },
+            "stats": [
+                {"label": "articles", "value": self.tag.published_count},
+            ],
+        }
+        return context
+
+
 class AuthorListView(ListView):
-    model = User
+    model = AuthorStats
     template_name = "articles/author_list.html"
     context_object_name = "authors"
+    paginate_by = 24
+
+    def get_sort(self):
+        sort = self.request.GET.get("sort", "name")
+        return sort if sort in AUTHOR_SORTS else "name"
 
     def get_queryset(self):
         return (
-            User.objects.filter(articles__status=Article.STATUS_PUBLISHED)
-            .annotate(
-                published_count=Count(
-                    "articles",
-                    filter=Q(articles__status=Article.STATUS_PUBLISHED),
-                )
-            )
-            .distinct()
-            .order_by("username")
+            AuthorStats.objects.filter(published_count__gt=0)
+            .select_related("author")
+            .order_by(*AUTHOR_SORTS[self.get_sort()][1])
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        qs = self.object_list
-        total_authors = qs.count()
-        total_articles = sum(author.published_count for author in qs)
-        top_author = max(qs, key=lambda author: author.published_count, default=None)
+        active = AuthorStats.objects.filter(published_count__gt=0)
+        totals = active.aggregate(total_articles=Sum("published_count"))
+        top_author = (
+            active.order_by(*AUTHOR_SORTS["published"][1])
+            .values_list("author__username", flat=True)
+            .first()
+        )
+        context["sort"] = self.get_sort()
+        context["sort_options"] = [
+            (key, label) for key, (label, _) in AUTHOR_SORTS.items()
+        ]
         context["page_hero"] = {
             "tag": "Meet the writers",
             "title": "Authors shipping knowledge in public",
@@ -500,76 +783,114 @@ class AuthorListView(ListView):
                 "url": reverse("articles:article_list"),
             },
             "stats": [
-                {"label": "active authors", "value": total_authors or 0},
-                {"label": "published pieces", "value": total_articles or 0},
+                {"label": "active authors", "value": context["paginator"].count},
+                {
+                    "label": "published pieces",
+                    "value": totals["total_articles"] or 0,
+                },
                 {
                     "label": "top contributor",
-                    "value": top_author.username if top_author else "-",
+                    "value": top_author or "-",
                 },
             ],
         }
         return context
 
 
+@method_decorator(conditional_page(author_feed_validators), name="dispatch")
 class AuthorDetailView(DetailView):
     model = User
     template_name = "articles/author_detail.html"
     slug_field = "username"
     slug_url_kwarg = "username"
     context_object_name = "author"
+    paginate_by = 10
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         articles_qs = (
             self.object.articles.filter(status=Article.STATUS_PUBLISHED)
             .select_related("category")
-            .annotate(
-                total_likes=Count(
-                    "reactions",
-                    filter=Q(reactions__value=ArticleReaction.VALUE_LIKE),
-                    distinct=True,
-                ),
-                total_dislikes=Count(
-                    "reactions",
-                    filter=Q(reactions__value=ArticleReaction.VALUE_DISLIKE),
-                    distinct=True,
-                ),
-                comment_count=Count("comments", distinct=True),
-            )
-            .annotate(net_score=F("total_likes") - F("total_dislikes"))
+            .with_engagement()
+            .order_by("-published_at", "-pk")
         )
-        context["articles"] = articles_qs
-        score_expr = F("total_likes") - F("total_dislikes")
-        aggregates = articles_qs.aggregate(
-            total_score=Sum(score_expr),
-            avg_score=Avg(score_expr),
+        stats = AuthorStats.objects.filter(author=self.object).first() or AuthorStats(
+            author=self.object
+        )
+        is_following = (
+            self.request.user.is_authenticated
+            and Follow.objects.filter(
+                follower=self.request.user, author=self.object
+            ).exists()
+        )
+        paginator = Paginator(articles_qs, self.paginate_by)
+        if stats.pk:
+            paginator.count = stats.published_count
+        page_obj = paginator.get_page(self.request.GET.get("page"))
+        context.update(
+            {
+                "articles": page_obj.object_list,
+                "page_obj": page_obj,
+                "paginator": paginator,
+                "is_paginated": page_obj.has_other_pages(),
+                "author_stats": stats,
+            }
         )
         context["page_hero"] = {
             "tag": f"u/{self.object.username}",
             "title": f"{self.object.get_full_name() or self.object.username}'s publishing log",
             "description": self.object.bio or "Deep dives, experiments, and lessons shared straight from the author.",
             "primary": {
-                "label": "Follow their articles",
-                "url": reverse("articles:author_list"),
+                "label": "Following" if is_following else "Follow their articles",
+                "url": "#follow",
             },
             "secondary": {
                 "label": "View latest",
                 "url": reverse("articles:article_list"),
             },
             "stats": [
-                {"label": "published", "value": articles_qs.count()},
+                {"label": "published", "value": stats.published_count},
                 {
                     "label": "total score",
-                    "value": aggregates["total_score"] or 0,
+                    "value": stats.total_score,
                 },
                 {
                     "label": "avg score",
-                    "value": round(aggregates["avg_score"], 1)
-                    if aggregates["avg_score"] is not None
-                    else 0,
+                    "value": round(stats.avg_score, 1),
                 },
+                {"label": "followers", "value": stats.follower_count},
             ],
         }
+        context["is_following"] = is_following
+        return context
+
+
+class NotificationListView(LoginRequiredMixin, ListView):
+    template_name = "articles/notification_list.html"
+    context_object_name = "notifications"
+    paginate_by = 20
+
+    def get_queryset(self):
+        return Notification.objects.filter(recipient=self.request.user).select_related(
+            "article", "actor"
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        unread_count = self.request.user.unread_notification_count
+        context["page_hero"] = {
+            "tag": "Inbox",
+            "title": "Notifications",
+            "description": "Comments, replies, and moderation decisions on your work.",
+            "stats": [
+                {"label": "unread", "value": unread_count},
+                {"label": "total", "value": context["paginator"].count},
+            ],
+        }
+        mark_read(
+            self.request.user,
+            [item for item in context["notifications"] if not item.is_read],
+        )
         return context
 
 
@@ -602,6 +923,12 @@ class BookmarkListView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        for bookmark in context["bookmarks"]:
+            bookmark.article.total_likes = bookmark.total_likes
+            bookmark.article.total_dislikes = bookmark.total_dislikes
+            bookmark.article.net_score = bookmark.total_likes - bookmark.total_dislikes
+            bookmark.article.comment_count = bookmark.comment_count
+        context["bookmarked_articles"] = [bookmark.article for bookmark in context["bookmarks"]]
         qs = self.object_list
         total_saved = qs.count()
         topic_count = (
@@ -651,7 +978,59 @@ class ToggleBookmarkView(LoginRequiredMixin, View):
         return HttpResponseRedirect(article.get_absolute_url())
 
 
-class ToggleReactionView(LoginRequiredMixin, View):
+class ToggleFollowView(LoginRequiredMixin, View):
+    def post(self, request, username):
+        author = get_object_or_404(User, username=username)
+        if author == request.user:
+            raise Http404("You cannot follow yourself.")
+        follow, created = Follow.objects.get_or_create(
+            follower=request.user, author=author
+        )
+        if not created:
+            follow.delete()
+            messages.info(request, f"Unfollowed u/{author.username}.")
+        else:
+            messages.success(
+                request, f"Following u/{author.username}. Their new articles land in your feed."
+            )
+        return HttpResponseRedirect(reverse("articles:author_detail", args=[author.username]))
+
+
+class FollowingFeedView(LoginRequiredMixin, TemplateView):
+    template_name = "articles/following_list.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        article_ids, next_cursor = timeline_page(
+            self.request.user, self.request.GET.get("cursor")
+        )
+        articles = {
+            article.pk: article
+            for article in Article.published.filter(pk__in=article_ids)
+            .select_related("author", "category")
+            .with_engagement()
+        }
+        following_count = Follow.objects.filter(follower=self.request.user).count()
+        context["articles"] = [articles[pk] for pk in article_ids if pk in articles]
+        context["next_cursor"] = next_cursor
+        context["page_hero"] = {
+            "tag": "Following",
+            "title": "Your personal feed",
+            "description": "New articles from the authors you follow, newest first.",
+            "secondary": {
+                "label": "Find authors",
+                "url": reverse("articles:author_list"),
+            },
+            "stats": [
+                {"label": "authors followed", "value": following_count},
+            ],
+        }
+        return context
+
+
+class ToggleReactionView(LoginRequiredMixin, ThrottleMixin, View):
+    throttle_scope = "reactions"
+
     def post(self, request, slug, reaction):
         if reaction not in {ArticleReaction.VALUE_LIKE, ArticleReaction.VALUE_DISLIKE}:
             raise Http404("Unknown reaction.")
@@ -667,6 +1046,7 @@ class ToggleReactionView(LoginRequiredMixin, View):
             else:
                 obj.value = reaction
                 obj.save(update_fields=["value"])
+        publish_stats(article.pk)
         likes = article.likes_count
         dislikes = article.dislikes_count
         score = likes - dislikes
@@ -685,7 +1065,17 @@ class ToggleReactionView(LoginRequiredMixin, View):
         return HttpResponseRedirect(redirect_url)
 
 
-class ArticleCommentCreateView(LoginRequiredMixin, View):
+class ArticleLiveStreamView(View):
+    def get(self, request, slug):
+        get_object_or_404(Article.published, slug=slug)
+        # LiveStreamRouter answers before Django when running under ASGI; a
+        # 204 here tells EventSource (e.g. under runserver) to stop retrying.
+        return HttpResponse(status=204)
+
+
+class ArticleCommentCreateView(LoginRequiredMixin, ThrottleMixin, View):
+    throttle_scope = "comments"
+
     def post(self, request, slug):
         article = get_object_or_404(Article, slug=slug, status=Article.STATUS_PUBLISHED)
         form = CommentForm(request.POST)
@@ -702,6 +1092,8 @@ class ArticleCommentCreateView(LoginRequiredMixin, View):
                 parent=parent,
                 body=form.cleaned_data["body"],
             )
+            notify_comment(new_comment)
+            publish_comment(new_comment)
             redirect_url = f"{article.get_absolute_url()}#comment-{new_comment.pk}"
         else:
             redirect_url = f"{article.get_absolute_url()}#comments"
@@ -715,5 +1107,6 @@ class ArticleCommentDeleteView(LoginRequiredMixin, View):
         if not comment.can_delete(request.user):
             raise Http404("Comment not found.")
         comment.delete()
+        publish_stats(article.pk)
         messages.info(request, "Comment deleted.")
         return HttpResponseRedirect(f"{article.get_absolute_url()}#comments")
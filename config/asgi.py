@@ -8,6 +8,11 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 django_asgi_app = get_asgi_application()
 
+# Imported once the app registry is ready; it loads the article models.
+from articles.live import LiveStreamRouter  # noqa: E402
+
+django_asgi_app = LiveStreamRouter(django_asgi_app)
+
 if settings.DEBUG:
     application = ASGIStaticFilesHandler(django_asgi_app)
 else:
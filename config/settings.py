@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.humanize',
     'accounts',
     'articles',
+    'jobs',
 ]
 
 MIDDLEWARE = [
@@ -104,6 +105,38 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# The dotted path is stored in every session, so it stays the same whether
+# or not users are cached; CACHE_AUTHENTICATED_USERS switches the caching.
+AUTHENTICATION_BACKENDS = ['accounts.backends.CachedModelBackend']
+CACHE_AUTHENTICATED_USERS = False
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cetix',
+    }
+}
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+    # Bans, role changes and logouts invalidate cached users and sessions
+    # through the cache itself, so both are only cached when every worker
+    # shares it.
+    CACHE_AUTHENTICATED_USERS = True
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Header the reverse proxy appends the client address to, e.g.
+# HTTP_X_FORWARDED_FOR; unset when requests reach Django directly.
+CLIENT_IP_HEADER = os.environ.get('CLIENT_IP_HEADER', '')
+
+THROTTLE_RATES = {
+    'reactions': {'user': '60/min', 'ip': '120/min'},
+    'comments': {'user': '10/min', 'ip': '30/min'},
+    'password_reset': {'ip': '5/hour', 'email': '3/hour'},
+}
+
 LOGIN_REDIRECT_URL = 'articles:article_list'
 LOGOUT_REDIRECT_URL = 'articles:article_list'
 LOGIN_URL = 'login'
@@ -0,0 +1,79 @@
+import multiprocessing
+import signal
+import sys
+
+from django.core.management.base import BaseCommand, OutputWrapper
+from django.db import connections
+
+
+def _worker_main(worker_id, options):
+    import django
+
+    django.setup()
+    from jobs.queue import work
+
+    stdout = OutputWrapper(sys.stdout)
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+
+    def report(job, succeeded):
+        stdout.write(f"[worker {worker_id}] {job.name} #{job.pk} {'done' if succeeded else 'failed'}")
+        stdout.flush()
+
+    work(
+        should_stop=lambda: bool(stopping),
+        interval=options["interval"],
+        burst=options["burst"],
+        max_jobs=options["max_jobs"],
+        on_job=report,
+    )
+
+
+class Command(BaseCommand):
+    help = "Run background job workers backed by the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when no job is due.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no jobs are due instead of polling forever.",
+        )
+        parser.add_argument("--max-jobs", type=int, help="Exit after processing this many jobs.")
+
+    def handle(self, *args, **options):
+        workers = max(options["workers"], 1)
+        if workers == 1:
+            _worker_main(1, options)
+            return
+
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker_main, args=(worker_id, options))
+            for worker_id in range(1, workers + 1)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {workers} workers.")
+
+        def forward(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            forward(signal.SIGINT, None)
+            for process in processes:
+                process.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
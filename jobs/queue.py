@@ -0,0 +1,167 @@
+import logging
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.db import (
+    DatabaseError,
+    IntegrityError,
+    InterfaceError,
+    OperationalError,
+    close_old_connections,
+    transaction,
+)
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import JOB_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+JOB_CLAIM_CANDIDATES = 10
+JOB_MAX_BACKOFF_SECONDS = 60 * 60
+JOB_ERROR_MAX_LENGTH = 4000
+JOB_FINISH_RETRIES = 5
+JOB_FINISH_RETRY_DELAY = 0.2
+
+
+def enqueue(name, payload=None, *, priority=None, delay=None, run_at=None, unique_key=""):
+    if name not in JOB_REGISTRY:
+        raise ValueError(f"No job registered as {name!r}.")
+    spec = JOB_REGISTRY[name]
+    if run_at is None:
+        run_at = timezone.now() + (delay or timedelta())
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name,
+                payload=payload or {},
+                priority=spec["priority"] if priority is None else priority,
+                max_attempts=spec["max_attempts"],
+                run_at=run_at,
+                unique_key=unique_key,
+            )
+    except IntegrityError:
+        if not unique_key:
+            raise
+        return None
+
+
+def schedule_periodic() -> int:
+    scheduled = 0
+    for name, spec in JOB_REGISTRY.items():
+        if spec["every"] and enqueue(name, unique_key=f"periodic:{name}"):
+            scheduled += 1
+    return scheduled
+
+
+def _due(now):
+    return Q(status=Job.STATUS_QUEUED, run_at__lte=now) | Q(
+        status=Job.STATUS_RUNNING, locked_until__lt=now
+    )
+
+
+def claim_next():
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(_due(now))
+        .order_by("-priority", "run_at", "pk")
+        .values_list("pk", "name")[:JOB_CLAIM_CANDIDATES]
+    )
+    for pk, name in candidates:
+        timeout = JOB_REGISTRY.get(name, {}).get("timeout", 60)
+        token = uuid.uuid4().hex
+        # The due condition is repeated so the UPDATE only succeeds for one worker.
+        claimed = Job.objects.filter(_due(now), pk=pk).update(
+            status=Job.STATUS_RUNNING,
+            claim_token=token,
+            attempts=F("attempts") + 1,
+            locked_until=now + timedelta(seconds=timeout),
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def _record_result(job, spec) -> None:
+    Job.objects.filter(pk=job.pk, claim_token=job.claim_token).update(
+        status=job.status,
+        run_at=job.run_at,
+        finished_at=job.finished_at,
+        last_error=job.last_error,
+        claim_token="",
+        locked_until=None,
+    )
+    if spec and spec["every"] and job.status != Job.STATUS_QUEUED:
+        enqueue(job.name, delay=spec["every"], unique_key=f"periodic:{job.name}")
+
+
+def run_job(job) -> bool:
+    spec = JOB_REGISTRY.get(job.name)
+    started = time.monotonic()
+    succeeded = False
+    try:
+        if spec is None:
+            raise LookupError(f"No job registered as {job.name!r}.")
+        if job.attempts > job.max_attempts:
+            raise TimeoutError("Lease expired after the final attempt.")
+        spec["func"](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()[-JOB_ERROR_MAX_LENGTH:]
+        if spec is None or job.attempts >= job.max_attempts:
+            job.status = Job.STATUS_FAILED
+            job.finished_at = timezone.now()
+        else:
+            backoff = min(spec["retry_delay"] * 2 ** (job.attempts - 1), JOB_MAX_BACKOFF_SECONDS)
+            job.status = Job.STATUS_QUEUED
+            job.run_at = timezone.now() + timedelta(seconds=backoff)
+        logger.exception("Job %s failed (attempt %s)", job, job.attempts)
+    else:
+        succeeded = True
+        job.status = Job.STATUS_DONE
+        job.finished_at = timezone.now()
+        job.last_error = ""
+
+    for attempt in range(1, JOB_FINISH_RETRIES + 1):
+        try:
+            with transaction.atomic():
+                _record_result(job, spec)
+            break
+        except OperationalError:
+            if attempt == JOB_FINISH_RETRIES:
+                # The lease runs out and another worker picks the job up again.
+                logger.exception("Could not record the result of job %s", job)
+            else:
+                time.sleep(JOB_FINISH_RETRY_DELAY * attempt)
+    logger.info("Job %s finished in %.2fs", job, time.monotonic() - started)
+    return succeeded
+
+
+def work(should_stop=lambda: False, interval=1.0, burst=False, max_jobs=None, on_job=None):
+    schedule_periodic()
+    processed = 0
+    while not should_stop():
+        # Drops a connection that has outlived CONN_MAX_AGE or broke (say the
+        # database restarted), so the next claim reconnects instead of
+        # failing on it forever.
+        close_old_connections()
+        try:
+            job = claim_next()
+        except (DatabaseError, InterfaceError):
+            logger.warning("Could not claim a job", exc_info=True)
+            time.sleep(interval)
+            continue
+        if job is None:
+            if burst:
+                break
+            time.sleep(interval)
+            continue
+        succeeded = run_job(job)
+        processed += 1
+        if on_job:
+            on_job(job, succeeded)
+        if max_jobs and processed >= max_jobs:
+            break
+    return processed
@@ -0,0 +1,17 @@
+JOB_REGISTRY = {}
+
+
+def job(name, *, max_attempts=3, retry_delay=30, timeout=10 * 60, every=None, priority=0):
+    def decorator(func):
+        JOB_REGISTRY[name] = {
+            "func": func,
+            "max_attempts": max_attempts,
+            "retry_delay": retry_delay,
+            "timeout": timeout,
+            "every": every,
+            "priority": priority,
+        }
+        func.job_name = name
+        return func
+
+    return decorator
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Job
+from .registry import job
+
+JOB_RETENTION_DAYS = 7
+
+
+@job("jobs.purge_finished", every=timedelta(days=1), priority=-10)
+def purge_finished(days=JOB_RETENTION_DAYS):
+    Job.objects.filter(
+        status=Job.STATUS_DONE,
+        finished_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
@@ -0,0 +1,129 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import InterfaceError, OperationalError, connection
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .models import Job
+from .queue import claim_next, enqueue, run_job, work
+from .registry import job
+
+calls = []
+
+
+@job("jobs.tests.record", retry_delay=10)
+def record(value, fail=False):
+    calls.append(value)
+    if fail:
+        raise RuntimeError("Job failed.")
+
+
+@job("jobs.tests.periodic", every=timedelta(minutes=5))
+def periodic():
+    calls.append("periodic")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_by_priority(self):
+        enqueue("jobs.tests.record", {"value": "low"}, priority=-1)
+        enqueue("jobs.tests.record", {"value": "high"}, priority=5)
+        enqueue("jobs.tests.record", {"value": "later"}, delay=timedelta(hours=1))
+        while claimed := claim_next():
+            self.assertTrue(run_job(claimed))
+        self.assertEqual(calls, ["high", "low"])
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_DONE).count(), 2)
+
+    def test_failures_back_off_then_fail(self):
+        queued = enqueue("jobs.tests.record", {"value": 1, "fail": True})
+        with self.assertLogs("jobs.queue", "ERROR"):
+            self.assertFalse(run_job(claim_next()))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Job.STATUS_QUEUED, 1))
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertIn("Job failed.", queued.last_error)
+        Job.objects.update(run_at=timezone.now(), attempts=queued.max_attempts - 1)
+        with self.assertLogs("jobs.queue", "ERROR"):
+            run_job(claim_next())
+        self.assertEqual(Job.objects.get().status, Job.STATUS_FAILED)
+
+    def test_periodic_jobs_are_rescheduled_once(self):
+        enqueue("jobs.tests.periodic", unique_key="periodic:jobs.tests.periodic")
+        self.assertIsNone(
+            enqueue("jobs.tests.periodic", unique_key="periodic:jobs.tests.periodic")
+        )
+        run_job(claim_next())
+        (next_run,) = Job.objects.filter(status=Job.STATUS_QUEUED)
+        self.assertGreater(next_run.run_at, timezone.now() + timedelta(minutes=4))
+
+    def test_recording_the_result_retries_when_the_database_is_locked(self):
+        enqueue("jobs.tests.periodic", unique_key="periodic:jobs.tests.periodic")
+        update = QuerySet.update
+        failures = []
+
+        def locked_once(queryset, **kwargs):
+            if queryset.model is Job and not failures:
+                failures.append(kwargs)
+                raise OperationalError("database is locked")
+            return update(queryset, **kwargs)
+
+        claimed = claim_next()
+        with mock.patch.object(QuerySet, "update", locked_once):
+            self.assertTrue(run_job(claimed))
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(Job.objects.get(pk=claimed.pk).status, Job.STATUS_DONE)
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_QUEUED).count(), 1)
+
+    def test_worker_reconnects_between_polls(self):
+        enqueue("jobs.tests.record", {"value": "after restart"})
+        polls = []
+
+        def claim():
+            polls.append(None)
+            if len(polls) == 1:
+                raise InterfaceError("connection already closed")
+            return claim_next()
+
+        with (
+            mock.patch("jobs.queue.close_old_connections") as close_old_connections,
+            mock.patch("jobs.queue.claim_next", side_effect=claim),
+            mock.patch("jobs.queue.time.sleep"),
+            self.assertLogs("jobs.queue", "WARNING"),
+        ):
+            work(burst=True)
+        self.assertIn("after restart", calls)
+        self.assertEqual(close_old_connections.call_count, len(polls))
+
+
+class JobClaimRaceTests(TransactionTestCase):
+    def test_racing_workers_claim_different_jobs(self):
+        for value in range(2):
+            enqueue("jobs.tests.record", {"value": value})
+        barrier = threading.Barrier(2)
+        claimed = []
+
+        def worker():
+            try:
+                barrier.wait()
+                while True:
+                    try:
+                        claimed.append(claim_next())
+                        break
+                    except OperationalError:
+                        continue
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertNotIn(None, claimed)
+        self.assertEqual(len({claimed_job.pk for claimed_job in claimed}), 2)
+        self.assertEqual(len({claimed_job.claim_token for claimed_job in claimed}), 2)
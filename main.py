@@ -4,5 +4,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-app = get_asgi_application()
+django_app = get_asgi_application()
+
+# Imported once the app registry is ready; it loads the article models.
+from articles.live import LiveStreamRouter  # noqa: E402
+
+app = LiveStreamRouter(django_app)
 
@@ -142,4 +142,19 @@ document.addEventListener("DOMContentLoaded", () => {
 
         updateState();
     });
+
+    document.querySelectorAll("[data-select-all]").forEach((toggle) => {
+        const form = toggle.form;
+        if (!form) {
+            return;
+        }
+        const boxes = () => document.querySelectorAll(
+            `input[type='checkbox'][name='${toggle.dataset.selectAll}'][form='${form.id}']`
+        );
+        toggle.addEventListener("change", () => {
+            boxes().forEach((box) => {
+                box.checked = toggle.checked;
+            });
+        });
+    });
 });
@@ -0,0 +1,77 @@
+(() => {
+    const STATS = ["score", "likes", "dislikes", "comments"];
+
+    function start() {
+        const section = document.querySelector("[data-live-stream]");
+        if (!section || !window.EventSource) {
+            return;
+        }
+        const slug = section.dataset.article;
+        const note = document.querySelector("[data-live-comments]");
+        const renderedComments = note ? Number(note.dataset.liveComments) : 0;
+        const newAuthors = [];
+        let unseen = 0;
+        let source = null;
+
+        function applyStats(data) {
+            document.querySelectorAll(`[data-article-stats="${slug}"]`).forEach((container) => {
+                STATS.forEach((key) => {
+                    const chip = container.querySelector(`[data-stat="${key}"] strong`);
+                    if (chip && typeof data[key] === "number") {
+                        chip.textContent = data[key];
+                    }
+                });
+            });
+            document.querySelectorAll(".comments-header .comment-count").forEach((count) => {
+                count.textContent = data.comments;
+            });
+            unseen = data.comments - renderedComments;
+            showNote();
+        }
+
+        function showNote() {
+            if (!note) {
+                return;
+            }
+            if (unseen <= 0) {
+                note.classList.add("hidden");
+                return;
+            }
+            const noun = unseen === 1 ? "new comment" : "new comments";
+            const by = newAuthors.length ? ` from ${newAuthors.join(", ")}` : "";
+            note.textContent = `${unseen} ${noun}${by}. Reload to read.`;
+            note.classList.remove("hidden");
+        }
+
+        function connect() {
+            source = new EventSource(section.dataset.liveStream);
+            source.addEventListener("stats", (event) => applyStats(JSON.parse(event.data)));
+            source.addEventListener("comments", (event) => {
+                JSON.parse(event.data).authors.forEach((author) => {
+                    if (!newAuthors.includes(author) && newAuthors.length < 5) {
+                        newAuthors.push(author);
+                    }
+                });
+                showNote();
+            });
+        }
+
+        // Pages restored from the back/forward cache lose their stream; the
+        // first event after reconnecting carries the current totals.
+        window.addEventListener("pagehide", () => source && source.close());
+        window.addEventListener("pageshow", (event) => {
+            if (event.persisted || !source || source.readyState === EventSource.CLOSED) {
+                connect();
+            }
+        });
+        if (!source) {
+            connect();
+        }
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", start);
+    } else {
+        start();
+    }
+})();
@@ -8,10 +8,23 @@ function ready(fn) {
 
 ready(() => {
     const reactionForms = document.querySelectorAll(".reaction-form");
-    const STORAGE_PREFIX = "article-stats-";
+    const engagementUrl = document.body.dataset.engagementUrl;
+    const ENGAGEMENT_BATCH_SIZE = 100;
+    const STALE_AFTER_MS = 60 * 1000;
+    let hiddenAt = null;
 
-    applyStoredStats();
-    window.addEventListener("pageshow", applyStoredStats);
+    window.addEventListener("pageshow", (event) => {
+        if (event.persisted) {
+            refreshStats();
+        }
+    });
+    document.addEventListener("visibilitychange", () => {
+        if (document.hidden) {
+            hiddenAt = Date.now();
+        } else if (hiddenAt && Date.now() - hiddenAt >= STALE_AFTER_MS) {
+            refreshStats();
+        }
+    });
 
     reactionForms.forEach((form) => {
         const handleSubmit = (event) => {
@@ -32,13 +45,22 @@ ready(() => {
                 },
             })
                 .then((response) => {
+                    if (response.status === 429) {
+                        return response.json().then((data) => {
+                            data.throttled = true;
+                            return data;
+                        });
+                    }
                     if (!response.ok) {
                         throw new Error("Failed to toggle reaction.");
                     }
                     return response.json();
                 })
                 .then((data) => {
-                    persistStats(form.dataset.article, data);
+                    if (data.throttled) {
+                        form.title = `Too many reactions. Try again in ${data.retry_after}s.`;
+                        return;
+                    }
                     updateReactionButtons(form.dataset.article, data.reaction);
                     updateReactionStats(form.dataset.article, data);
                 })
@@ -56,56 +78,42 @@ ready(() => {
         form.addEventListener("submit", handleSubmit);
     });
 
-    function applyStoredStats() {
-        document.querySelectorAll("[data-article-card]").forEach((card) => {
-            const slug = card.dataset.articleCard;
-            if (!slug) {
-                return;
-            }
-            const stored = readStats(slug);
-            if (stored) {
-                syncArticleCards(slug, stored);
-                updateReactionButtons(slug, stored.reaction || null);
-            }
-        });
-
-        document.querySelectorAll("[data-article-stats]").forEach((statsEl) => {
-            const slug = statsEl.dataset.articleStats;
-            if (!slug) {
-                return;
-            }
-            const stored = readStats(slug);
-            if (stored) {
-                syncArticleCards(slug, stored);
-            }
-        });
-    }
-
-    function persistStats(slug, data) {
-        const payload = {
-            score: data.score,
-            likes: data.likes,
-            dislikes: data.dislikes,
-            reaction: data.reaction,
-        };
-        try {
-            sessionStorage.setItem(
-                `${STORAGE_PREFIX}${slug}`,
-                JSON.stringify(payload)
-            );\n        } catch (error) {}
-        syncArticleCards(slug, payload);
+    function refreshStats() {
+        const slugs = [
+            ...new Set(
+                Array.from(document.querySelectorAll("[data-article-stats]"), (element) => {
+                    return element.dataset.articleStats;
+                })
+            ),
+        ].slice(0, ENGAGEMENT_BATCH_SIZE);
+        if (!engagementUrl || !slugs.length) {
+            return;
+        }
+        const query = new URLSearchParams({ slugs: slugs.join(",") });
+        fetch(`${engagementUrl}?${query}`, {
+            credentials: "same-origin",
+            headers: { Accept: "application/json" },
+        })
+            .then((response) => (response.ok ? response.json() : null))
+            .then((payload) => {
+                if (!payload) {
+                    return;
+                }
+                Object.entries(payload.data).forEach(([slug, stats]) => {
+                    updateReactionStats(slug, stats);
+                    if ("reaction" in stats) {
+                        updateReactionButtons(slug, stats.reaction);
+                        updateBookmarkButtons(slug, stats.bookmarked);
+                    }
+                });
+            })
+            .catch(() => {});
     }
 
-    function readStats(slug) {
-        try {
-            const raw = sessionStorage.getItem(`${STORAGE_PREFIX}${slug}`);
-            if (!raw) {
-                return null;
-            }
-            return JSON.parse(raw);
-        } catch (error) {
-            return null;
-        }
+    function updateBookmarkButtons(slug, bookmarked) {
+        document.querySelectorAll(`[data-bookmark-button="${slug}"]`).forEach((button) => {
+            button.textContent = bookmarked ? "Remove bookmark" : "Add bookmark";
+        });
     }
 
     function updateReactionButtons(slug, activeReaction) {
@@ -122,45 +130,18 @@ ready(() => {
     }
 
     function updateReactionStats(slug, data) {
-        const container = document.querySelector(
-            `[data-article-stats="${slug}"]`
-        );
-        if (!container) {
-            return;
-        }
         const map = {
             score: data.score,
             likes: data.likes,
             dislikes: data.dislikes,
+            comments: data.comments,
         };
-        Object.entries(map).forEach(([key, value]) => {
-            const chip = container.querySelector(`[data-stat="${key}"] strong`);
-            if (chip && typeof value === "number") {
-                chip.textContent = value;
-            }
-        });
-    }
-
-    function syncArticleCards(slug, data) {
-        const selectors = [
-            `[data-article-card="${slug}"] [data-article-stats="${slug}"]`,
-            `[data-article-stats="${slug}"]`,
-        ];
-        selectors.forEach((selector) => {
-            document.querySelectorAll(selector).forEach((statsContainer) => {
-                const map = {
-                    score: data.score,
-                    likes: data.likes,
-                    dislikes: data.dislikes,
-                };
-                Object.entries(map).forEach(([key, value]) => {
-                    const chip = statsContainer.querySelector(
-                        `[data-stat="${key}"] strong`
-                    );
-                    if (chip && typeof value === "number") {
-                        chip.textContent = value;
-                    }
-                });
+        document.querySelectorAll(`[data-article-stats="${slug}"]`).forEach((container) => {
+            Object.entries(map).forEach(([key, value]) => {
+                const chip = container.querySelector(`[data-stat="${key}"] strong`);
+                if (chip && typeof value === "number") {
+                    chip.textContent = value;
+                }
             });
         });
     }
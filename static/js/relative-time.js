@@ -0,0 +1,37 @@
+(() => {
+    const UNITS = [
+        ["year", 60 * 60 * 24 * 365],
+        ["month", 60 * 60 * 24 * 30],
+        ["week", 60 * 60 * 24 * 7],
+        ["day", 60 * 60 * 24],
+        ["hour", 60 * 60],
+        ["minute", 60],
+    ];
+    const formatter = new Intl.RelativeTimeFormat(undefined, { numeric: "auto" });
+
+    function relativeTime(date) {
+        const seconds = (date.getTime() - Date.now()) / 1000;
+        for (const [unit, size] of UNITS) {
+            if (Math.abs(seconds) >= size) {
+                return formatter.format(Math.trunc(seconds / size), unit);
+            }
+        }
+        return "just now";
+    }
+
+    function refresh() {
+        document.querySelectorAll("time[data-relative-time]").forEach((element) => {
+            const date = new Date(element.getAttribute("datetime"));
+            if (!Number.isNaN(date.getTime())) {
+                element.textContent = relativeTime(date);
+            }
+        });
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", refresh);
+    } else {
+        refresh();
+    }
+    window.setInterval(refresh, 60 * 1000);
+})();